@@ -0,0 +1,350 @@
+#!/usr/bin/python3
+'''
+This module serves the objects of storage as a JSON REST API, with the
+standard library only:
+
+    GET    /api/v1/status                       {"status": "OK"}
+    GET    /api/v1/stats                        number of objects per class
+    GET    /api/v1/<resource>?limit=&after=&where=   a page of objects
+    POST   /api/v1/<resource>                   creates an object
+    GET    /api/v1/<resource>/<id>              an object
+    PUT    /api/v1/<resource>/<id>              updates an object
+    DELETE /api/v1/<resource>/<id>              deletes an object
+
+where <resource> is one of RESOURCES. Connections are kept alive (HTTP/1.1)
+and every object or page carries an ETag built from the updated_at of its
+objects, so a GET with a matching If-None-Match is answered 304 without a
+body, and a PUT or DELETE with an outdated If-Match is refused with 412.
+'''
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+import models
+from models import base_model
+from models.base_model import Timestamp
+from models.engine import query, schema
+
+PREFIX = "/api/v1"
+RESOURCES = {
+    "users": "User",
+    "states": "State",
+    "cities": "City",
+    "amenities": "Amenity",
+    "places": "Place",
+    "reviews": "Review",
+}
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+READ_ONLY = ("id", "created_at", "updated_at", "__class__")
+
+_lock = threading.RLock()
+
+
+class APIError(Exception):
+    """APIError is answered as {"error": message} with an HTTP status."""
+
+    def __init__(self, status, message):
+        """Creates the error answered with status and message."""
+        super().__init__(message)
+        self.status = status
+
+
+def etag(obj):
+    """Returns the ETag of an object, built from its updated_at."""
+    micros = Timestamp.micros(obj.__dict__.get("updated_at"))
+    return f'"{obj.id}.{micros:x}"' if micros is not None \
+        else f'"{obj.id}"'
+
+
+def page_etag(objects):
+    """Returns the ETag of a page, built from the ETags of its objects."""
+    digest = hashlib.blake2b(digest_size=12)
+    for obj in objects:
+        digest.update(etag(obj).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def matches(header, tag):
+    """Tells whether an If-None-Match or If-Match header holds tag."""
+    if header is None:
+        return False
+    tags = [text.strip() for text in header.split(",")]
+    return "*" in tags or tag in tags or f"W/{tag}" in tags
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    """
+    APIHandler answers the requests of one connection, kept alive between
+    requests. Each request holds the storage lock while it reads or
+    changes objects, so the threads of the server never interleave there.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "HBNB-API/1.0"
+
+    def do_GET(self):
+        """Answers GET requests."""
+        self.respond("GET")
+
+    def do_POST(self):
+        """Answers POST requests."""
+        self.respond("POST")
+
+    def do_PUT(self):
+        """Answers PUT requests."""
+        self.respond("PUT")
+
+    def do_DELETE(self):
+        """Answers DELETE requests."""
+        self.respond("DELETE")
+
+    def respond(self, method):
+        """Routes a request and sends its answer."""
+        url = urlsplit(self.path)
+        try:
+            body = self.read_body()
+            parts = url.path.rstrip("/").split("/")
+            if "/".join(parts[:3]) != PREFIX or len(parts) > 5:
+                raise APIError(HTTPStatus.NOT_FOUND, "Not found")
+            with _lock:
+                status, payload, headers = self.route(
+                    method, parts[3:], parse_qs(url.query), body)
+        except APIError as error:
+            status, payload, headers = error.status, \
+                {"error": str(error)}, {}
+        except Exception as error:
+            self.log_error("%s failed: %r", self.path, error)
+            status, payload, headers = HTTPStatus.INTERNAL_SERVER_ERROR, \
+                {"error": "Internal server error"}, {}
+        self.send_json(status, payload, headers)
+
+    def route(self, method, parts, params, body):
+        """Returns the (status, payload, headers) of a request."""
+        if parts in (["status"], ["stats"]):
+            if method != "GET":
+                raise APIError(HTTPStatus.METHOD_NOT_ALLOWED,
+                               "Method not allowed")
+            if parts == ["status"]:
+                return HTTPStatus.OK, {"status": "OK"}, {}
+            return HTTPStatus.OK, {
+                resource: models.storage.count(class_name)
+                for resource, class_name in RESOURCES.items()}, {}
+        if not parts or parts[0] not in RESOURCES:
+            raise APIError(HTTPStatus.NOT_FOUND, "Not found")
+        class_name = RESOURCES[parts[0]]
+        if len(parts) == 1:
+            if method == "GET":
+                return self.page(parts[0], class_name, params)
+            if method == "POST":
+                return self.create(parts[0], class_name, body)
+        else:
+            obj = models.storage.all().get(f"{class_name}.{parts[1]}")
+            if obj is None:
+                raise APIError(HTTPStatus.NOT_FOUND, "Not found")
+            tag = etag(obj)
+            if method == "GET":
+                if matches(self.headers["If-None-Match"], tag):
+                    return HTTPStatus.NOT_MODIFIED, None, {"ETag": tag}
+                return HTTPStatus.OK, obj.to_dict(), {"ETag": tag}
+            if method in ("PUT", "DELETE"):
+                if_match = self.headers["If-Match"]
+                if if_match is not None and not matches(if_match, tag):
+                    raise APIError(HTTPStatus.PRECONDITION_FAILED,
+                                   "Precondition failed")
+                if method == "PUT":
+                    return self.update(obj, body)
+                models.storage.delete(obj)
+                models.storage.save()
+                return HTTPStatus.OK, {}, {}
+        raise APIError(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed")
+
+    def page(self, resource, class_name, params):
+        """Returns a page of objects and the link to the next one."""
+        model = models.storage.classes()[class_name]
+        try:
+            limit = int(params.get("limit", [PAGE_SIZE])[-1])
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "Invalid limit") from None
+        if not 0 < limit <= MAX_PAGE_SIZE:
+            raise APIError(HTTPStatus.BAD_REQUEST, "Invalid limit")
+        where = params.get("where", [None])[-1]
+        after = params.get("after", [None])[-1]
+        try:
+            compiled = None if where is None else \
+                query.compile_where(model, where)
+            objects = [obj for key, obj in models.storage.scan(
+                class_name, after and f"{class_name}.{after}", 0,
+                limit + 1, compiled)]
+        except ValueError as error:
+            raise APIError(HTTPStatus.BAD_REQUEST, str(error)) from None
+        except KeyError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "Unknown cursor") \
+                from None
+        headers = {"ETag": page_etag(objects[:limit])}
+        if len(objects) > limit:
+            link = {"limit": limit, "after": objects[limit - 1].id}
+            if where is not None:
+                link["where"] = where
+            headers["Link"] = \
+                f'<{PREFIX}/{resource}?{urlencode(link)}>; rel="next"'
+        if matches(self.headers["If-None-Match"], headers["ETag"]):
+            return HTTPStatus.NOT_MODIFIED, None, headers
+        return HTTPStatus.OK, [obj.to_dict() for obj in objects[:limit]], \
+            headers
+
+    def create(self, resource, class_name, body):
+        """
+        Creates an object from the attributes of the body, built and
+        checked before it is stored.
+        """
+        model = models.storage.classes()[class_name]
+        record = self.changes(model, body)
+        now = datetime.now().isoformat()
+        record.update(id=base_model.generate_id(), created_at=now,
+                      updated_at=now)
+        obj = models.storage.insert(class_name, [record])[0]
+        models.storage.save()
+        return HTTPStatus.CREATED, obj.to_dict(), {
+            "ETag": etag(obj), "Location": f"{PREFIX}/{resource}/{obj.id}"}
+
+    def update(self, obj, body):
+        """Updates an object with the attributes of the body."""
+        changes = self.changes(obj.__class__, body)
+        for name, value in changes.items():
+            setattr(obj, name, value)
+        obj.save()
+        return HTTPStatus.OK, obj.to_dict(), {"ETag": etag(obj)}
+
+    @staticmethod
+    def changes(model, body):
+        """
+        Returns the writable attributes of a JSON object body converted
+        with the schema of model, ignoring the read-only ones. Raises
+        APIError for a value that can't be converted or for a method,
+        property or private name.
+        """
+        if not isinstance(body, dict):
+            raise APIError(HTTPStatus.BAD_REQUEST, "Not a JSON")
+        coerce = schema.of(model).coerce
+        try:
+            return {name: coerce(name, value) for name, value in body.items()
+                    if name not in READ_ONLY}
+        except ValueError as error:
+            raise APIError(HTTPStatus.BAD_REQUEST, str(error)) from None
+
+    def read_body(self):
+        """Reads the JSON body of the request, None if there is none."""
+        try:
+            length = int(self.headers["Content-Length"] or 0)
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST,
+                           "Invalid Content-Length") from None
+        if length <= 0:
+            return None
+        data = self.rfile.read(length)
+        try:
+            return json.loads(data)
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "Not a JSON") from None
+
+    def send_json(self, status, payload, headers):
+        """Sends an answer, payload as its JSON body."""
+        data = b"" if payload is None else \
+            json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Logs requests to stderr when the server is verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class APIServer(ThreadingHTTPServer):
+    """
+    APIServer serves the API from one thread per connection. Saves are
+    deferred and the pending changes written every save_interval seconds
+    and when the server closes.
+    ATTRIBUTES:
+        save_interval: the seconds between two commits of storage
+        verbose: logs every request when true
+        commits: the number of saves written
+    """
+    daemon_threads = True
+
+    def __init__(self, address, save_interval=1.0, verbose=False):
+        """Binds the server to address, a (host, port) pair."""
+        super().__init__(address, APIHandler)
+        self.save_interval = save_interval
+        self.verbose = verbose
+        self.commits = 0
+        self.__closed = threading.Event()
+        models.storage.defer()
+        self.__saver = threading.Thread(target=self.__save_every,
+                                        daemon=True)
+        self.__saver.start()
+
+    def server_close(self):
+        """Closes the socket and saves pending changes."""
+        super().server_close()
+        self.__closed.set()
+        self.__saver.join()
+        with _lock:
+            self.commits += models.storage.commit()
+            models.storage.defer(False)
+
+    def __save_every(self):
+        """Commits the deferred saves every save_interval seconds."""
+        while not self.__closed.wait(self.save_interval):
+            with _lock:
+                self.commits += models.storage.commit()
+
+
+def main(argv=None):
+    """Serves the API until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="api.py", description="HBNB JSON REST API")
+    parser.add_argument("--host",
+                        default=os.environ.get("HBNB_API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int,
+                        default=int(os.environ.get("HBNB_API_PORT", 5000)))
+    parser.add_argument("--save-interval", type=float, default=1.0,
+                        metavar="SECONDS",
+                        help="writes the pending changes every SECONDS")
+    parser.add_argument("--verbose", action="store_true",
+                        help="logs every request to stderr")
+    parser.add_argument("--changes", metavar="FILE",
+                        help="appends the storage changes to FILE")
+    options = parser.parse_args(argv)
+    models.init()
+    if options.changes is not None:
+        models.storage.changes().open(options.changes)
+    server = APIServer((options.host, options.port), options.save_interval,
+                       options.verbose)
+    host, port = server.server_address[:2]
+    print(f"listening on http://{host}:{port}{PREFIX}", file=sys.stderr,
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
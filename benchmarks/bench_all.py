@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Compares the console `all` command printing one list of every string (as
+it used to) with the streamed output: time to the first byte, total time
+and peak memory allocated while printing.
+
+Usage: ./benchmarks/bench_all.py [number of places]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console import HBNBCommand  # noqa: E402
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+class Sink:
+    """Discards what is written, noting when the first byte came."""
+
+    def __init__(self):
+        """Starts the clock."""
+        self.start = time.perf_counter()
+        self.first = None
+
+    def write(self, text):
+        """Discards text."""
+        if self.first is None and text:
+            self.first = time.perf_counter() - self.start
+        return len(text)
+
+    def flush(self):
+        """Does nothing."""
+
+
+def listed(arg):
+    """Prints the objects the way `all` did before it streamed them."""
+    print([str(obj) for obj in storage.objects(arg).values()])
+
+
+def measure(label, function):
+    """
+    Runs function with stdout discarded and prints its costs, timing a
+    first run and tracing the allocations of a second one.
+    """
+    sink = Sink()
+    with redirect_stdout(sink):
+        function()
+    total = time.perf_counter() - sink.start
+    tracemalloc.start()
+    with redirect_stdout(Sink()):
+        function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<20}first byte {sink.first:8.4f}s  total {total:8.4f}s"
+          f"  peak {peak / 2 ** 20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for i in range(count):
+        Place().name = f"place {i}"
+    console = HBNBCommand()
+    measure("list (before)", lambda: listed("Place"))
+    measure("streamed", lambda: console.onecmd("all Place"))
+    measure("streamed JSON lines",
+            lambda: console.onecmd("all Place --format jsonl"))
+    measure("first page", lambda: console.onecmd("all Place --limit 100"))
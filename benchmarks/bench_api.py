@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""
+Load test of the REST API: concurrent clients sending GET requests for
+single places (with keep-alive, with a connection per request, and
+conditional ones answered 304) and for pages of 100 places. Prints the
+requests per second and the p50 and p99 latencies of each load.
+
+Usage: ./benchmarks/bench_api.py [places] [clients] [requests per client]
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.client import HTTPConnection
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(label, request, clients, count):
+    """
+    Runs count requests from each of clients threads, request(connection)
+    sending one, and prints the rate and latencies.
+    """
+    latencies = []
+
+    def client():
+        """Sends the requests of one client."""
+        connection = HTTPConnection("127.0.0.1", port)
+        mine = []
+        for i in range(count):
+            start = time.perf_counter()
+            request(connection)
+            mine.append(time.perf_counter() - start)
+        connection.close()
+        latencies.extend(mine)
+
+    threads = [threading.Thread(target=client) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{label:<32}{len(latencies) / seconds:8.0f} req/s  "
+          f"p50 {p50:6.2f}ms  p99 {p99:6.2f}ms")
+
+
+def get(path, headers=None, expect=200):
+    """Returns a request sending GET path on the connection it is given."""
+    def request(connection):
+        """Sends the request and reads the response."""
+        connection.request("GET", path(), headers=headers or {})
+        response = connection.getresponse()
+        response.read()
+        assert response.status == expect, response.status
+    return request
+
+
+def fresh(request):
+    """Returns request sent on a new connection every time."""
+    def send(connection):
+        """Closes the connection, so the request opens a new one."""
+        connection.close()
+        request(connection)
+    return send
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        ids = [Place().id for i in range(count)]
+        storage.save()
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "api.py"), "--port", "0"],
+            stderr=subprocess.PIPE, text=True)
+        try:
+            port = int(server.stderr.readline().rsplit(":", 1)[1].split(
+                "/")[0])
+            connection = HTTPConnection("127.0.0.1", port)
+            connection.request("GET", f"/api/v1/places/{ids[0]}")
+            response = connection.getresponse()
+            tag = response.headers["ETag"]
+            json.loads(response.read())
+            connection.close()
+
+            def place():
+                """Returns the path of a random place."""
+                return f"/api/v1/places/{random.choice(ids)}"
+
+            def first():
+                """Returns the path of the first place."""
+                return f"/api/v1/places/{ids[0]}"
+
+            def page():
+                """Returns the path of a page of 100 places."""
+                return f"/api/v1/places?limit=100&after={random.choice(ids)}"
+
+            timed("GET place, keep-alive", get(place), clients, requests)
+            timed("GET place, new connections", fresh(get(place)), clients,
+                  requests)
+            timed("GET place, 304", get(first, {"If-None-Match": tag}, 304),
+                  clients, requests)
+            timed("GET page of 100", get(page), clients, requests // 10)
+        finally:
+            server.terminate()
+            server.wait()
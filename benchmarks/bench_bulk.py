@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Times the bulk loader on generated Place rows, as JSON lines or CSV,
+then times the streaming export of the loaded places.
+
+Usage: ./benchmarks/bench_bulk.py [number of rows] [rows per batch]
+                                  [jsonl|csv]
+"""
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.engine import bulk, schema  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(label, function):
+    """Runs function and prints how long it took."""
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<32}{time.perf_counter() - start:10.4f}s")
+    return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    fmt = sys.argv[3] if len(sys.argv) > 3 else "jsonl"
+    with tempfile.TemporaryDirectory() as directory:
+        FileStorage._FileStorage__file_path = os.path.join(
+            directory, "file.json")
+        path = os.path.join(directory, f"places.{fmt}")
+        rows = ({"city_id": f"c{i % 1000}", "name": f"Place {i}",
+                 "number_rooms": str(i % 7), "price_by_night": i % 300,
+                 "latitude": 48.8} for i in range(count))
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            if fmt == "csv":
+                writer = csv.DictWriter(file, list(schema.of(Place).types),
+                                        extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                file.writelines(json.dumps(row) + "\n" for row in rows)
+
+        report = timed(f"import {fmt}",
+                       lambda: bulk.load(path, "Place", None, batch_size))
+        print(bulk.summary(report))
+        timed("export csv", lambda: bulk.dump(
+            os.path.join(directory, "out.csv"), "Place"))
+        timed("export jsonl", lambda: bulk.dump(
+            os.path.join(directory, "out.jsonl"), "Place"))
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Compares creating, updating and destroying places with one console command
+per object (one save each) against the bulk commands (one save in all).
+
+Usage: ./benchmarks/bench_bulk_commands.py [number of places]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console import HBNBCommand  # noqa: E402
+from models import storage  # noqa: E402
+
+
+def timed(label, commands):
+    """Runs console commands and prints how long they took."""
+    console = HBNBCommand()
+    output = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(output):
+        for command in commands:
+            console.onecmd(command)
+    print(f"{label:<32}{time.perf_counter() - start:10.4f}s")
+    return output.getvalue().split()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        ids = timed("create, one by one", ["create Place"] * count)
+        timed("update, one by one",
+              [f"update Place {i} city_id c-1" for i in ids])
+        timed("destroy, one by one", [f"destroy Place {i}" for i in ids])
+        timed(f"create Place {count}", [f"create Place {count}"])
+        timed("update_where", ['update_where Place id!=x {"city_id": "c-1"}'])
+        timed("update_where (index)",
+              ['update_where Place city_id=c-1 {"price_by_night": 90}'])
+        timed("destroy_where (index)", ["destroy_where Place city_id=c-1"])
+        print(f"places left: {len(storage.objects('Place'))}")
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""
+Compares Place analytics over objects with the same analytics over the
+storage ColumnStore.
+
+Usage: ./benchmarks/bench_columns.py [number of places]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(label, function):
+    """Runs function and prints how long it took."""
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<32}{time.perf_counter() - start:10.4f}s")
+    return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for i in range(count):
+        place = Place()
+        place.price_by_night = random.randint(10, 500)
+        place.latitude = random.uniform(-90, 90)
+    places = list(storage.objects("Place").values())
+    store = timed("enable_columns", lambda: storage.enable_columns("Place"))
+
+    timed("objects: avg price", lambda: sum(
+        p.price_by_night for p in places) / len(places))
+    timed("columns: avg price", lambda: store.avg("price_by_night"))
+    timed("objects: 100 <= price <= 200", lambda: [
+        p for p in places if 100 <= p.price_by_night <= 200])
+    timed("columns: 100 <= price <= 200",
+          lambda: store.select("price_by_night", 100, 200))
+    timed("objects: sort by latitude", lambda: sorted(
+        places, key=lambda p: p.latitude))
+    timed("columns: sort by latitude", lambda: store.order_by("latitude"))
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""
+Times the replay of a script of show/update commands, in space and dot
+notation, through the batch mode of the console (one save at the end), to
+measure the per-command parsing overhead.
+
+Usage: ./benchmarks/bench_commands.py [number of commands]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console import HBNBCommand  # noqa: E402
+from models.place import Place  # noqa: E402
+
+SHAPES = [
+    'update Place {id} name "Place {n}"',
+    "update Place {id} max_guest {n}",
+    'Place.update("{id}", {{"price_by_night": {n}, "name": "P {n}"}})',
+    'Place.update("{id}", "latitude", "{n}.5")',
+    "show Place {id}",
+    'Place.show("{id}")',
+]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        ids = [Place().id for i in range(100)]
+        script = [SHAPES[n % len(SHAPES)].format(id=ids[n % len(ids)], n=n)
+                  for n in range(count)]
+        console = HBNBCommand()
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            summary = console.run_batch(script)
+        seconds = time.perf_counter() - start
+        print(f"{count} commands, {summary['errors']} errors in "
+              f"{seconds:.2f}s ({count / seconds:.0f} commands/s, "
+              f"{seconds / count * 1e6:.1f}us per command)")
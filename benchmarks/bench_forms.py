@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Times saving storage and listing all places when the serialized forms of
+unchanged objects are memoized, against formatting every object each time
+(json.dumps of every to_dict() as save() did before).
+
+Usage: ./benchmarks/bench_forms.py [number of places]
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console import HBNBCommand  # noqa: E402
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(label, function):
+    """Runs function and prints how long it took."""
+    start = time.perf_counter()
+    function()
+    print(f"{label:<32}{time.perf_counter() - start:10.4f}s")
+
+
+def save_unmemoized():
+    """Saves storage formatting every object."""
+    data = json.dumps({key: obj._record()
+                       for key, obj in storage.all().items()})
+    with open("file.json", "wb") as file:
+        file.write(data.encode("utf-8"))
+
+
+def list_unmemoized():
+    """Lists the places formatting every object."""
+    return [repr(obj._text()) for obj in storage.objects("Place").values()]
+
+
+def list_all():
+    """Lists the places through the console."""
+    with redirect_stdout(io.StringIO()):
+        HBNBCommand().onecmd("all Place")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        storage.persist_indexes(None)
+        places = [Place() for i in range(count)]
+        for i, place in enumerate(places):
+            place.price_by_night = i % 300
+        timed("save, every object formatted", save_unmemoized)
+        timed("save, first (one pass)", storage.save)
+        timed("save, second (memoizes)", storage.save)
+        timed("save, unchanged", storage.save)
+        for place in places[::100]:
+            place.save()
+        timed("save, 1% changed", storage.save)
+        timed("all Place, every object", list_unmemoized)
+        timed("all Place, first", list_all)
+        timed("all Place, unchanged", list_all)
+        storage.warm_start(None)
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Reports the memory used per Place loaded in the regular and in the
+compact (__slots__ based) representation.
+
+Usage: ./benchmarks/bench_memory.py [number of places]
+"""
+import os
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.compact import compact  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def record(i):
+    """Returns the stored form of a Place with every attribute set."""
+    now = datetime.now().isoformat()
+    return {
+        "id": str(uuid.uuid4()), "created_at": now, "updated_at": now,
+        "__class__": "Place", "city_id": "c", "user_id": "u",
+        "name": "Place", "description": "", "number_rooms": i % 5,
+        "number_bathrooms": 1, "max_guest": 2, "price_by_night": i % 300,
+        "latitude": 1.5, "longitude": 2.5, "amenity_ids": []
+    }
+
+
+def per_object(model, records, saved=False):
+    """
+    Returns the bytes allocated per instance of model, after a to_dict()
+    call on each instance (as done by storage.save()) when saved is True.
+    """
+    tracemalloc.start()
+    objects = [model(**data) for data in records]
+    if saved:
+        for obj in objects:
+            obj.to_dict()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / len(records)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = [record(i) for i in range(count)]
+    for label, model in (("regular", Place), ("compact", compact(Place))):
+        for saved in (False, True):
+            size = per_object(model, records, saved)
+            state = "after save" if saved else "loaded"
+            print(f"{label} Place, {state:<10}: {size:8.1f} bytes per object")
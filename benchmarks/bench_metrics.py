@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Times cheap instrumented operations, exact counts and console commands,
+and saves, without the metrics instrumentation (the undecorated
+functions), with metrics disabled and with metrics enabled.
+
+Usage: ./benchmarks/bench_metrics.py [number of places] [calls]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console import HBNBCommand  # noqa: E402
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine import metrics, query  # noqa: E402
+
+
+def timed(label, function):
+    """Runs function and prints how long it took."""
+    start = time.perf_counter()
+    function()
+    print(f"{label:<32}{time.perf_counter() - start:10.4f}s")
+
+
+def workload(count, calls, saves):
+    """Returns the functions counting, running commands and saving."""
+    city = query.compile_where(Place, "city_id=city-1")
+    console = HBNBCommand()
+
+    def counts():
+        for i in range(calls):
+            count(storage, "Place", city)
+
+    def commands():
+        with redirect_stdout(io.StringIO()):
+            for i in range(calls // 10):
+                onecmd(console, "count Place")
+
+    def saving():
+        for i in range(saves):
+            storage.save()
+    return counts, commands, saving
+
+
+if __name__ == "__main__":
+    places = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        storage.persist_indexes(None)
+        for i in range(places):
+            Place().city_id = f"city-{i % 100}"
+        for i in range(3):
+            storage.save()
+        for mode in ("uninstrumented", "disabled", "enabled"):
+            if mode == "uninstrumented":
+                count = type(storage).count.__wrapped__
+                onecmd = HBNBCommand.__mro__[1].onecmd
+            else:
+                count, onecmd = type(storage).count, HBNBCommand.onecmd
+            metrics.registry.enabled = mode == "enabled"
+            counts, commands, saving = workload(count, calls, 5)
+            timed(f"{calls} counts, {mode}", counts)
+            timed(f"{calls // 10} commands, {mode}", commands)
+            timed(f"5 saves, {mode}", saving)
+        for name, value in metrics.registry.summary():
+            if name.endswith((".p50", ".p99")):
+                print(name, value)
+        storage.warm_start(None)
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Times where-clause queries over Place objects: a full scan with the
+compiled predicate, the same query narrowed by the foreign key index and
+by a column store, against the loop a shell pipe into grep stands for.
+
+Usage: ./benchmarks/bench_query.py [number of places]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine import query  # noqa: E402
+
+
+def timed(label, function):
+    """Runs function and prints how long it took and its result."""
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<40}{time.perf_counter() - start:10.4f}s  {result}")
+    return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for i in range(count):
+        place = Place()
+        place.city_id = f"city-{i % 1000}"
+        place.price_by_night = random.randint(10, 500)
+    places = storage.objects("Place").values()
+
+    timed("loop: price < 20", lambda: sum(
+        1 for p in places if p.price_by_night < 20))
+    timed("compile: price < 20", lambda: len(query.compile_where(
+        Place, "price_by_night<20").conditions))
+    cheap = query.compile_where(Place, "price_by_night<20")
+    timed("scan: price < 20", lambda: storage.count("Place", cheap))
+    timed("loop: city_id = city-7", lambda: sum(
+        1 for p in places if p.city_id == "city-7"))
+    city = query.compile_where(Place, "city_id=city-7")
+    timed("index: city_id = city-7", lambda: storage.count("Place", city))
+    both = query.compile_where(Place, "city_id=city-7, price_by_night<20")
+    timed("index + predicate: both", lambda: storage.count("Place", both))
+    storage.enable_columns("Place")
+    timed("columns: price < 20", lambda: storage.count("Place", cheap))
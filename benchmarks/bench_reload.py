@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Compares building objects through BaseModel.__init__ (cls(**record))
+with the from_record() fast path, and times a full storage reload and save,
+then reloads with the indexes rebuilt and restored from their side file.
+
+Usage: ./benchmarks/bench_reload.py [number of objects]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def timed(label, function):
+    """Runs function and prints how long it took."""
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<32}{time.perf_counter() - start:10.4f}s")
+    return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    records = [Place(number_rooms=i, price_by_night=i % 300,
+                     id=str(i), created_at="2024-01-01T10:00:00.000001",
+                     updated_at="2024-01-01T10:00:00.000001").to_dict()
+               for i in range(count)]
+
+    timed("Place(**record)", lambda: [Place(**data) for data in records])
+    timed("Place.from_record(record)",
+          lambda: [Place.from_record(data) for data in records])
+    timed("Place.from_records(records)",
+          lambda: Place.from_records(records))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({f"Place.{data['id']}": data for data in records},
+                      file)
+        FileStorage._FileStorage__file_path = path
+        timed("storage.reload()", FileStorage().reload)
+        timed("storage.save()", FileStorage().save)
+        FileStorage().sync()
+        FileStorage().persist_indexes(None)
+        timed("reload, indexes rebuilt", FileStorage().reload)
+        FileStorage().persist_indexes()
+        timed("reload, indexes restored", FileStorage().reload)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Times a read-mostly workload, the places of a few cities listed by price
+and counts of cheap places, with one price change every ten reads, with
+the query result cache disabled and enabled.
+
+Usage: ./benchmarks/bench_result_cache.py [number of places] [reads]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.engine import query  # noqa: E402
+from models.engine.result_cache import ResultCache  # noqa: E402
+
+
+def timed(label, function):
+    """Runs function and prints how long it took."""
+    start = time.perf_counter()
+    function()
+    print(f"{label:<32}{time.perf_counter() - start:10.4f}s")
+
+
+def workload(places, reads):
+    """Lists and counts places, changing a price every ten reads."""
+    rng = random.Random(7)
+    cheap = query.compile_where(Place, "price_by_night<20")
+    cities = [query.compile_where(Place, f"city_id=city-{i}")
+              for i in range(5)]
+    for i in range(reads):
+        if i % 2:
+            storage.count("Place", cheap)
+        else:
+            list(storage.scan("Place", limit=20, where=rng.choice(cities),
+                              order="-price_by_night"))
+        if i % 10 == 9:
+            rng.choice(places).price_by_night = rng.randint(10, 500)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    places = []
+    for i in range(count):
+        place = Place()
+        place.city_id = f"city-{i % 1000}"
+        place.price_by_night = random.randint(10, 500)
+        places.append(place)
+    storage.register("results", ResultCache(capacity=0))
+    timed("cache disabled", lambda: workload(places, reads))
+    cache = storage.register("results", ResultCache())
+    timed("cache enabled", lambda: workload(places, reads))
+    print(" ".join(f"{name}={value}" for name, value in cache.stats().items()))
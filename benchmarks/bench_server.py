@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Compares operators running one console process each (every process loads
+file.json and saves it after each of its commands) with the same operators
+as sessions of one console server, pipelined and one command at a time.
+
+Usage: ./benchmarks/bench_server.py [objects in file.json] [operators]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+from server import Client  # noqa: E402
+
+COMMANDS = ["create City", "count Place", "Place.count(price_by_night<20)",
+            "create Review"] * 50
+
+
+def timed(label, function, operators):
+    """Runs function in one thread per operator and prints how long."""
+    threads = [threading.Thread(target=function) for i in range(operators)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    rate = operators * len(COMMANDS) / seconds
+    print(f"{label:<32}{seconds:10.4f}s  {rate:8.0f} commands/s")
+
+
+def wait_for(path):
+    """Waits for the server to listen on the socket at path."""
+    while not os.path.exists(path):
+        time.sleep(0.01)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    operators = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        for i in range(count):
+            Place().price_by_night = i % 300
+        storage.save()
+        console = [sys.executable, os.path.join(ROOT, "console.py")]
+        timed("console process per operator", lambda: subprocess.run(
+            console + ["--batch", "-", "--commit-every", "1"],
+            input="\n".join(COMMANDS), capture_output=True, text=True,
+            check=True), operators)
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "server.py"),
+             "unix:hbnb.sock"], stderr=subprocess.DEVNULL)
+        try:
+            wait_for("hbnb.sock")
+
+            def one_by_one():
+                """Waits for each output before sending the next."""
+                with Client("unix:hbnb.sock") as client:
+                    for command in COMMANDS:
+                        client.run(command)
+
+            def pipelined():
+                """Sends all the commands at once."""
+                with Client("unix:hbnb.sock") as client:
+                    for output in client.pipeline(COMMANDS):
+                        pass
+
+            timed("server, one by one", one_by_one, operators)
+            timed("server, pipelined", pipelined, operators)
+        finally:
+            server.terminate()
+            server.wait()
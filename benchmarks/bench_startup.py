@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Times startup in fresh interpreters over a generated file.json: `import
+models` and `import console`, which leave storage unloaded, then
+`models.init()` on a cold start parsing the JSON file and rebuilding the
+indexes, and on a warm start loading the snapshot and index side files the
+cold start left behind.
+
+Usage: ./benchmarks/bench_startup.py [number of objects]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIMED = ("import time; start = time.perf_counter(); {}; "
+         "print(time.perf_counter() - start)")
+
+
+def startup(directory, code="import models; models.init()"):
+    """Returns the seconds code takes in a new interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", TIMED.format(code)], cwd=directory,
+        check=True, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=ROOT)).stdout
+    return float(output)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "file.json"), "w",
+                  encoding="utf-8") as file:
+            json.dump({f"Place.{i}": {
+                "__class__": "Place", "id": str(i), "city_id": f"c{i % 100}",
+                "price_by_night": i % 300,
+                "created_at": "2024-01-01T10:00:00.000001",
+                "updated_at": "2024-01-01T10:00:00.000001"}
+                for i in range(count)}, file)
+        print(f"{'import models (lazy)':<32}"
+              f"{startup(directory, 'import models'):10.4f}s")
+        print(f"{'import console (lazy)':<32}"
+              f"{startup(directory, 'import console'):10.4f}s")
+        print(f"{'cold start (JSON)':<32}{startup(directory):10.4f}s")
+        print(f"{'warm start (snapshot)':<32}{startup(directory):10.4f}s")
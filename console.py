@@ -1,30 +1,107 @@
 #!/usr/bin/python3
 """This module defines the entry point of the command interpreter."""
+import argparse
+import ast
 import cmd
+import contextlib
+import functools
+import importlib
+import io
+import json
 import re
 import shlex
-from models import storage
-from models.base_model import BaseModel
-from models.user import User
-from models.state import State
-from models.city import City
-from models.place import Place
-from models.amenity import Amenity
-from models.review import Review
+import sys
+import time
+from collections.abc import Mapping
+from datetime import datetime
+import models
+from models.engine import bulk, metrics, query, schema
+
+_OPTION = re.compile(r"""--(\w+)(?:=|\s+)("[^"]*"|'[^']*'|[^\s,]*)\s*,?""")
+_CHANGES = re.compile(r"(?P<where>.*?)[\s,]*(?P<changes>\{.*\})\s*", re.DOTALL)
+_TOKEN = re.compile(r"""(?:"[^"\\]*"|'[^']*'|[^\s"'\\])+""")
+_QUOTED = re.compile(r""""([^"\\]*)"|'([^']*)'""")
+_CALL = re.compile(r"(\w+)\.(\w+)\((.*)\)", re.DOTALL)
+_CURLIES = re.compile(r"\{.*\}", re.DOTALL)
+_BRACKETS = re.compile(r"\[.*\]", re.DOTALL)
+
+
+@functools.lru_cache(maxsize=4096)
+def split_args(text):
+    """
+    Returns the tuple of the shell-like words of text, as shlex.split()
+    would, with the surrounding commas of each word stripped. Words with
+    plain quotes are read by precompiled regexes; text with backslashes
+    or unbalanced quotes goes through shlex.
+    """
+    if "\\" not in text and not _TOKEN.sub("", text).strip():
+        words = (_QUOTED.sub(_unquote, word) for word in _TOKEN.findall(text))
+    else:
+        words = shlex.split(text)
+    return tuple(word.strip(",") for word in words)
+
+
+def _unquote(match):
+    """Returns the text between the quotes of a _QUOTED match."""
+    double, single = match.groups()
+    return single if double is None else double
+
+
+def _integer(value, name, minimum=0):
+    """
+    Returns value, a string of decimal digits, as an int of at least
+    minimum, or prints ** invalid <name> ** and returns None.
+    """
+    try:
+        number = int(value) if value.isdecimal() else None
+    except ValueError:
+        number = None
+    if number is None or number < minimum:
+        print(f"** invalid {name} **")
+        return None
+    return number
+
+
+class ClassTable(Mapping):
+    """
+    ClassTable maps the model class names to their classes, importing the
+    module of a class the first time it is looked up, so the console starts
+    without importing every model.
+    ATTRIBUTES:
+        modules: the name of the module defining each class
+    """
+    modules = {
+        "BaseModel": "models.base_model",
+        "User": "models.user",
+        "State": "models.state",
+        "City": "models.city",
+        "Place": "models.place",
+        "Amenity": "models.amenity",
+        "Review": "models.review"
+    }
+
+    def __getitem__(self, name):
+        """Returns the class called name, importing its module."""
+        module = importlib.import_module(self.modules[name])
+        return getattr(module, name)
+
+    def __contains__(self, name):
+        """Tells whether name is a class name, without importing it."""
+        return name in self.modules
+
+    def __iter__(self):
+        """Iterates over the class names."""
+        return iter(self.modules)
+
+    def __len__(self):
+        """Returns the number of classes."""
+        return len(self.modules)
 
 
 class HBNBCommand(cmd.Cmd):
     """HBNB console"""
     prompt = '(hbnb) '
-    classes = {
-        "BaseModel": BaseModel,
-        "User": User,
-        "State": State,
-        "City": City,
-        "Place": Place,
-        "Amenity": Amenity,
-        "Review": Review
-    }
+    classes = ClassTable()
 
     def do_quit(self, arg):
         """Quit command to exit the program"""
@@ -40,20 +117,28 @@ class HBNBCommand(cmd.Cmd):
         pass
 
     def do_create(self, arg):
-        """Creates a new instance of BaseModel, saves it and prints the id"""
-        if not arg:
+        """
+        Creates instances of a class (one by default), saves them once and
+        prints their ids: create <class name> [<count>]
+        """
+        class_name, space, count = arg.strip().partition(" ")
+        if not class_name:
             print("** class name missing **")
             return
-        try:
-            new_instance = eval(arg)()
-            new_instance.save()
-            print(new_instance.id)
-        except NameError:
+        if class_name not in HBNBCommand.classes:
             print("** class doesn't exist **")
+            return
+        count = _integer(count.strip() or "1", "count", 1)
+        if count is None:
+            return
+        model = HBNBCommand.classes[class_name]
+        instances = [model() for i in range(count)]
+        models.storage.save()
+        print("\n".join(instance.id for instance in instances))
 
     def do_show(self, arg):
         """Prints the string representation of an instance"""
-        args = shlex.split(arg)
+        args = split_args(arg)
         if not args:
             print("** class name missing **")
             return
@@ -65,14 +150,14 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
         key = f"{class_name}.{args[1]}"
-        if key not in storage.all():
+        if key not in models.storage.all():
             print("** no instance found **")
         else:
-            print(storage.all()[key])
+            print(models.storage.all()[key])
 
     def do_destroy(self, arg):
         """Deletes an instance based on the class name and id"""
-        args = shlex.split(arg)
+        args = split_args(arg)
         if not args:
             print("** class name missing **")
             return
@@ -84,38 +169,278 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
         key = f"{class_name}.{args[1]}"
-        if key in storage.all():
-            del storage.all()[key]
-            storage.save()
+        if key in models.storage.all():
+            models.storage.delete(models.storage.all()[key])
+            models.storage.save()
         else:
             print("** no instance found **")
 
     def do_all(self, arg):
-        """Prints all string representation of all instances"""
-        args = shlex.split(arg)
-        obj_list = []
-        if not args:
-            for obj in storage.all().values():
-                obj_list.append(str(obj))
-        elif args[0] in HBNBCommand.classes:
-            for key, obj in storage.all().items():
-                if key.startswith(args[0]):
-                    obj_list.append(str(obj))
+        """
+        Prints all string representation of all instances, as they are
+        read: all [<class name> [<where-clauses>]] [--limit=<n>]
+        [--offset=<n>] [--cursor=<key>] [--format=repr|jsonl]
+        [--order=[-]<attribute>]
+        """
+        options = {"limit": None, "offset": 0, "cursor": None,
+                   "format": "repr", "order": None}
+        for name, value in _OPTION.findall(arg):
+            if name not in options:
+                print(f"** unknown option --{name} **")
+                return
+            value = value.strip("\"'")
+            if name in ("limit", "offset"):
+                value = _integer(value, name)
+                if value is None:
+                    return
+            options[name] = value
+        text = _OPTION.sub("", arg).strip()
+        class_name, space, where = text.partition(" ")
+        class_name = class_name or None
+        if class_name is not None and class_name not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if options["format"] not in ("repr", "jsonl"):
+            print(f"** unknown format {options['format']} **")
+            return
+        if options["order"] is not None and class_name is None:
+            print("** class name missing **")
+            return
+        limit = options["limit"]
+        try:
+            items = models.storage.scan(
+                class_name, options["cursor"], options["offset"],
+                None if limit is None else limit + 1,
+                HBNBCommand.where(class_name, where), options["order"])
+        except ValueError as error:
+            print(f"** {error} **")
+            return
+        except KeyError:
+            print("** cursor not found **")
+            return
+        HBNBCommand.write_all(items, limit, options["format"])
+
+    @staticmethod
+    def where(class_name, text):
+        """
+        Returns the compiled query of the where-clauses text over
+        class_name, None for no clause. Raises ValueError for bad clauses.
+        """
+        if not text.strip():
+            return None
+        return query.compile_where(HBNBCommand.classes[class_name], text)
+
+    @staticmethod
+    def write_all(items, limit, fmt, chunk=1000):
+        """
+        Streams (key, obj) items to stdout as a list of their strings or
+        as JSON lines, followed by the cursor of the next page when items
+        holds more than limit objects. The first object is written at
+        once, then the output goes out chunk objects at a time.
+        """
+        out = sys.stdout
+        forms = models.storage.forms()
+        count, cursor, last = 0, None, None
+        pending = []
+        for key, obj in items:
+            if count == limit:
+                cursor = last
+                break
+            if fmt == "jsonl":
+                pending.append(forms.json(obj, key) + "\n")
+            else:
+                pending.append(repr(forms.text(obj, key)))
+            count += 1
+            last = key
+            if count == 1 or len(pending) == chunk:
+                HBNBCommand.__write_chunk(out, pending, fmt, count)
+                pending = []
+        HBNBCommand.__write_chunk(out, pending, fmt, count)
+        if fmt != "jsonl":
+            out.write("]\n" if count else "[]\n")
+        if cursor is not None:
+            out.write(json.dumps({"__cursor__": cursor}) + "\n"
+                      if fmt == "jsonl" else f"cursor: {cursor}\n")
+
+    @staticmethod
+    def __write_chunk(out, pending, fmt, count):
+        """Writes and flushes pending output, count objects in so far."""
+        if not pending:
+            return
+        if fmt == "jsonl":
+            out.write("".join(pending))
         else:
+            first = count == len(pending)
+            out.write(("[" if first else ", ") + ", ".join(pending))
+        out.flush()
+
+    def do_changes(self, arg):
+        """
+        Exports as JSON lines the instances updated after a date:
+        changes <ISO-8601 date|change sequence number> [<file>]
+        """
+        args = split_args(arg)
+        if not args:
+            print("** date missing **")
+            return
+        try:
+            since = (int(args[0]) if args[0].isdigit()
+                     else datetime.fromisoformat(args[0]))
+        except ValueError:
+            print("** invalid date **")
+            return
+        try:
+            if len(args) > 1:
+                with open(args[1], "w", encoding="utf-8") as file:
+                    count = models.storage.export_changes(file, since)
+                print(count)
+            else:
+                models.storage.export_changes(sys.stdout, since)
+        except ValueError as error:
+            print(f"** {error} **")
+
+    def do_import(self, arg):
+        """
+        Loads instances of a class from a JSON lines or CSV file:
+        import <class name> <file> [jsonl|csv] [batch=<rows>]
+        """
+        args = split_args(arg)
+        if not args:
+            print("** class name missing **")
+            return
+        if args[0] not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if len(args) < 2:
+            print("** file missing **")
+            return
+        fmt, batch_size = None, 100000
+        for token in args[2:]:
+            name, equal, value = token.partition("=")
+            if name == "batch" and equal:
+                batch_size = _integer(value, "batch")
+                if batch_size is None:
+                    return
+            elif not equal:
+                fmt = name
+        try:
+            report = bulk.load(args[1], args[0], fmt, batch_size)
+        except (OSError, ValueError) as error:
+            print(f"** {error} **")
+            return
+        for number, message in report["errors"]:
+            print(f"** line {number}: {message} **")
+        print(bulk.summary(report))
+
+    def do_export(self, arg):
+        """
+        Writes the instances of a class to a JSON lines or CSV file:
+        export <class name> <file> [jsonl|csv]
+        """
+        args = split_args(arg)
+        if not args:
+            print("** class name missing **")
+            return
+        if args[0] not in HBNBCommand.classes:
             print("** class doesn't exist **")
             return
-        print(obj_list)
+        if len(args) < 2:
+            print("** file missing **")
+            return
+        try:
+            print(bulk.dump(args[1], args[0], *args[2:3]))
+        except (OSError, ValueError) as error:
+            print(f"** {error} **")
 
     def do_count(self, arg):
-        """Counts the number of instances of a class"""
-        if not arg:
+        """
+        Counts the number of instances of a class, or of those matching
+        where-clauses: count <class name> [<where-clauses>]
+        """
+        class_name, space, where = arg.strip().partition(" ")
+        if not class_name:
+            print("** class name missing **")
+            return
+        if class_name not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        try:
+            print(models.storage.count(
+                class_name, HBNBCommand.where(class_name, where)))
+        except ValueError as error:
+            print(f"** {error} **")
+
+    def do_stats(self, arg):
+        """
+        Prints the objects of each class, the counters of the query result
+        cache and the storage and command metrics (counts, latency p50,
+        p95 and p99 in seconds, bytes read and written), switches metrics
+        on or off, resets them or writes them in the Prometheus text
+        format: stats [on|off|reset|export <file>]
+        """
+        args = split_args(arg)
+        option = args[0] if args else ""
+        if option in ("on", "off"):
+            metrics.registry.enabled = option == "on"
+        elif option == "reset":
+            metrics.registry.reset()
+        elif option == "export":
+            if len(args) < 2:
+                print("** file missing **")
+                return
+            try:
+                metrics.registry.write(args[1], models.storage.gauges())
+            except OSError as error:
+                print(f"** {error} **")
+        elif option:
+            print("** stats option doesn't exist **")
+        else:
+            print(f"metrics {'on' if metrics.registry.enabled else 'off'}")
+            for name in HBNBCommand.classes:
+                print(f"objects.{name} {len(models.storage.objects(name))}")
+            print(f"forms.objects {models.storage.forms().size()}")
+            for name, value in models.storage.results().stats().items():
+                print(f"cache.{name} {value}")
+            for name, value in metrics.registry.summary():
+                print(f"{name} {value}")
+
+    def do_aggregate(self, arg):
+        """
+        Aggregates the instances of a class:
+        aggregate <class name> [count] [group_by=<attribute>]
+        [sum|avg|min|max=<attribute>] [<attribute>=<value>] [workers=<n>]
+        """
+        args = list(split_args(arg))
+        if not args:
             print("** class name missing **")
             return
-        if arg not in HBNBCommand.classes:
+        if args[0] not in HBNBCommand.classes:
             print("** class doesn't exist **")
             return
-        count = sum(1 for key in storage.all() if key.startswith(f"{arg}."))
-        print(count)
+        coercers = schema.of(HBNBCommand.classes[args[0]]).coercers
+        options = {"count": False, "where": {}}
+        for token in args[1:]:
+            name, equal, value = token.partition("=")
+            if not equal:
+                options["count"] = options["count"] or name == "count"
+            elif name in ("group_by", "sum", "avg", "min", "max"):
+                options[name] = value
+            elif name == "workers":
+                options[name] = _integer(value, name)
+                if options[name] is None:
+                    return
+            else:
+                coercer = coercers.get(name)
+                try:
+                    options["where"][name] = \
+                        value if coercer is None else coercer(value)
+                except ValueError as error:
+                    print(f"** {error} **")
+                    return
+        try:
+            print(models.storage.aggregate(args[0], **options))
+        except ValueError as error:
+            print(f"** {error} **")
 
     def do_update(self, arg):
         """
@@ -123,7 +448,7 @@ class HBNBCommand(cmd.Cmd):
         a given attribute key/value pair or dictionary.
         """
         args = HBNBCommand.args_parser(arg)
-        objects = storage.all()
+        objects = models.storage.all()
 
         if not args:
             print("** class name missing **")
@@ -144,76 +469,219 @@ class HBNBCommand(cmd.Cmd):
             return False
         if len(args) == 3:
             try:
-                if not isinstance(eval(args[2]), dict):
-                    print("** value missing **")
-                    return False
-            except (NameError, SyntaxError):
+                updates = ast.literal_eval(args[2])
+            except (ValueError, SyntaxError):
+                updates = None
+            if not isinstance(updates, dict):
                 print("** value missing **")
                 return False
 
+        if len(args) >= 4:
+            updates = {args[2]: args[3]}
+        coerce = schema.of(HBNBCommand.classes[args[0]]).coerce
+        try:
+            updates = {name: coerce(name, value)
+                       for name, value in updates.items()}
+        except ValueError as error:
+            print(f"** {error} **")
+            return False
+
         obj = objects[instance_key]
+        for name, value in updates.items():
+            setattr(obj, name, value)
+        obj.save()
 
-        if len(args) == 4:
-            attr_name, attr_value = args[2], args[3]
-            if attr_name in obj.__class__.__dict__:
-                value_type = type(obj.__class__.__dict__[attr_name])
-                obj.__dict__[attr_name] = value_type(attr_value)
-            else:
-                obj.__dict__[attr_name] = attr_value
-        elif isinstance(eval(args[2]), dict):
-            updates = eval(args[2])
-            for key, value in updates.items():
-                if (key in obj.__class__.__dict__ and
-                        type(
-                            obj.__class__.__dict__[key]
-                            ) in {str, int, float}):
-                    value_type = type(obj.__class__.__dict__[key])
-                    obj.__dict__[key] = value_type(value)
-                else:
-                    obj.__dict__[key] = value
-
-        storage.save()
+    def do_update_where(self, arg):
+        """
+        Sets attributes on every instance matching where-clauses, saving
+        once: update_where <class name> <where-clauses> <dictionary>
+        """
+        class_name, space, text = arg.strip().partition(" ")
+        if not class_name:
+            print("** class name missing **")
+            return
+        if class_name not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        match = _CHANGES.fullmatch(text)
+        if match is None:
+            print("** dictionary missing **")
+            return
+        if not match.group("where").strip():
+            print("** where clause missing **")
+            return
+        try:
+            changes = ast.literal_eval(match.group("changes"))
+            if not isinstance(changes, dict):
+                raise ValueError("dictionary missing")
+            coerce = schema.of(HBNBCommand.classes[class_name]).coerce
+            changes = {name: coerce(name, value)
+                       for name, value in changes.items()}
+            where = HBNBCommand.where(class_name, match.group("where"))
+        except (ValueError, SyntaxError) as error:
+            print(f"** {error} **")
+            return
+        print(models.storage.update_where(class_name, where, changes))
+        models.storage.save()
+
+    def do_destroy_where(self, arg):
+        """
+        Deletes every instance matching where-clauses, saving once:
+        destroy_where <class name> <where-clauses>
+        """
+        class_name, space, text = arg.strip().partition(" ")
+        if not class_name:
+            print("** class name missing **")
+            return
+        if class_name not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if not text.strip():
+            print("** where clause missing **")
+            return
+        try:
+            where = HBNBCommand.where(class_name, text)
+        except ValueError as error:
+            print(f"** {error} **")
+            return
+        print(models.storage.delete_where(class_name, where))
+        models.storage.save()
 
     def default(self, arg):
         """
         Handle unrecognized commands and allow for dot notation
         (e.g., ClassName.command(args)).
         """
-        match = re.search(r"\.", arg)
+        match = _CALL.match(arg)
         if match:
-            class_name, command_with_args = arg[
-                :match.start()], arg[match.end():]
+            class_name, command, command_args = match.groups()
             if class_name in HBNBCommand.classes:
-                match = re.search(r"\((.*?)\)", command_with_args)
-                if match:
-                    command = command_with_args[:match.start()]
-                    command_args = match.group(1)
-                    method = getattr(self, f"do_{command}", None)
-                    if method:
-                        call_args = f"{class_name} {command_args}".strip()
-                        return method(call_args)
+                method = getattr(self, f"do_{command}", None)
+                if method:
+                    return method(f"{class_name} {command_args}".strip())
         print(f"*** Unknown syntax: {arg}")
         return False
 
+    def onecmd(self, line):
+        """Runs one command, timing it when metrics are enabled."""
+        if not metrics.registry.enabled:
+            return super().onecmd(line)
+        line = line.strip()
+        match = _CALL.match(line)
+        command = match.group(2) if match else line.partition(" ")[0]
+        if not hasattr(self, f"do_{command}"):
+            command = "unknown"
+        start = time.perf_counter()
+        try:
+            return super().onecmd(line)
+        finally:
+            metrics.registry.observe("console_command_seconds",
+                                     time.perf_counter() - start,
+                                     ("command", command))
+
+    def run_batch(self, lines, commit_every=0, keep_going=False):
+        """
+        Runs script lines as commands, without prompts, deferring storage
+        saves to a commit every commit_every commands (0 for one commit
+        at the end). Blank lines and # comments are skipped. Stops at the
+        first command printing an error unless keep_going, and returns
+        the {"commands", "errors", "commits", "seconds"} summary.
+        """
+        summary = {"commands": 0, "errors": 0, "commits": 0, "seconds": 0.0}
+        start = time.perf_counter()
+        models.storage.defer()
+        try:
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                summary["commands"] += 1
+                output, stop, failed = self.execute(line)
+                sys.stdout.write(output)
+                summary["errors"] += failed
+                if commit_every and summary["commands"] % commit_every == 0:
+                    summary["commits"] += models.storage.commit()
+                if stop or (failed and not keep_going):
+                    break
+        finally:
+            summary["commits"] += models.storage.commit()
+            models.storage.defer(False)
+            summary["seconds"] = time.perf_counter() - start
+        return summary
+
+    def execute(self, line):
+        """
+        Runs one command with its output captured and returns the
+        (output, stop, failed) of it, failed telling if it printed an
+        error. An exception raised by the command is printed as an error.
+        """
+        output = io.StringIO()
+        stdout, self.stdout = self.stdout, output
+        with contextlib.redirect_stdout(output):
+            try:
+                stop = self.onecmd(self.precmd(line))
+            except Exception as error:
+                print(f"** {error} **")
+                stop = False
+            finally:
+                self.stdout = stdout
+        output = output.getvalue()
+        failed = any(text.startswith("**") for text in output.splitlines())
+        if failed:
+            metrics.registry.count("console_errors_total")
+        return output, stop, failed
+
     @staticmethod
     def args_parser(arg):
-        """Parse input arguments and handle special characters"""
-        curlies = re.search(r"\{(.*?)\}", arg)
-        brackets = re.search(r"\[(.*?)\]", arg)
+        """
+        Splits update arguments into words, keeping a trailing dictionary
+        or list literal as one word.
+        """
+        literal = _CURLIES.search(arg) or _BRACKETS.search(arg)
+        if literal is None:
+            return list(split_args(arg))
+        return [*split_args(arg[:literal.start()]), literal.group()]
 
-        def split_and_strip(input_str):
-            return [item.strip(",") for item in shlex.split(input_str)]
 
-        if curlies:
-            lexer = split_and_strip(arg[:curlies.span()[0]])
-            lexer.append(curlies.group())
-            return lexer
-        elif brackets:
-            lexer = split_and_strip(arg[:brackets.span()[0]])
-            lexer.append(brackets.group())
-            return lexer
-        return split_and_strip(arg)
+def main(argv=None):
+    """Runs the console, or the commands of a script or of -c options."""
+    parser = argparse.ArgumentParser(
+        prog="console.py", description="HBNB command interpreter")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--batch", metavar="FILE",
+                        help="runs the commands of FILE, - for stdin")
+    source.add_argument("-c", dest="commands", action="append",
+                        metavar="COMMAND", help="runs COMMAND (repeatable)")
+    parser.add_argument("--commit-every", type=int, default=0, metavar="N",
+                        help="saves every N commands instead of at the end")
+    parser.add_argument("--keep-going", action="store_true",
+                        help="runs the next commands after an error")
+    parser.add_argument("--changes", metavar="FILE",
+                        help="appends the storage changes to FILE, for "
+                        "'changes <sequence number>'")
+    options = parser.parse_args(argv)
+    if options.changes is not None:
+        models.storage.changes().open(options.changes)
+    if options.batch is None and options.commands is None:
+        HBNBCommand().cmdloop()
+        return 0
+    console = HBNBCommand()
+    if options.commands is not None:
+        summary = console.run_batch(options.commands, options.commit_every,
+                                    options.keep_going)
+    elif options.batch == "-":
+        summary = console.run_batch(sys.stdin, options.commit_every,
+                                    options.keep_going)
+    else:
+        with open(options.batch, "r", encoding="utf-8") as file:
+            summary = console.run_batch(file, options.commit_every,
+                                        options.keep_going)
+    rate = summary["commands"] / (summary["seconds"] or 1e-9)
+    print(f"{summary['commands']} commands, {summary['errors']} errors, "
+          f"{summary['commits']} commits in {summary['seconds']:.2f}s "
+          f"({rate:.0f} commands/s)", file=sys.stderr)
+    return 1 if summary["errors"] else 0
 
 
 if __name__ == '__main__':
-    HBNBCommand().cmdloop()
+    sys.exit(main())
@@ -1,9 +1,29 @@
 #!/usr/bin/python3
 """
 __init__ module
+
+Storage is loaded on first access to `models.storage` (or on
+`from models import storage`), not when the package is imported, so
+importing a model does not read file.json. Call init() to load it eagerly.
 """
-from models.engine.file_storage import FileStorage
+
+_storage = None
+
+
+def init():
+    """Creates and reloads the storage once, and returns it."""
+    global _storage
+    if _storage is None:
+        from models.engine.file_storage import FileStorage
+        _storage = FileStorage()
+        # set before reload() so the instances it builds find it
+        globals()["storage"] = _storage
+        _storage.reload()
+    return _storage
 
 
-storage = FileStorage()
-storage.reload()
+def __getattr__(name):
+    """Loads the storage on first access to models.storage."""
+    if name == "storage":
+        return init()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,8 +2,147 @@
 '''
 BaseModel defines all common attributes/methods for other classes.
 '''
+import os
+import threading
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+import models
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def uuid4_id():
+    """Returns a random UUID4 id."""
+    return str(uuid.uuid4())
+
+
+_last_uuid7 = [0, 0]
+_uuid7_lock = threading.Lock()
+
+
+def uuid7_id():
+    """
+    Returns a UUIDv7-style id: 48 bits of Unix milliseconds, a 12 bit
+    counter keeping the ids made within one millisecond increasing, and
+    62 random bits. The ids sort lexicographically by creation time.
+    """
+    with _uuid7_lock:
+        millis = time.time_ns() // 1000000
+        last_millis, counter = _last_uuid7
+        if millis <= last_millis:
+            millis, counter = last_millis, counter + 1
+            if counter > 0xfff:
+                millis, counter = millis + 1, 0
+        else:
+            counter = 0
+        _last_uuid7[:] = millis, counter
+    value = (millis << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 |
+             int.from_bytes(os.urandom(8), "big") >> 2)
+    digits = f"{value:032x}"
+    return (f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-"
+            f"{digits[16:20]}-{digits[20:]}")
+
+
+def is_uuid7(model_id):
+    """Tells whether model_id was made by uuid7_id()."""
+    return (len(model_id) == 36 and model_id[14] == "7" and
+            model_id[19] in "89ab")
+
+
+def uuid7_millis(model_id):
+    """Returns the Unix milliseconds encoded in a uuid7_id() id."""
+    return int(model_id[:8] + model_id[9:13], 16)
+
+
+def uuid7_prefix(millis):
+    """Returns the id prefix of the uuid7_id() ids made at millis."""
+    digits = f"{millis:012x}"
+    return f"{digits[:8]}-{digits[8:]}"
+
+
+generate_id = uuid7_id
+
+
+def set_id_generator(generator):
+    """
+    Makes BaseModel.__init__ use generator, a function returning a new
+    unique string id (uuid7_id by default, uuid4_id for random ids).
+    """
+    global generate_id
+    generate_id = generator
+
+
+class Timestamp:
+    """
+    Timestamp is the descriptor of created_at and updated_at. Naive
+    datetimes are kept in the instance __dict__ as integer microseconds
+    since EPOCH, ISO-8601 strings read from storage are kept as is until
+    first read, and a datetime is only built when the attribute is read.
+    """
+
+    def __set_name__(self, owner, name):
+        """Remembers the attribute name."""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """Returns the timestamp of obj as a datetime."""
+        if obj is None:
+            return self
+        try:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if value.__class__ is str:
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                value = datetime.now()
+            obj.__dict__[self.name] = Timestamp.encode(value)
+            return value
+        if value.__class__ is int:
+            return EPOCH + MICROSECOND * value
+        return value
+
+    def __set__(self, obj, value):
+        """Stores value as microseconds when it is a naive datetime."""
+        obj.__dict__[self.name] = Timestamp.encode(value)
+
+    @staticmethod
+    def encode(value):
+        """Returns the stored form of a timestamp value."""
+        if value.__class__ is datetime and value.tzinfo is None:
+            return (value - EPOCH) // MICROSECOND
+        return value
+
+    @staticmethod
+    def micros(value):
+        """
+        Returns a stored timestamp value as microseconds since EPOCH,
+        None when it is not a valid timestamp.
+        """
+        if value.__class__ is int:
+            return value
+        if value.__class__ is str:
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return None
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone().replace(tzinfo=None)
+            return (value - EPOCH) // MICROSECOND
+        return None
+
+    @staticmethod
+    def isoformat(value):
+        """Returns the ISO-8601 form of a stored timestamp value."""
+        if value.__class__ is str:
+            return value
+        if value.__class__ is int:
+            return (EPOCH + MICROSECOND * value).isoformat()
+        return value.isoformat()
 
 
 class BaseModel:
@@ -11,10 +150,16 @@ class BaseModel:
     BaseModel defines all common attributes methods for other classes.
     ATTRIBUTES:
         __init__: initializes a new instance of BaseModel
+        from_record: builds an instance from its to_dict() form
+        from_records: builds instances from a list of to_dict() forms
+        __setattr__: sets an attribute and notifies storage of the change
         __str__: returns a string representation of the instance
         save: updates the public instance attribute updated_at
         to_dict: returns a dictionary representation of the instance
+        _text, _record: build the two representations without memo
     """
+    created_at = Timestamp()
+    updated_at = Timestamp()
 
     def __init__(self, *args, **kwargs):
         """Initializes a new instance of BaseModel."""
@@ -28,16 +173,89 @@ class BaseModel:
                 elif key != "__class__":
                     setattr(self, key, value)
         else:
-            self.id = str(uuid.uuid4())
+            self.id = generate_id()
             self.created_at = datetime.now()
             self.updated_at = datetime.now()
 
             from models import storage
             storage.new(self)
 
+    _timestamps = ("created_at", "updated_at")
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Builds an instance from its to_dict() form without running
+        __init__: every key lands in __dict__ in a single update and the
+        timestamps are only decoded when first read.
+        """
+        return cls.from_records((record,))[0]
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds a list of instances from a list of to_dict() forms."""
+        new = cls.__new__
+        attributes = cls._attributes
+        objects = []
+        for record in records:
+            obj = new(cls)
+            obj.__dict__.update(attributes(record))
+            objects.append(obj)
+        return objects
+
+    @classmethod
+    def _attributes(cls, record):
+        """
+        Returns the instance attributes stored in a to_dict() form and
+        raises TypeError for timestamps that are not strings.
+        """
+        attributes = dict(record)
+        attributes.pop("__class__", None)
+        for name in cls._timestamps:
+            if name in attributes and \
+                    attributes[name].__class__ is not str:
+                raise TypeError(f"{name} must be an ISO-8601 string")
+        return attributes
+
+    @staticmethod
+    def _decode_timestamp(value):
+        """
+        Returns the datetime of an ISO-8601 string, now for a malformed
+        one, and raises TypeError for values that are not strings.
+        """
+        if isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return datetime.now()
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and lets storage indexes follow the change."""
+        old = getattr(self, name, None)
+        super().__setattr__(name, value)
+
+        storage = vars(models).get("storage")
+        if storage is not None:
+            storage.changed(self, name, old)
+
     def __str__(self):
-        """Returns a string representation of the BaseModel instance."""
-        return f"[{self.__class__.__name__}] ({self.id}) {self.__dict__}"
+        """
+        Returns a string representation of the BaseModel instance,
+        memoized by storage while the instance is stored and unchanged.
+        """
+        storage = vars(models).get("storage")
+        if storage is None:
+            return self._text()
+        return storage.forms().text(self)
+
+    def _text(self):
+        """Builds the string representation of the instance."""
+        attributes = dict(self.__dict__)
+        for name in self._timestamps:
+            if name in attributes:
+                attributes[name] = getattr(self, name)
+        return f"[{self.__class__.__name__}] ({self.id}) {attributes}"
 
     def save(self):
         """Updates `updated_at` and saves the instance to storage."""
@@ -47,9 +265,21 @@ class BaseModel:
         storage.save()
 
     def to_dict(self):
-        """Returns a dictionary representation of the instance."""
-        my_dict = dict(self.__dict__)
+        """
+        Returns a dictionary representation of the instance, copied from
+        the one storage memoizes while the instance is stored and
+        unchanged.
+        """
+        storage = vars(models).get("storage")
+        if storage is None:
+            return self._record()
+        return dict(storage.forms().record(self))
+
+    def _record(self):
+        """Builds the dictionary representation of the instance."""
+        attributes = self.__dict__
+        my_dict = dict(attributes)
         my_dict["__class__"] = self.__class__.__name__
-        my_dict["created_at"] = self.created_at.isoformat()
-        my_dict["updated_at"] = self.updated_at.isoformat()
+        my_dict["created_at"] = Timestamp.isoformat(attributes["created_at"])
+        my_dict["updated_at"] = Timestamp.isoformat(attributes["updated_at"])
         return my_dict
@@ -0,0 +1,221 @@
+#!/usr/bin/python3
+'''
+Defines compact, __slots__ based variants of the model classes.
+'''
+from collections.abc import MutableMapping
+import models
+from models.base_model import BaseModel
+
+
+class CompactModel:
+    """
+    CompactModel is the base of the classes built by compact(). Their
+    instances keep the model schema (id, timestamps and every public class
+    attribute) in __slots__ and only allocate an overflow dict for ad-hoc
+    attributes. They report the model class as __class__, so keys,
+    to_dict(), __str__ and isinstance() checks see the regular model, and
+    __dict__ is a live view of the set attributes.
+    ATTRIBUTES:
+        model: the model class the compact class stands for
+        schema: the names kept in __slots__
+    """
+    __slots__ = ("_overflow", "__weakref__")
+    model = BaseModel
+    schema = frozenset()
+
+    __init__ = BaseModel.__init__
+    _timestamps = BaseModel._timestamps
+    _decode_timestamp = BaseModel.__dict__["_decode_timestamp"]
+
+    @classmethod
+    def _attributes(cls, record):
+        """Returns the attributes of a record with decoded timestamps."""
+        attributes = dict(record)
+        attributes.pop("__class__", None)
+        for name in cls._timestamps:
+            if name in attributes:
+                attributes[name] = cls._decode_timestamp(attributes[name])
+        return attributes
+    __str__ = BaseModel.__str__
+    _text = BaseModel._text
+    save = BaseModel.save
+    to_dict = BaseModel.to_dict
+    _record = BaseModel._record
+
+    @classmethod
+    def from_record(cls, record):
+        """Builds an instance from its to_dict() form, like BaseModel."""
+        return cls.from_records((record,))[0]
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds a list of instances from a list of to_dict() forms."""
+        return [restore(cls.model, cls._attributes(record))
+                for record in records]
+
+    @property
+    def __class__(self):
+        """Returns the model class this instance stands for."""
+        return type(self).model
+
+    @property
+    def __dict__(self):
+        """Returns a live mapping of the attributes set on the instance."""
+        return SlotsView(self)
+
+    def __getattr__(self, name):
+        """Looks name up in the overflow dict, then the model defaults."""
+        if name != "_overflow":
+            try:
+                return self._overflow[name]
+            except (AttributeError, KeyError):
+                pass
+            if not name.startswith("__"):
+                try:
+                    return getattr(type(self).model, name)
+                except AttributeError:
+                    pass
+        raise AttributeError(
+            f"'{type(self).model.__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        """Sets a slot or overflow attribute and notifies storage."""
+        old = getattr(self, name, None)
+        if name in type(self).schema:
+            object.__setattr__(self, name, value)
+        else:
+            try:
+                self._overflow[name] = value
+            except AttributeError:
+                object.__setattr__(self, "_overflow", {name: value})
+
+        storage = vars(models).get("storage")
+        if storage is not None:
+            storage.changed(self, name, old)
+
+    def __reduce__(self):
+        """Pickles the instance as its model and set attributes."""
+        return (restore, (type(self).model, dict(SlotsView(self))))
+
+    def __delattr__(self, name):
+        """Deletes a slot or overflow attribute."""
+        if name in type(self).schema:
+            object.__delattr__(self, name)
+            return
+        try:
+            del self._overflow[name]
+        except (AttributeError, KeyError):
+            raise AttributeError(name) from None
+
+
+class SlotsView(MutableMapping):
+    """
+    SlotsView presents the slots and overflow attributes of a compact
+    instance as the dictionary a regular instance would have in __dict__.
+    """
+    __slots__ = ("__obj",)
+
+    def __init__(self, obj):
+        """Wraps the compact instance obj."""
+        self.__obj = obj
+
+    def __getitem__(self, name):
+        """Returns the value of the attribute name set on the instance."""
+        obj = self.__obj
+        if name in type(obj).schema:
+            try:
+                return object.__getattribute__(obj, name)
+            except AttributeError:
+                raise KeyError(name) from None
+        try:
+            return object.__getattribute__(obj, "_overflow")[name]
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        """Sets the attribute name on the instance."""
+        setattr(self.__obj, name, value)
+
+    def __delitem__(self, name):
+        """Deletes the attribute name from the instance."""
+        try:
+            delattr(self.__obj, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __iter__(self):
+        """Yields the names of the attributes set on the instance."""
+        obj = self.__obj
+        for name in type(obj).slots:
+            try:
+                object.__getattribute__(obj, name)
+            except AttributeError:
+                continue
+            yield name
+        try:
+            yield from object.__getattribute__(obj, "_overflow")
+        except AttributeError:
+            pass
+
+    def __len__(self):
+        """Returns the number of attributes set on the instance."""
+        return sum(1 for name in self)
+
+    def overflow(self):
+        """Returns the overflow dict of the instance, creating it."""
+        obj = self.__obj
+        try:
+            return object.__getattribute__(obj, "_overflow")
+        except AttributeError:
+            object.__setattr__(obj, "_overflow", {})
+            return object.__getattribute__(obj, "_overflow")
+
+    def __repr__(self):
+        """Returns the repr of the equivalent dictionary."""
+        return repr(dict(self))
+
+
+_compact_classes = {}
+
+
+def restore(model, attributes):
+    """Rebuilds a compact instance of model from its attributes."""
+    obj = compact(model).__new__(compact(model))
+    view = SlotsView(obj)
+    for name, value in attributes.items():
+        if name in obj.schema:
+            object.__setattr__(obj, name, value)
+        else:
+            view.overflow()[name] = value
+    return obj
+
+
+def compact(model):
+    """Returns the compact class of a model class, building it once."""
+    compact_class = _compact_classes.get(model)
+    if compact_class is not None:
+        return compact_class
+    slots = ["id", "created_at", "updated_at"]
+    namespace = {}
+    for klass in reversed(model.__mro__[:-1]):
+        if klass is BaseModel:
+            continue
+        for name, value in vars(klass).items():
+            if name.startswith("_"):
+                continue
+            if callable(value) or isinstance(
+                    value, (property, classmethod, staticmethod)):
+                namespace[name] = value
+            elif name not in slots:
+                slots.append(name)
+    namespace.update({
+        "__slots__": tuple(slots),
+        "__module__": model.__module__,
+        "__qualname__": model.__qualname__,
+        "model": model,
+        "schema": frozenset(slots),
+        "slots": tuple(slots)
+    })
+    compact_class = _compact_classes[model] = type(
+        model.__name__, (CompactModel,), namespace)
+    return compact_class
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+'''
+This module contains the single pass count/sum/avg/min/max aggregation
+used by FileStorage.aggregate().
+'''
+OPERATIONS = ("sum", "avg", "min", "max")
+
+_shared = None
+
+
+def aggregate(objects, group_by=None, count=False, workers=0, **fields):
+    """
+    Aggregates a list of objects in one pass.
+    group_by names the grouping attribute (None for a single group, lists
+    grouping as tuples; ValueError for other unhashable values),
+    count asks for the number of objects per group and fields maps each
+    operation of OPERATIONS to the attribute it applies to. With workers
+    greater than one the pass is split across forked worker processes.
+    Returns {group: {"count": n, "avg_<attribute>": value, ...}}.
+    """
+    spec = (group_by, tuple(sorted(set(fields.values()))))
+    partials = None
+    if workers > 1 and len(objects) >= workers:
+        import multiprocessing
+        if "fork" in multiprocessing.get_all_start_methods():
+            partials = _parallel(objects, spec, workers)
+    if partials is None:
+        partials = [_accumulate(objects, spec)]
+    groups = {}
+    for partial in partials:
+        for group, stats in partial.items():
+            if group in groups:
+                _merge(groups[group], stats)
+            else:
+                groups[group] = stats
+    return {group: _finish(stats, spec, count, fields)
+            for group, stats in groups.items()}
+
+
+def _accumulate(objects, spec):
+    """
+    Returns {group: [count, [n, total, low, high] per attribute]} for a
+    list of objects.
+    """
+    group_by, names = spec
+    groups = {}
+    for obj in objects:
+        group = getattr(obj, group_by, None) if group_by else None
+        if group.__class__ is list:
+            group = tuple(group)
+        try:
+            stats = groups.get(group)
+        except TypeError:
+            raise ValueError(f"can't group by {group_by}") from None
+        if stats is None:
+            stats = groups[group] = [0] + [
+                [0, 0, None, None] for name in names]
+        stats[0] += 1
+        for position, name in enumerate(names, 1):
+            value = getattr(obj, name, None)
+            if not isinstance(value, (int, float)) or \
+                    isinstance(value, bool):
+                continue
+            field = stats[position]
+            field[0] += 1
+            field[1] += value
+            if field[2] is None or value < field[2]:
+                field[2] = value
+            if field[3] is None or value > field[3]:
+                field[3] = value
+    return groups
+
+
+def _merge(stats, other):
+    """Folds the partial stats of other into stats."""
+    stats[0] += other[0]
+    for field, extra in zip(stats[1:], other[1:]):
+        field[0] += extra[0]
+        field[1] += extra[1]
+        if extra[2] is not None and (field[2] is None or extra[2] < field[2]):
+            field[2] = extra[2]
+        if extra[3] is not None and (field[3] is None or extra[3] > field[3]):
+            field[3] = extra[3]
+
+
+def _finish(stats, spec, count, fields):
+    """Returns the requested results of one group."""
+    names = spec[1]
+    result = {}
+    if count:
+        result["count"] = stats[0]
+    for operation in OPERATIONS:
+        name = fields.get(operation)
+        if name is None:
+            continue
+        n, total, low, high = stats[names.index(name) + 1]
+        result[f"{operation}_{name}"] = {
+            "sum": total,
+            "avg": total / n if n else None,
+            "min": low,
+            "max": high
+        }[operation]
+    return result
+
+
+def _parallel(objects, spec, workers):
+    """Accumulates chunks of objects in forked worker processes."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    global _shared
+    _shared = (objects, spec)
+    size = -(-len(objects) // workers)
+    bounds = [(start, start + size) for start in range(0, len(objects), size)]
+    try:
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork")) as pool:
+            return list(pool.map(_chunk, bounds))
+    finally:
+        _shared = None
+
+
+def _chunk(bounds):
+    """Accumulates the objects of one chunk inside a worker process."""
+    objects, spec = _shared
+    return _accumulate(objects[bounds[0]:bounds[1]], spec)
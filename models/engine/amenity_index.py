@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+'''
+This module contains the AmenityIndex class, a bitset index of Place
+objects by the amenities listed in their amenity_ids.
+'''
+
+
+class AmenityIndex:
+    """
+    AmenityIndex maps every Amenity id to a dense bit position and every
+    Place to a dense slot, so "has all/any of these amenities" filters
+    are answered with bitwise operations instead of list scans.
+    ATTRIBUTES:
+        mask_of: returns the amenity bitmask of a stored Place
+        mask: returns the bitmask for a list of amenity ids
+        match_all: returns the keys of places offering every amenity
+        match_any: returns the keys of places offering any amenity
+    """
+
+    def __init__(self):
+        """Initializes an empty index."""
+        self.clear()
+
+    def clear(self):
+        """Drops every amenity bit and place slot."""
+        self.__bits = {}
+        self.__ids = []
+        self.__slots = {}
+        self.__keys = []
+        self.__free = []
+        self.__masks = {}
+        self.__places = {}
+        self.__everything = 0
+
+    def add(self, key, obj):
+        """Indexes a newly stored object."""
+        class_name = obj.__class__.__name__
+        if class_name == "Amenity":
+            self.__bit(obj.id)
+        elif class_name == "Place":
+            if self.__free:
+                slot = self.__free.pop()
+                self.__keys[slot] = key
+            else:
+                slot = len(self.__keys)
+                self.__keys.append(key)
+            self.__slots[key] = slot
+            self.__everything |= 1 << slot
+            self.__link(key, slot, obj.amenity_ids)
+
+    def rebuild(self, objects):
+        """
+        Indexes every object of a {key: obj} dictionary from scratch,
+        building each amenity bitmap once instead of a bit at a time.
+        """
+        self.clear()
+        slots = {}
+        for key, obj in objects.items():
+            class_name = obj.__class__.__name__
+            if class_name == "Amenity":
+                self.__bit(obj.id)
+            elif class_name == "Place":
+                slot = self.__slots[key] = len(self.__keys)
+                self.__keys.append(key)
+                mask = 0
+                for amenity_id in obj.amenity_ids:
+                    mask |= 1 << self.__bit(amenity_id)
+                    slots.setdefault(amenity_id, []).append(slot)
+                self.__masks[key] = mask
+        size = len(self.__keys) // 8 + 1
+        for amenity_id, places in slots.items():
+            bitmap = bytearray(size)
+            for slot in places:
+                bitmap[slot >> 3] |= 1 << (slot & 7)
+            self.__places[amenity_id] = int.from_bytes(bitmap, "little")
+        self.__everything = (1 << len(self.__keys)) - 1
+
+    def remove(self, key, obj):
+        """Forgets a deleted object."""
+        slot = self.__slots.pop(key, None)
+        if slot is None:
+            return
+        self.__unlink(key, slot)
+        self.__everything &= ~(1 << slot)
+        self.__keys[slot] = None
+        self.__free.append(slot)
+
+    def update(self, key, obj, name, old):
+        """Re-indexes a Place whose amenity_ids changed."""
+        if name != "amenity_ids" or key not in self.__slots:
+            return
+        slot = self.__slots[key]
+        self.__unlink(key, slot)
+        self.__link(key, slot, obj.amenity_ids)
+
+    def mask_of(self, key):
+        """Returns the amenity bitmask of the place stored under key."""
+        return self.__masks.get(key, 0)
+
+    def mask(self, amenity_ids):
+        """
+        Returns the bitmask of a list of amenity ids, or None when one of
+        them has never been seen (no place can offer it).
+        """
+        mask = 0
+        for amenity_id in amenity_ids:
+            bit = self.__bits.get(amenity_id)
+            if bit is None:
+                return None
+            mask |= 1 << bit
+        return mask
+
+    def match_all(self, amenity_ids):
+        """Returns the keys of the places offering every given amenity."""
+        bitmap = self.__everything
+        for amenity_id in amenity_ids:
+            bitmap &= self.__places.get(amenity_id, 0)
+            if not bitmap:
+                break
+        return self.__decode(bitmap)
+
+    def match_any(self, amenity_ids):
+        """Returns the keys of the places offering at least one amenity."""
+        bitmap = 0
+        for amenity_id in amenity_ids:
+            bitmap |= self.__places.get(amenity_id, 0)
+        return self.__decode(bitmap)
+
+    def dump(self):
+        """Returns copies of the bits, slots and bitmaps, to persist them."""
+        return (list(self.__ids), list(self.__keys), list(self.__free),
+                dict(self.__masks), dict(self.__places), self.__everything)
+
+    def restore(self, data, objects):
+        """Restores a dump() of the index."""
+        (self.__ids, self.__keys, self.__free, self.__masks, self.__places,
+         self.__everything) = data
+        self.__bits = {amenity_id: bit
+                       for bit, amenity_id in enumerate(self.__ids)}
+        self.__slots = {key: slot for slot, key in enumerate(self.__keys)
+                        if key is not None}
+
+    def __bit(self, amenity_id):
+        """Returns the bit of an amenity id, assigning the next free one."""
+        bit = self.__bits.get(amenity_id)
+        if bit is None:
+            bit = self.__bits[amenity_id] = len(self.__ids)
+            self.__ids.append(amenity_id)
+        return bit
+
+    def __link(self, key, slot, amenity_ids):
+        """Sets the place mask and its bit in every amenity bitmap."""
+        mask = 0
+        place_bit = 1 << slot
+        for amenity_id in amenity_ids:
+            mask |= 1 << self.__bit(amenity_id)
+            self.__places[amenity_id] = (
+                self.__places.get(amenity_id, 0) | place_bit)
+        self.__masks[key] = mask
+
+    def __unlink(self, key, slot):
+        """Clears the place mask and its bit in every amenity bitmap."""
+        mask = self.__masks.pop(key, 0)
+        if not mask:
+            return
+        place_bit = ~(1 << slot)
+        bits = bin(mask)[:1:-1]
+        bit = bits.find("1")
+        while bit != -1:
+            self.__places[self.__ids[bit]] &= place_bit
+            bit = bits.find("1", bit + 1)
+
+    def __decode(self, bitmap):
+        """Returns the place keys of the slots set in a bitmap."""
+        keys = self.__keys
+        bits = bin(bitmap)[:1:-1]
+        result = []
+        slot = bits.find("1")
+        while slot != -1:
+            result.append(keys[slot])
+            slot = bits.find("1", slot + 1)
+        return result
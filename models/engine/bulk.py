@@ -0,0 +1,216 @@
+#!/usr/bin/python3
+'''
+This module streams model instances in and out of storage as JSON lines
+or CSV, in batches, and is the standalone bulk loader:
+
+    python3 -m models.engine.bulk import <class name> <file> [--batch N]
+    python3 -m models.engine.bulk export <class name> <file>
+'''
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+import models
+from models import base_model
+from models.engine import schema
+
+FORMATS = ("jsonl", "csv")
+MAX_ERRORS = 100
+
+
+def file_format(path, fmt=None):
+    """Returns fmt, or the format told by the extension of path."""
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt}")
+    return fmt
+
+
+def read_rows(file, fmt="jsonl"):
+    """
+    Yields (line number, row) for every row of a JSON lines or CSV file.
+    Empty CSV cells are left out of their row; a JSON line that is not an
+    object yields its parse error instead of a row.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, {name: value for name, value in
+                                    row.items() if value and name}
+        return
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield number, error
+            continue
+        yield number, (row if isinstance(row, dict)
+                       else ValueError("not a JSON object"))
+
+
+def validate(class_name, row, record_schema):
+    """
+    Returns the to_dict() form of row for a class_name instance, with its
+    values converted by record_schema, the schema of the class. Raises
+    ValueError for a row that does not fit the class, or that sets a
+    method, property or private name.
+    """
+    record = {}
+    for name, value in row.items():
+        if name == "__class__":
+            if value != class_name:
+                raise ValueError(f"__class__ {value} is not {class_name}")
+            continue
+        if name in ("created_at", "updated_at"):
+            if value.__class__ is not str:
+                raise ValueError(f"{name} must be an ISO-8601 string")
+            datetime.fromisoformat(value)
+        elif name == "id":
+            if value.__class__ is not str or not value:
+                raise ValueError("id must be a non empty string")
+        else:
+            value = record_schema.coerce(name, value)
+        record[name] = value
+    if "id" not in record:
+        record["id"] = base_model.generate_id()
+    return record
+
+
+def import_rows(class_name, rows, batch_size=100000, progress=None):
+    """
+    Validates and stores class_name instances from (line number, row)
+    pairs, batch_size rows at a time (0 for a single batch), and saves
+    storage once, at the end: each save rewrites the whole file, so a save
+    per batch would make the load quadratic. Rows missing an id or
+    timestamps get new ones; a row with the id of a stored instance
+    replaces it. progress(report) is called after every batch.
+    Returns the report: {"imported", "rejected", "batches", "seconds",
+    "rate", "errors"}, errors being the first MAX_ERRORS (line number,
+    message) pairs of the rejected rows.
+    """
+    record_schema = schema.of(models.storage.classes()[class_name])
+    report = {"imported": 0, "rejected": 0, "batches": 0,
+              "seconds": 0.0, "rate": 0.0, "errors": []}
+    start = time.perf_counter()
+    batch = []
+    for number, row in rows:
+        try:
+            if isinstance(row, Exception):
+                raise row
+            batch.append(validate(class_name, row, record_schema))
+        except (ValueError, TypeError, AttributeError) as error:
+            report["rejected"] += 1
+            if len(report["errors"]) < MAX_ERRORS:
+                report["errors"].append((number, str(error)))
+            continue
+        if len(batch) >= batch_size > 0:
+            _flush(class_name, batch, report, start, progress)
+            batch = []
+    if batch or not report["batches"]:
+        _flush(class_name, batch, report, start, progress)
+    models.storage.save()
+    report["seconds"] = time.perf_counter() - start
+    report["rate"] = report["imported"] / (report["seconds"] or 1e-9)
+    return report
+
+
+def _flush(class_name, batch, report, start, progress):
+    """Stores a batch of records and updates report."""
+    now = datetime.now().isoformat()
+    for record in batch:
+        record.setdefault("created_at", now)
+        record.setdefault("updated_at", record["created_at"])
+    models.storage.insert(class_name, batch)
+    report["imported"] += len(batch)
+    report["batches"] += 1
+    report["seconds"] = time.perf_counter() - start
+    report["rate"] = report["imported"] / (report["seconds"] or 1e-9)
+    if progress is not None:
+        progress(report)
+
+
+def export_rows(file, class_name, fmt="jsonl"):
+    """
+    Streams the to_dict() forms of the class_name instances to file as
+    JSON lines, or as CSV with the id, the timestamps and the class
+    attributes as columns (lists as JSON). Returns the number of rows.
+    """
+    objects = models.storage.objects(class_name).values()
+    if fmt == "csv":
+        names = ["id", "created_at", "updated_at"]
+        model = models.storage.classes()[class_name]
+        names += list(schema.of(model).types)
+        writer = csv.DictWriter(file, names, extrasaction="ignore")
+        writer.writeheader()
+        for obj in objects:
+            record = obj.to_dict()
+            for name, value in record.items():
+                if isinstance(value, list):
+                    record[name] = json.dumps(value)
+            writer.writerow(record)
+        return len(objects)
+    dumps = json.dumps
+    for obj in objects:
+        file.write(dumps(obj.to_dict()) + "\n")
+    return len(objects)
+
+
+def load(path, class_name, fmt=None, batch_size=100000, progress=None):
+    """Imports the class_name rows of the file at path, see import_rows."""
+    fmt = file_format(path, fmt)
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        return import_rows(class_name, read_rows(file, fmt), batch_size,
+                           progress)
+
+
+def dump(path, class_name, fmt=None):
+    """Exports the class_name instances to the file at path."""
+    fmt = file_format(path, fmt)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        return export_rows(file, class_name, fmt)
+
+
+def summary(report):
+    """Returns the one line summary of an import report."""
+    return (f"{report['imported']} imported, {report['rejected']} "
+            f"rejected in {report['batches']} batches, "
+            f"{report['seconds']:.2f}s ({report['rate']:.0f} rows/s)")
+
+
+def main(argv=None):
+    """Runs the bulk loader command line."""
+    parser = argparse.ArgumentParser(
+        prog="python3 -m models.engine.bulk",
+        description="Streams instances in and out of storage.")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("class_name", choices=sorted(models.storage.classes()))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--batch", type=int, default=100000,
+                        help="rows per batch, 0 for a single batch")
+    parser.add_argument("--quiet", action="store_true",
+                        help="do not report every batch")
+    options = parser.parse_args(argv)
+    if options.command == "export":
+        count = dump(options.path, options.class_name, options.format)
+        print(f"{count} exported")
+        return 0
+
+    def progress(report):
+        print(summary(report), file=sys.stderr)
+
+    report = load(options.path, options.class_name, options.format,
+                  options.batch, None if options.quiet else progress)
+    for number, message in report["errors"]:
+        print(f"line {number}: {message}", file=sys.stderr)
+    print(summary(report))
+    return 1 if report["rejected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
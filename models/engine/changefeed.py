@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+'''
+This module contains the ChangeFeed class, the ordered feed of the
+mutations made to storage.
+'''
+import json
+import os
+from models.base_model import Timestamp
+
+
+class ChangeFeed:
+    """
+    ChangeFeed numbers every create, update and delete of a stored object
+    and hands the change to in-process subscribers as it happens. Once
+    opened on a path it also appends the changes as JSON lines to that
+    file on every storage save, where other processes can tail them from
+    a byte offset cursor.
+    A change is {"seq": n, "op": "create"|"update"|"delete", "key": key,
+    "fields": {name: value}}.
+    ATTRIBUTES:
+        subscribe/unsubscribe: add or remove an in-process callback
+        open: starts the on-disk stream at path
+        flush: appends the pending changes to the stream
+        read: returns the changes of a stream after a cursor
+        offset: returns a cursor close before a sequence number
+    """
+
+    def __init__(self):
+        """Initializes a feed without subscribers nor stream."""
+        self.path = None
+        self.seq = 0
+        self.__subscribers = []
+        self.__pending = []
+
+    def subscribe(self, callback):
+        """Calls callback(change) for every future change."""
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stops calling callback."""
+        self.__subscribers.remove(callback)
+
+    def open(self, path):
+        """Streams the changes to path, resuming its sequence numbers."""
+        self.flush()
+        self.path = path
+        self.seq = max(self.seq, ChangeFeed.last_seq(path))
+
+    def close(self):
+        """Flushes and stops the on-disk stream."""
+        self.flush()
+        self.path = None
+
+    def clear(self):
+        """Changes are never forgotten."""
+        pass
+
+    def rebuild(self, objects):
+        """Reloading storage is not a change of its objects."""
+        pass
+
+    def add(self, key, obj):
+        """Emits the creation of a stored object."""
+        if self.__subscribers or self.path is not None:
+            self.__emit("create", key, obj.to_dict())
+
+    def remove(self, key, obj):
+        """Emits the deletion of a stored object."""
+        if self.__subscribers or self.path is not None:
+            self.__emit("delete", key, {})
+
+    def update(self, key, obj, name, old):
+        """Emits an attribute change of a stored object."""
+        if self.__subscribers or self.path is not None:
+            value = obj.__dict__.get(name)
+            if name in ("created_at", "updated_at"):
+                value = Timestamp.isoformat(value)
+            self.__emit("update", key, {name: value})
+
+    def flush(self):
+        """Appends the pending changes to the stream file."""
+        if not self.__pending or self.path is None:
+            return
+        lines = "".join(json.dumps(change, default=str) + "\n"
+                        for change in self.__pending)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+        self.__pending.clear()
+
+    def __emit(self, op, key, fields):
+        """Numbers a change and hands it to the subscribers and stream."""
+        self.seq += 1
+        change = {"seq": self.seq, "op": op, "key": key, "fields": fields}
+        for callback in list(self.__subscribers):
+            callback(change)
+        if self.path is not None:
+            self.__pending.append(change)
+
+    @staticmethod
+    def read(path, cursor=0, since=0):
+        """
+        Returns (changes, cursor) where changes lists the complete changes
+        stored in path from the byte offset cursor and with a sequence
+        number greater than since, and cursor is the offset to resume
+        from.
+        """
+        changes = []
+        try:
+            with open(path, "rb") as file:
+                file.seek(cursor)
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    cursor += len(line)
+                    change = json.loads(line)
+                    if change["seq"] > since:
+                        changes.append(change)
+        except FileNotFoundError:
+            pass
+        return changes, cursor
+
+    @staticmethod
+    def offset(path, since, window=4096):
+        """
+        Returns a byte offset of path where read() can start to find the
+        changes with a sequence number greater than since: every change
+        before it has a smaller or equal one. Sequence numbers increase
+        through the file, so the offset is found by a binary search that
+        stops within window bytes of the first newer change.
+        """
+        low = 0
+        try:
+            with open(path, "rb") as file:
+                high = file.seek(0, os.SEEK_END)
+                while high - low > window:
+                    middle = (low + high) // 2
+                    file.seek(middle)
+                    file.readline()
+                    start = file.tell()
+                    line = file.readline()
+                    try:
+                        older = line.endswith(b"\n") and \
+                            json.loads(line)["seq"] <= since
+                    except (ValueError, KeyError, TypeError):
+                        older = False
+                    if older:
+                        low = start + len(line)
+                    else:
+                        high = middle
+        except FileNotFoundError:
+            pass
+        return low
+
+    @staticmethod
+    def last_seq(path):
+        """Returns the sequence number of the last change stored in path."""
+        try:
+            with open(path, "rb") as file:
+                size = file.seek(0, os.SEEK_END)
+                file.seek(max(0, size - 65536))
+                lines = file.read().splitlines()
+        except FileNotFoundError:
+            return 0
+        for line in reversed(lines):
+            try:
+                return json.loads(line)["seq"]
+            except (ValueError, KeyError):
+                continue
+        return 0
@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+'''
+This module contains the ColumnStore class, an optional columnar shadow
+copy of the numeric attributes of one model class.
+'''
+from array import array
+
+INT64 = range(-2 ** 63, 2 ** 63)
+EXACT_FLOAT_INTS = range(-2 ** 53, 2 ** 53 + 1)
+
+numpy = None
+_numpy_checked = False
+
+
+def _import_numpy():
+    """Imports NumPy, if installed, when the first store is created."""
+    global numpy, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+
+class ColumnStore:
+    """
+    ColumnStore keeps every int attribute of a model class in an
+    array('q') and every float attribute in an array('d'), one row per
+    stored object, so analytics run as batch operations over contiguous
+    memory instead of attribute lookups on each object. NumPy is used
+    when it is installed. Values the column can't hold exactly (strings,
+    floats in int columns, ints out of range) are stored as 0 in int
+    columns and NaN in float columns and their keys kept aside, so
+    select() returns them as candidates, order_by() last, the aggregates
+    leave them out and an index never changes the result of a query.
+    ATTRIBUTES:
+        names: the names of the numeric columns
+        column: returns the array of one column
+        sum, avg, min, max: aggregate the values one column holds
+        irregular: returns the keys whose value a column can't hold
+        select: returns the keys whose value lies in a range
+        order_by: returns the keys sorted by one column
+    """
+
+    def __init__(self, model):
+        """Initializes empty columns for the numeric attributes of model."""
+        _import_numpy()
+        self.class_name = model.__name__
+        self.__typecodes = {}
+        for name in dir(model):
+            value = getattr(model, name)
+            if name.startswith("_") or isinstance(value, bool):
+                continue
+            if isinstance(value, int):
+                self.__typecodes[name] = "q"
+            elif isinstance(value, float):
+                self.__typecodes[name] = "d"
+        self.names = tuple(self.__typecodes)
+        self.clear()
+
+    def clear(self):
+        """Drops every row."""
+        self.__rows = {}
+        self.__keys = []
+        self.__irregular = {name: set() for name in self.__typecodes}
+        self.__columns = {name: array(typecode) for name, typecode
+                          in self.__typecodes.items()}
+
+    def __len__(self):
+        """Returns the number of rows."""
+        return len(self.__keys)
+
+    def add(self, key, obj):
+        """Appends the row of a newly stored object of the class."""
+        if obj.__class__.__name__ != self.class_name:
+            return
+        self.__rows[key] = len(self.__keys)
+        self.__keys.append(key)
+        for name, column in self.__columns.items():
+            value = self.__number(column, getattr(obj, name))
+            if value is None:
+                self.__irregular[name].add(key)
+                value = self.__missing(column)
+            column.append(value)
+
+    def remove(self, key, obj):
+        """Drops the row of a deleted object, filling it with the last."""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        for keys in self.__irregular.values():
+            keys.discard(key)
+        last_key = self.__keys.pop()
+        for column in self.__columns.values():
+            value = column.pop()
+            if row < len(column):
+                column[row] = value
+        if row < len(self.__keys):
+            self.__keys[row] = last_key
+            self.__rows[last_key] = row
+
+    def update(self, key, obj, name, old):
+        """Writes a changed numeric attribute to its column."""
+        column = self.__columns.get(name)
+        row = self.__rows.get(key)
+        if column is not None and row is not None:
+            value = self.__number(column, getattr(obj, name))
+            if value is None:
+                self.__irregular[name].add(key)
+                value = self.__missing(column)
+            else:
+                self.__irregular[name].discard(key)
+            column[row] = value
+
+    def column(self, name):
+        """Returns the array holding the column name."""
+        return self.__columns[name]
+
+    def sum(self, name):
+        """Returns the sum of the values column name holds."""
+        values = self.__values(name)
+        if numpy is None:
+            return sum(values)
+        if values.dtype.kind == "i" and len(values) and \
+                max(-int(values.min()), int(values.max())) * len(values) \
+                not in INT64:
+            return sum(values.tolist())
+        return values.sum().item()
+
+    def avg(self, name):
+        """Returns the mean of the values column name holds, or None."""
+        count = len(self.__keys) - len(self.__irregular[name])
+        return self.sum(name) / count if count else None
+
+    def min(self, name):
+        """Returns the smallest value column name holds, or None."""
+        values = self.__values(name)
+        if not len(values):
+            return None
+        if numpy is not None:
+            return values.min().item()
+        return min(values)
+
+    def max(self, name):
+        """Returns the largest value column name holds, or None."""
+        values = self.__values(name)
+        if not len(values):
+            return None
+        if numpy is not None:
+            return values.max().item()
+        return max(values)
+
+    def irregular(self, name):
+        """Returns the keys whose value column name can't hold."""
+        return frozenset(self.__irregular[name])
+
+    def select(self, name, low=None, high=None):
+        """
+        Returns the keys whose value in column name is in [low, high],
+        followed by those whose value the column can't hold, which the
+        caller must check itself.
+        """
+        irregular = self.__irregular[name]
+        keys = [key for key in self.__range(name, low, high)
+                if key not in irregular]
+        keys.extend(irregular)
+        return keys
+
+    def __range(self, name, low, high):
+        """Returns the keys whose stored value is in [low, high]."""
+        column = self.__columns[name]
+        keys = self.__keys
+        if numpy is not None:
+            view = self.__view(column)
+            mask = numpy.ones(len(view), dtype=bool)
+            if low is not None:
+                mask &= view >= low
+            if high is not None:
+                mask &= view <= high
+            return [keys[row] for row in numpy.flatnonzero(mask).tolist()]
+        if low is None and high is None:
+            return list(keys)
+        if low is None:
+            return [keys[row] for row, value in enumerate(column)
+                    if value <= high]
+        if high is None:
+            return [keys[row] for row, value in enumerate(column)
+                    if value >= low]
+        return [keys[row] for row, value in enumerate(column)
+                if low <= value <= high]
+
+    def order_by(self, name, reverse=False):
+        """
+        Returns the keys sorted by the value of column name, ties in row
+        order, followed by those whose value the column can't hold.
+        """
+        column = self.__columns[name]
+        keys = self.__keys
+        if numpy is not None:
+            view = self.__view(column)
+            if reverse:
+                rows = numpy.argsort(view[::-1], kind="stable")
+                rows = (len(view) - 1 - rows)[::-1]
+            else:
+                rows = numpy.argsort(view, kind="stable")
+            rows = rows.tolist()
+        else:
+            rows = sorted(range(len(column)), key=column.__getitem__,
+                          reverse=reverse)
+        irregular = self.__irregular[name]
+        ordered = [keys[row] for row in rows if keys[row] not in irregular]
+        ordered.extend(irregular)
+        return ordered
+
+    def __values(self, name):
+        """
+        Returns the values of column name but those the column can't
+        hold, as a NumPy array when NumPy is installed.
+        """
+        column = self.__columns[name]
+        irregular = self.__irregular[name]
+        if numpy is not None:
+            view = self.__view(column)
+            if irregular:
+                view = numpy.delete(view, [self.__rows[key]
+                                           for key in irregular])
+            return view
+        if irregular:
+            rows = {self.__rows[key] for key in irregular}
+            return [value for row, value in enumerate(column)
+                    if row not in rows]
+        return column
+
+    @staticmethod
+    def __view(column):
+        """Returns a NumPy array sharing the memory of column."""
+        return numpy.frombuffer(
+            column, dtype="int64" if column.typecode == "q" else "float64")
+
+    @staticmethod
+    def __number(column, value):
+        """
+        Returns value as the type of column, None when the column can't
+        hold it exactly: an int out of the int64 range in an int column,
+        or anything but an int or a float there as well.
+        """
+        if value.__class__ is int:
+            if column.typecode == "q":
+                return value if value in INT64 else None
+            return float(value) if value in EXACT_FLOAT_INTS else None
+        if value.__class__ is float and column.typecode == "d":
+            return value
+        return None
+
+    @staticmethod
+    def __missing(column):
+        """Returns the value standing for a missing one in column."""
+        return 0 if column.typecode == "q" else float("nan")
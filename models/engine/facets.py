@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+'''
+This module contains the FacetRegistry class, which keeps live counts of
+places per city, state, amenity and price bucket.
+'''
+
+
+class FacetRegistry:
+    """
+    FacetRegistry maintains the search page facet counters incrementally:
+    every storage change adjusts a constant number of counters, so reading
+    the counts never scans storage.
+    ATTRIBUTES:
+        counts: returns the non-zero counters of one facet
+        facets: returns the counters of every facet
+        bucket: returns the price bucket of a price_by_night value
+    """
+    names = ("city", "state", "amenity", "price")
+
+    def __init__(self, price_step=50):
+        """Initializes empty counters with price buckets of price_step."""
+        self.price_step = price_step
+        self.clear()
+
+    def clear(self):
+        """Resets every counter."""
+        self.__counts = {name: {} for name in FacetRegistry.names}
+        self.__city_state = {}
+
+    def add(self, key, obj):
+        """Counts a newly stored object."""
+        class_name = obj.__class__.__name__
+        if class_name == "Place":
+            self.__count_place(obj.city_id, obj.amenity_ids,
+                               obj.price_by_night, 1)
+        elif class_name == "City":
+            self.__city_state[obj.id] = obj.state_id
+            self.__bump("state", obj.state_id,
+                        self.__counts["city"].get(obj.id, 0))
+
+    def remove(self, key, obj):
+        """Uncounts a deleted object."""
+        class_name = obj.__class__.__name__
+        if class_name == "Place":
+            self.__count_place(obj.city_id, obj.amenity_ids,
+                               obj.price_by_night, -1)
+        elif class_name == "City":
+            state_id = self.__city_state.pop(obj.id, None)
+            self.__bump("state", state_id,
+                        -self.__counts["city"].get(obj.id, 0))
+
+    def update(self, key, obj, name, old):
+        """Moves the counts of an object whose faceted attribute changed."""
+        class_name = obj.__class__.__name__
+        if class_name == "Place":
+            if name == "city_id":
+                self.__count_place(old, (), None, -1)
+                self.__count_place(obj.city_id, (), None, 1)
+            elif name == "amenity_ids":
+                self.__count_place(None, old or (), None, -1)
+                self.__count_place(None, obj.amenity_ids, None, 1)
+            elif name == "price_by_night":
+                self.__count_place(None, (), old, -1)
+                self.__count_place(None, (), obj.price_by_night, 1)
+        elif class_name == "City" and name == "state_id":
+            places = self.__counts["city"].get(obj.id, 0)
+            self.__bump("state", self.__city_state.get(obj.id), -places)
+            self.__city_state[obj.id] = obj.state_id
+            self.__bump("state", obj.state_id, places)
+
+    def counts(self, name):
+        """Returns a copy of the non-zero counters of the facet name."""
+        return dict(self.__counts[name])
+
+    def facets(self):
+        """Returns a copy of the counters of every facet."""
+        return {name: dict(counts) for name, counts in self.__counts.items()}
+
+    def dump(self):
+        """Returns copies of the counters, to persist them."""
+        return self.price_step, self.facets(), dict(self.__city_state)
+
+    def restore(self, data, objects):
+        """Restores a dump() of counters made with the same price step."""
+        price_step, counts, city_state = data
+        if price_step != self.price_step:
+            raise ValueError("the price buckets changed")
+        self.__counts, self.__city_state = counts, city_state
+
+    def bucket(self, price):
+        """Returns the lower bound of the price bucket holding price."""
+        try:
+            return int(price) // self.price_step * self.price_step
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    def __count_place(self, city_id, amenity_ids, price, delta):
+        """
+        Adds delta to the counters of a place's faceted values, counting
+        an amenity listed twice once.
+        """
+        if city_id is not None:
+            self.__bump("city", city_id, delta)
+            self.__bump("state", self.__city_state.get(city_id), delta)
+        for amenity_id in set(amenity_ids):
+            self.__bump("amenity", amenity_id, delta)
+        if price is not None:
+            self.__bump("price", self.bucket(price), delta)
+
+    def __bump(self, name, value, delta):
+        """Adds delta to one counter, dropping it when it reaches zero."""
+        if value is None or value == "" or not delta:
+            return
+        counts = self.__counts[name]
+        total = counts.get(value, 0) + delta
+        if total:
+            counts[value] = total
+        else:
+            del counts[value]
@@ -3,7 +3,11 @@
 This module contains the FileStorage class, which serializes instances
 to a JSON file and deserializes JSON file to instances.
 '''
+import atexit
+import itertools
 import json
+import sys
+from datetime import datetime
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -11,6 +15,23 @@ from models.city import City
 from models.amenity import Amenity
 from models.place import Place
 from models.review import Review
+from models.compact import compact
+from models.engine.amenity_index import AmenityIndex
+from models.engine.facets import FacetRegistry
+from models.engine.indexes import ClassPartition, ForeignKeyIndex
+from models.engine.indexes import CreationIndex, UpdateIndex
+from models.engine.aggregate import OPERATIONS, aggregate
+from models.engine.columns import ColumnStore
+from models.engine.changefeed import ChangeFeed
+from models.engine.result_cache import ResultCache
+from models.engine.forms import FormCache
+from models.engine import metrics, schema, side_file
+
+
+def _timed(operation):
+    """Returns a decorator timing a storage operation in the metrics."""
+    return metrics.timed("storage_operation_seconds",
+                         ("operation", operation))
 
 
 class FileStorage:
@@ -25,6 +46,27 @@ class FileStorage:
         "Place": Place,
         "Review": Review
     }
+    __compact = False
+    __deferred = False
+    __dirty = False
+    __index_threshold = 10000
+    __index_writer = None
+    __warm_threshold = 10000
+    __generation = 0
+    __saved = None
+    __snapshot_of = None
+    __listed = None
+    __indexes = {
+        "classes": ClassPartition(),
+        "foreign_keys": ForeignKeyIndex(),
+        "created": CreationIndex(),
+        "updated": UpdateIndex(),
+        "amenities": AmenityIndex(),
+        "facets": FacetRegistry(),
+        "results": ResultCache(),
+        "forms": FormCache(__objects),
+        "changes": ChangeFeed()
+    }
 
     def all(self):
         """Returns the dictionary __objects."""
@@ -33,25 +75,588 @@ class FileStorage:
     def new(self, obj):
         """Sets in __objects the obj with key <obj class name>.id."""
         key = f"{obj.__class__.__name__}.{obj.id}"
+        old = FileStorage.__objects.get(key)
+        if old is obj:
+            return
+        if old is not None:
+            for index in FileStorage.__indexes.values():
+                index.remove(key, old)
         FileStorage.__objects[key] = obj
+        FileStorage.__generation += 1
+        for index in FileStorage.__indexes.values():
+            index.add(key, obj)
+
+    def delete(self, obj):
+        """Removes obj from __objects if it is stored."""
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        del FileStorage.__objects[key]
+        FileStorage.__generation += 1
+        for index in FileStorage.__indexes.values():
+            index.remove(key, obj)
+
+    def changed(self, obj, name, old):
+        """
+        Lets the indexes follow an attribute change on a stored obj, under
+        the key it is stored with, the one of its old id if name is id.
+        """
+        model_id = old if name == "id" else getattr(obj, "id", None)
+        key = f"{obj.__class__.__name__}.{model_id}"
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        FileStorage.__generation += 1
+        for index in FileStorage.__indexes.values():
+            index.update(key, obj, name, old)
+
+    @_timed("insert")
+    def insert(self, class_name, records):
+        """
+        Builds class_name objects from a list of to_dict() forms, with
+        ISO-8601 string timestamps, stores them and returns them.
+        """
+        objects = self.__model(class_name).from_records(records)
+        for obj in objects:
+            self.new(obj)
+        return objects
+
+    @_timed("update_where")
+    def update_where(self, class_name, where, changes):
+        """
+        Sets the attributes of changes, and a common updated_at, on the
+        class_name objects matching where, a query.Query, and returns how
+        many there were. Like insert(), it leaves saving to the caller,
+        so the whole update is written once.
+        """
+        targets = [obj for key, obj in self.scan(class_name, where=where)]
+        now = datetime.now()
+        for obj in targets:
+            for name, value in changes.items():
+                setattr(obj, name, value)
+            obj.updated_at = now
+        return len(targets)
+
+    @_timed("delete_where")
+    def delete_where(self, class_name, where):
+        """
+        Deletes the class_name objects matching where, a query.Query, and
+        returns how many there were, leaving saving to the caller.
+        """
+        targets = [obj for key, obj in self.scan(class_name, where=where)]
+        for obj in targets:
+            self.delete(obj)
+        return len(targets)
+
+    def classes(self):
+        """Returns the model classes by name."""
+        return FileStorage.__classes
+
+    def objects(self, class_name):
+        """Returns the {key: obj} dictionary of the objects of a class."""
+        return FileStorage.__indexes["classes"].objects(class_name)
+
+    def scan(self, class_name=None, after=None, offset=0, limit=None,
+             where=None, order=None):
+        """
+        Returns an iterator over the (key, obj) pairs of every object, or
+        of the class_name objects, in storage order, without copying them:
+        those after the key after (a cursor), skipping offset of them and
+        stopping after limit. where, a query.Query over class_name, keeps
+        the matching objects only, read from the index its plan picks.
+        order lists them by an attribute instead, see select(). Raises
+        KeyError when after is not in the listing.
+        """
+        predicate = None
+        if order is not None:
+            objects = self.select(class_name, where, order)
+        elif where is not None:
+            objects, predicate = where.plan(self)
+        elif class_name is None:
+            objects = FileStorage.__objects
+        else:
+            objects = self.objects(class_name)
+        stop = None if limit is None else offset + limit
+        if after is not None:
+            query_key = (class_name, None if where is None else where.key,
+                         order)
+            keys, positions = self.__listing(query_key, objects, predicate)
+            try:
+                start = positions[after] + 1
+            except KeyError:
+                raise KeyError(after) from None
+            stored = FileStorage.__objects
+            return ((key, stored[key]) for key in keys[
+                start + offset:None if stop is None else start + stop])
+        if predicate is None:
+            stored = objects if order is None else FileStorage.__objects
+            return ((key, stored[key]) for key in itertools.islice(
+                objects, offset, stop))
+        matching = itertools.compress(objects.items(),
+                                      map(predicate, objects.values()))
+        return itertools.islice(matching, offset, stop)
+
+    def __listing(self, query_key, objects, predicate):
+        """
+        Returns (keys, positions): the tuple of the keys of a listing, the
+        candidates objects kept by predicate, and the position of each key.
+        The last one is memoized until storage changes, so each page of a
+        listing walked with cursors costs its own size, not its position.
+        """
+        token = (query_key, FileStorage.__generation)
+        memo = FileStorage.__listed
+        if memo is None or memo[0] != token:
+            if predicate is None:
+                keys = tuple(objects)
+            else:
+                keys = tuple(key for key, obj in objects.items()
+                             if predicate(obj))
+            memo = FileStorage.__listed = (
+                token, keys, {key: position
+                              for position, key in enumerate(keys)})
+        return memo[1], memo[2]
+
+    @_timed("count")
+    def count(self, class_name, where=None):
+        """
+        Returns the number of class_name objects, or of those matching
+        where, a query.Query, counting an exact index bucket without
+        visiting it. Counts that visit objects are cached.
+        """
+        if where is None:
+            return len(self.objects(class_name))
+        objects, predicate = where.plan(self)
+        if predicate is None:
+            return len(objects)
+        cache = FileStorage.__indexes["results"]
+        query_key = ("count", class_name, where.key)
+        count = cache.get(query_key)
+        if count is None:
+            count = cache.put(query_key, sum(map(predicate, objects.values())),
+                              class_name, where.names)
+        return count
+
+    @_timed("select")
+    def select(self, class_name, where=None, order=None):
+        """
+        Returns the tuple of the keys of the class_name objects, or of
+        those matching where, a query.Query, in storage order or ordered
+        by the attribute order ("-<name>" for descending, objects without
+        it last). The result is cached until an object of the class is
+        stored or deleted or an attribute it reads changes. Raises
+        ValueError when the order values can't be compared.
+        """
+        cache = FileStorage.__indexes["results"]
+        query_key = ("select", class_name,
+                     None if where is None else where.key, order)
+        keys = cache.get(query_key)
+        if keys is not None:
+            return keys
+        names = set() if where is None else set(where.names)
+        items = self.scan(class_name, where=where)
+        if order is not None:
+            name, reverse = order.lstrip("-"), order.startswith("-")
+            names.add(name)
+            missing = (-1, 0) if reverse else (1, 0)
+
+            def sort_key(item):
+                value = getattr(item[1], name, None)
+                return missing if value is None else (0, value)
+
+            try:
+                items = sorted(items, key=sort_key, reverse=reverse)
+            except TypeError:
+                raise ValueError(f"can't order by {name}") from None
+        return cache.put(query_key, tuple(key for key, obj in items),
+                         class_name, frozenset(names))
+
+    def lookup(self, class_name, name, value):
+        """Returns the {key: obj} dictionary of class_name.name == value."""
+        return FileStorage.__indexes["foreign_keys"].lookup(
+            class_name, name, value)
+
+    def created_between(self, class_name, start=None, end=None):
+        """
+        Returns the {key: obj} dictionary of the class_name objects
+        created from the datetime start to end, oldest first.
+        """
+        keys = FileStorage.__indexes["created"].between(
+            class_name, start, end)
+        return {key: FileStorage.__objects[key] for key in keys}
+
+    def recent(self, class_name, count):
+        """Returns the {key: obj} dictionary of the newest objects."""
+        keys = FileStorage.__indexes["created"].recent(class_name, count)
+        return {key: FileStorage.__objects[key] for key in keys}
+
+    def changed_since(self, since):
+        """
+        Returns the {key: obj} dictionary of the objects whose updated_at
+        is after the datetime since, least recently updated first.
+        """
+        keys = FileStorage.__indexes["updated"].since(since)
+        return {key: FileStorage.__objects[key] for key in keys}
+
+    def export_changes(self, file, since):
+        """
+        Writes to file, as JSON lines of to_dict() forms, the objects
+        updated after since: a datetime, or a sequence number of the
+        change feed, whose stream must be open and is read from close to
+        that number. Objects deleted after a sequence number are written
+        as {"__class__", "id", "__deleted__"}. Returns the number of lines
+        written.
+        """
+        if isinstance(since, int):
+            feed = FileStorage.__indexes["changes"]
+            if feed.path is None:
+                raise ValueError("the change feed stream is not open, "
+                                 "start with --changes <file>")
+            feed.flush()
+            changes, cursor = ChangeFeed.read(
+                feed.path, ChangeFeed.offset(feed.path, since), since)
+            keys = dict.fromkeys(change["key"] for change in changes)
+        else:
+            keys = FileStorage.__indexes["updated"].since(since)
+        count = 0
+        for key in keys:
+            obj = FileStorage.__objects.get(key)
+            if obj is not None:
+                record = obj.to_dict()
+            else:
+                class_name, dot, model_id = key.partition(".")
+                record = {"__class__": class_name, "id": model_id,
+                          "__deleted__": True}
+            file.write(json.dumps(record) + "\n")
+            count += 1
+        return count
+
+    def aggregate(self, class_name, group_by=None, count=False,
+                  where=None, workers=0, **fields):
+        """
+        Aggregates the objects of class_name in one pass, e.g.
+        aggregate("Place", group_by="city_id", avg="price_by_night").
+        where maps attribute names to required values; a foreign key
+        among them narrows the pass to its index bucket. Without where or
+        group_by, the column store of the class, when enabled, computes
+        the fields that hold only values its columns can hold.
+        """
+        store = self.columns(class_name)
+        if store is not None and not where and group_by is None and \
+                all(name in store.names and not store.irregular(name)
+                    for name in fields.values()):
+            if not len(store):
+                return {}
+            stats = {"count": len(store)} if count else {}
+            for operation in OPERATIONS:
+                name = fields.get(operation)
+                if name is not None:
+                    stats[f"{operation}_{name}"] = \
+                        getattr(store, operation)(name)
+            return {None: stats}
+        where = dict(where or {})
+        candidates = None
+        for name, value in where.items():
+            if FileStorage.__indexes["foreign_keys"].indexed(
+                    class_name, name):
+                candidates = self.lookup(class_name, name, value)
+                del where[name]
+                break
+        if candidates is None:
+            candidates = self.objects(class_name)
+        objects = [obj for obj in candidates.values()
+                   if all(getattr(obj, name, None) == value
+                          for name, value in where.items())]
+        return aggregate(objects, group_by, count, workers, **fields)
+
+    def index(self, name):
+        """Returns the storage index registered under name."""
+        return FileStorage.__indexes[name]
+
+    def register(self, name, index):
+        """
+        Registers an index under name and fills it with every object. The
+        change feed stays last, so its subscribers see every other index
+        and cache up to date.
+        """
+        indexes = FileStorage.__indexes
+        indexes[name] = index
+        indexes["changes"] = indexes.pop("changes")
+        self.__fill(index)
+        return index
+
+    def enable_columns(self, class_name):
+        """Returns the ColumnStore of class_name, creating it if needed."""
+        name = f"columns.{class_name}"
+        store = FileStorage.__indexes.get(name)
+        if store is None:
+            model = FileStorage.__classes[class_name]
+            store = self.register(name, ColumnStore(model))
+        return store
+
+    def columns(self, class_name):
+        """Returns the ColumnStore of class_name, None if not enabled."""
+        return FileStorage.__indexes.get(f"columns.{class_name}")
+
+    def changes(self):
+        """Returns the ChangeFeed of the storage mutations."""
+        return FileStorage.__indexes["changes"]
+
+    def forms(self):
+        """Returns the FormCache of the serialized forms of objects."""
+        return FileStorage.__indexes["forms"]
+
+    def results(self):
+        """Returns the ResultCache of the query results."""
+        return FileStorage.__indexes["results"]
+
+    def gauges(self):
+        """
+        Returns the (name, label, value) gauges of storage for the metrics
+        export: the objects of each class and the cached forms and results.
+        """
+        gauges = [("storage_objects", ("class", name),
+                   len(self.objects(name)))
+                  for name in sorted(FileStorage.__classes)]
+        gauges.append(("form_cache_objects", None,
+                       FileStorage.__indexes["forms"].size()))
+        gauges.extend((f"result_cache_{name}", None, value) for name, value
+                      in FileStorage.__indexes["results"].stats().items())
+        return gauges
+
+    def facets(self):
+        """Returns the live place counts of every search facet."""
+        return FileStorage.__indexes["facets"].facets()
+
+    def use_compact(self, enabled=True):
+        """
+        Switches storage to compact (__slots__ based) instances when
+        enabled, or back to regular ones, converting the stored objects.
+        """
+        FileStorage.__compact = enabled
+        for key, obj in FileStorage.__objects.items():
+            model = self.__model(obj.__class__.__name__)
+            if type(obj) is not model:
+                FileStorage.__objects[key] = model(**obj.to_dict())
+        FileStorage.__listed = None
+        self.__rebuild()
+
+    def defer(self, enabled=True):
+        """
+        Defers saving when enabled: save() only marks storage as changed
+        until commit(). Disabling it commits the pending changes.
+        """
+        FileStorage.__deferred = enabled
+        if not enabled:
+            self.commit()
+
+    def commit(self):
+        """Saves storage if a deferred save is pending, tells if it did."""
+        if not FileStorage.__dirty:
+            return False
+        self.__write()
+        return True
 
     def save(self):
-        """Serializes __objects to the JSON file."""
-        obj_dict = {
-            key: obj.to_dict() for key, obj in FileStorage.__objects.items()
-        }
-        with open(FileStorage.__file_path, "w", encoding="utf-8") as file:
-            json.dump(obj_dict, file)
+        """Serializes __objects to the JSON file, unless deferred."""
+        if FileStorage.__deferred:
+            FileStorage.__dirty = True
+            return
+        self.__write()
+
+    @_timed("save")
+    def __write(self):
+        """
+        Serializes __objects to the JSON file, joining the memoized JSON
+        text of each object, so unchanged objects are not formatted again.
+        """
+        FileStorage.__dirty = False
+        data = FileStorage.__indexes["forms"].document().encode("utf-8")
+        with open(FileStorage.__file_path, "wb") as file:
+            file.write(data)
+        metrics.registry.count("storage_bytes_written_total", len(data))
+        FileStorage.__indexes["changes"].flush()
+        data_fingerprint = side_file.fingerprint(data)
+        FileStorage.__saved = (FileStorage.__generation, data_fingerprint)
+        self.__persist(data_fingerprint)
 
+    @_timed("reload")
     def reload(self):
-        """Deserializes the JSON file to __objects, if it exists."""
+        """
+        Deserializes the JSON file to __objects, if it exists, from its
+        warm start snapshot when it has a valid one, and loads the indexes
+        from their side file when it matches the JSON file. Values parsed
+        from JSON are converted to the type of their class attribute when
+        they can be (a max_guest saved as "4" is read back as 4) and
+        dropped otherwise, so the class attribute stands for them. A
+        record that can't be loaded is skipped; both are reported on
+        stderr.
+        """
+        data_fingerprint = count = None
+        FileStorage.__listed = None
         try:
-            with open(self.__file_path, "r", encoding="utf-8") as file:
-                obj_dict = json.load(file)
+            with open(self.__file_path, "rb") as file:
+                data = file.read()
+            metrics.registry.count("storage_bytes_read_total", len(data))
+            data_fingerprint = side_file.fingerprint(data)
+            objects = self.__warm_objects(data_fingerprint)
+            if objects is not None:
+                count = len(objects)
+                self.__objects.update(objects)
+            else:
+                obj_dict = json.loads(data)
+                count = len(obj_dict)
+                schemas = {name: schema.of(model)
+                           for name, model in self.__classes.items()}
                 for key, obj_data in obj_dict.items():
-                    class_name = obj_data["__class__"]
-                    if class_name in self.__classes:
-                        self.__objects[key] = (
-                            self.__classes[class_name](**obj_data))
+                    try:
+                        class_name = obj_data["__class__"]
+                        if class_name in self.__classes:
+                            self.__coerce(key, schemas[class_name],
+                                          obj_data)
+                            self.__objects[key] = self.__model(
+                                class_name).from_record(obj_data)
+                    except Exception as error:
+                        print(f"** skipped {key}: {error!r} **",
+                              file=sys.stderr)
         except Exception:
-            pass
+            data_fingerprint = None
+        if data_fingerprint is not None and \
+                count == len(FileStorage.__objects):
+            FileStorage.__saved = (FileStorage.__generation,
+                                   data_fingerprint)
+        self.__load_indexes(data_fingerprint, count)
+
+    @staticmethod
+    def __coerce(key, record_schema, record):
+        """
+        Converts the typed values of the record stored under key, dropping
+        and reporting on stderr those that can't be converted.
+        """
+        try:
+            record_schema.coerce_record(record)
+        except ValueError as error:
+            print(f"** repaired {key}: {error} **", file=sys.stderr)
+            record_schema.coerce_record(record, strict=False)
+
+    def warm_start(self, min_objects=10000):
+        """
+        Keeps a warm start snapshot, the pickled objects of the JSON file,
+        next to it when it holds at least min_objects objects, never when
+        None. It is written at exit, or by snapshot(), and reload() uses
+        it instead of parsing the JSON file as long as the file does not
+        change.
+        """
+        FileStorage.__warm_threshold = min_objects
+
+    def snapshot(self):
+        """
+        Writes the warm start snapshot when the stored objects are those
+        of the JSON file and its snapshot is missing or stale. Tells
+        whether it wrote one.
+        """
+        threshold = FileStorage.__warm_threshold
+        saved = FileStorage.__saved
+        if threshold is None or len(FileStorage.__objects) < threshold or \
+                saved is None or saved[0] != FileStorage.__generation or \
+                saved[1] == FileStorage.__snapshot_of:
+            return False
+        side_file.write(f"{FileStorage.__file_path}.snapshot", saved[1],
+                        {"compact": FileStorage.__compact,
+                         "objects": FileStorage.__objects})
+        FileStorage.__snapshot_of = saved[1]
+        return True
+
+    def __warm_objects(self, data_fingerprint):
+        """
+        Returns the {key: obj} dictionary of the warm start snapshot of
+        the data file generation data_fingerprint, None if it has none.
+        """
+        if FileStorage.__warm_threshold is None:
+            return None
+        snapshot = side_file.read(f"{FileStorage.__file_path}.snapshot",
+                                  data_fingerprint)
+        if snapshot is None or snapshot["compact"] != FileStorage.__compact:
+            return None
+        FileStorage.__snapshot_of = data_fingerprint
+        return snapshot["objects"]
+
+    def persist_indexes(self, min_objects=10000):
+        """
+        Keeps the indexes in a side file next to the JSON file when
+        storage holds at least min_objects objects, never when None:
+        below that, rebuilding them is cheaper than reading them.
+        """
+        FileStorage.__index_threshold = min_objects
+
+    def sync(self):
+        """Waits for the index side file being written, if any."""
+        if FileStorage.__index_writer is not None:
+            FileStorage.__index_writer.join()
+            FileStorage.__index_writer = None
+
+    def __persisted(self, count):
+        """Tells whether the indexes of count objects are persisted."""
+        threshold = FileStorage.__index_threshold
+        return threshold is not None and count >= threshold
+
+    def __persist(self, data_fingerprint):
+        """
+        Snapshots the indexes that can dump() themselves and writes them
+        to the side file of the data file generation data_fingerprint in
+        the background.
+        """
+        if not self.__persisted(len(FileStorage.__objects)):
+            return
+        snapshots = {name: index.dump()
+                     for name, index in FileStorage.__indexes.items()
+                     if hasattr(index, "dump")}
+        self.sync()
+        FileStorage.__index_writer = side_file.write_async(
+            f"{FileStorage.__file_path}.indexes", data_fingerprint,
+            {"count": len(FileStorage.__objects), "indexes": snapshots})
+
+    def __load_indexes(self, data_fingerprint, count):
+        """
+        Restores the indexes from the side file of the data file
+        generation data_fingerprint, holding count objects, when it is
+        valid and storage holds nothing else; rebuilds the others and
+        persists them again in the background when the file was stale.
+        """
+        snapshot = None
+        if data_fingerprint is not None and self.__persisted(count) and \
+                count == len(FileStorage.__objects):
+            snapshot = side_file.read(
+                f"{FileStorage.__file_path}.indexes", data_fingerprint)
+        if snapshot is None or snapshot["count"] != count:
+            self.__rebuild()
+            if data_fingerprint is not None:
+                self.__persist(data_fingerprint)
+            return
+        for name, index in FileStorage.__indexes.items():
+            try:
+                index.restore(snapshot["indexes"][name],
+                              FileStorage.__objects)
+            except (AttributeError, KeyError, ValueError, TypeError):
+                self.__fill(index)
+
+    def __model(self, class_name):
+        """Returns the class instantiated for class_name objects."""
+        model = FileStorage.__classes[class_name]
+        return compact(model) if FileStorage.__compact else model
+
+    def __rebuild(self):
+        """Rebuilds every index from the objects currently stored."""
+        for index in FileStorage.__indexes.values():
+            self.__fill(index)
+
+    def __fill(self, index):
+        """Rebuilds index from the objects currently stored."""
+        rebuild = getattr(index, "rebuild", None)
+        if rebuild is not None:
+            rebuild(FileStorage.__objects)
+            return
+        index.clear()
+        for key, obj in FileStorage.__objects.items():
+            index.add(key, obj)
+
+
+atexit.register(lambda: FileStorage().snapshot())
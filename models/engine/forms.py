@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+'''
+This module contains the FormCache class, which keeps the to_dict(), JSON
+and str() forms of stored objects until they change.
+'''
+import json
+
+
+class FormCache:
+    """
+    FormCache is a storage index memoizing the serialized forms of stored
+    objects: their to_dict() record, its JSON text and their str(). Each
+    form is built on first use and kept, with the object it was built
+    from, until the object changes (any attribute assignment, save()
+    included) or leaves storage, so saving or listing unchanged objects
+    formats nothing. Objects that are not stored are formatted every
+    time, as nothing would tell their changes.
+    ATTRIBUTES:
+        record: returns the to_dict() form of an object, to read only
+        json: returns the JSON text of the to_dict() form of an object
+        text: returns the str() form of an object
+        document: returns the JSON text of every stored object
+        size: returns the number of objects with a memoized form
+    """
+
+    def __init__(self, objects=None):
+        """Initializes an empty cache over the {key: obj} objects stored."""
+        self.__objects = {} if objects is None else objects
+        self.clear()
+
+    def clear(self):
+        """Drops every memoized form."""
+        self.__records = {}
+        self.__json = {}
+        self.__texts = {}
+        self.__documents = 0
+
+    def rebuild(self, objects):
+        """Drops every form and follows the stored objects of storage."""
+        self.__objects = objects
+        self.clear()
+
+    def add(self, key, obj):
+        """Drops the forms of an object stored under key before."""
+        self.__drop(key)
+
+    def remove(self, key, obj):
+        """Drops the forms of a deleted object."""
+        self.__drop(key)
+
+    def update(self, key, obj, name, old):
+        """Drops the forms of a changed object."""
+        self.__drop(key)
+
+    def size(self):
+        """Returns the number of objects with a memoized form."""
+        return len(self.__records.keys() | self.__json.keys() |
+                   self.__texts.keys())
+
+    def record(self, obj, key=None):
+        """Returns the to_dict() form of obj, not to be changed."""
+        key = self.__key(obj, key)
+        entry = self.__records.get(key)
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+        record = obj._record()
+        if self.__objects.get(key) is obj:
+            self.__records[key] = (obj, record)
+        return record
+
+    def json(self, obj, key=None):
+        """Returns the JSON text of the to_dict() form of obj."""
+        key = self.__key(obj, key)
+        entry = self.__json.get(key)
+        if entry is None or entry[0] is not obj:
+            if self.__objects.get(key) is not obj:
+                return json.dumps(obj._record())
+            entry = self.__json[key] = self.__member(key, obj)
+        return entry[1][entry[2]:]
+
+    def text(self, obj, key=None):
+        """Returns the str() form of obj."""
+        key = self.__key(obj, key)
+        entry = self.__texts.get(key)
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+        text = obj._text()
+        if self.__objects.get(key) is obj:
+            self.__texts[key] = (obj, text)
+        return text
+
+    def document(self):
+        """
+        Returns the JSON text of the {key: to_dict() form} dictionary of
+        every stored object, as json.dumps() writes it, joining their
+        memoized "<key>": <JSON> members. The first document after a
+        clear() is dumped in one pass and memoizes nothing: a process
+        that saves once would only pay for the memo.
+        """
+        self.__documents += 1
+        if self.__documents == 1:
+            return json.dumps({key: obj._record()
+                               for key, obj in self.__objects.items()})
+        members = self.__json
+        parts = []
+        append = parts.append
+        for key, obj in self.__objects.items():
+            entry = members.get(key)
+            if entry is None or entry[0] is not obj:
+                entry = members[key] = self.__member(key, obj)
+            append(entry[1])
+        return "{" + ", ".join(parts) + "}"
+
+    @staticmethod
+    def __member(key, obj):
+        """
+        Returns (obj, text, start): the "<key>": <JSON> member text of obj
+        in the storage document and where its JSON starts.
+        """
+        name = json.dumps(key)
+        return (obj, f"{name}: {json.dumps(obj._record())}", len(name) + 2)
+
+    @staticmethod
+    def __key(obj, key):
+        """Returns key, or the storage key of obj when it is None."""
+        if key is None:
+            return f"{obj.__class__.__name__}.{getattr(obj, 'id', None)}"
+        return key
+
+    def __drop(self, key):
+        """Drops the forms memoized under key."""
+        self.__records.pop(key, None)
+        self.__json.pop(key, None)
+        self.__texts.pop(key, None)
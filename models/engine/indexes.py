@@ -0,0 +1,308 @@
+#!/usr/bin/python3
+'''
+This module contains the general purpose storage indexes: the per class
+partition of the stored objects, the hash index of their foreign keys and
+their creation and update order.
+'''
+import bisect
+from models.base_model import Timestamp
+
+
+class ClassPartition:
+    """
+    ClassPartition keeps the stored objects of each class in their own
+    dictionary, so per class work never touches other classes.
+    ATTRIBUTES:
+        objects: returns the {key: obj} dictionary of one class
+    """
+
+    def __init__(self):
+        """Initializes an empty partition."""
+        self.clear()
+
+    def clear(self):
+        """Drops every partition."""
+        self.__partitions = {}
+
+    def add(self, key, obj):
+        """Files a newly stored object under its class."""
+        class_name = obj.__class__.__name__
+        self.__partitions.setdefault(class_name, {})[key] = obj
+
+    def remove(self, key, obj):
+        """Forgets a deleted object."""
+        self.__partitions.get(obj.__class__.__name__, {}).pop(key, None)
+
+    def update(self, key, obj, name, old):
+        """Attribute changes never move an object between classes."""
+        pass
+
+    def objects(self, class_name):
+        """Returns the {key: obj} dictionary of class_name."""
+        return self.__partitions.get(class_name, {})
+
+    def dump(self):
+        """Returns the keys of each class, to persist the index."""
+        return {class_name: list(partition)
+                for class_name, partition in self.__partitions.items()}
+
+    def restore(self, data, objects):
+        """Restores a dump() of the index over the stored objects."""
+        self.__partitions = {
+            class_name: {key: objects[key] for key in keys}
+            for class_name, keys in data.items()}
+
+
+class ForeignKeyIndex:
+    """
+    ForeignKeyIndex hashes the stored objects by the value of every
+    "<model>_id" class attribute (City.state_id, Place.city_id, ...).
+    ATTRIBUTES:
+        indexed: tells whether an attribute of a class is indexed
+        lookup: returns the {key: obj} dictionary of one foreign key value
+    """
+
+    def __init__(self):
+        """Initializes an empty index."""
+        self.clear()
+
+    def clear(self):
+        """Drops every hashed value."""
+        self.__values = {}
+
+    def indexed(self, class_name, name):
+        """Tells whether name is a foreign key attribute of class_name."""
+        return (class_name, name) in self.__attributes(class_name)
+
+    def add(self, key, obj):
+        """Hashes a newly stored object under its foreign keys."""
+        class_name = obj.__class__.__name__
+        for attribute in self.__attributes(class_name):
+            self.__values.setdefault(attribute, {}).setdefault(
+                getattr(obj, attribute[1]), {})[key] = obj
+
+    def remove(self, key, obj):
+        """Forgets a deleted object."""
+        class_name = obj.__class__.__name__
+        for attribute in self.__attributes(class_name):
+            self.__unhash(attribute, getattr(obj, attribute[1]), key)
+
+    def update(self, key, obj, name, old):
+        """Moves an object whose foreign key changed."""
+        attribute = (obj.__class__.__name__, name)
+        if attribute not in self.__attributes(attribute[0]):
+            return
+        self.__unhash(attribute, old, key)
+        self.__values.setdefault(attribute, {}).setdefault(
+            getattr(obj, name), {})[key] = obj
+
+    def lookup(self, class_name, name, value):
+        """Returns the {key: obj} dictionary of class_name.name == value."""
+        return self.__values.get((class_name, name), {}).get(value, {})
+
+    def dump(self):
+        """Returns the keys of every hashed value, to persist the index."""
+        return {attribute: {value: list(bucket)
+                            for value, bucket in values.items()}
+                for attribute, values in self.__values.items()}
+
+    def restore(self, data, objects):
+        """Restores a dump() of the index over the stored objects."""
+        self.__values = {
+            attribute: {value: {key: objects[key] for key in keys}
+                        for value, keys in values.items()}
+            for attribute, values in data.items()}
+
+    def __unhash(self, attribute, value, key):
+        """Removes key from the bucket of value."""
+        bucket = self.__values.get(attribute, {}).get(value)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self.__values[attribute][value]
+
+    __schemas = {}
+
+    @classmethod
+    def __attributes(cls, class_name):
+        """Returns the indexed (class name, attribute) pairs of a class."""
+        attributes = cls.__schemas.get(class_name)
+        if attributes is None:
+            from models.engine.file_storage import FileStorage
+            model = FileStorage().classes().get(class_name)
+            names = dir(model) if model is not None else ()
+            attributes = cls.__schemas[class_name] = frozenset(
+                (class_name, name) for name in names
+                if name.endswith("_id") and
+                isinstance(getattr(model, name), str))
+        return attributes
+
+
+class CreationIndex:
+    """
+    CreationIndex keeps the keys of each class sorted by their created_at,
+    in a sorted list of (created_at microseconds, id) pairs per class. New
+    objects, created after every stored one, extend the list at its end;
+    others, imported with an older created_at, are inserted in place.
+    ATTRIBUTES:
+        between: returns the keys created in a time range, oldest first
+        recent: returns the keys of the newest objects, newest first
+    """
+
+    def __init__(self):
+        """Initializes an empty index."""
+        self.clear()
+
+    def clear(self):
+        """Drops every sorted list."""
+        self.__entries = {}
+        self.__micros = {}
+
+    def rebuild(self, objects):
+        """Rebuilds the index from every stored object, sorting once."""
+        self.clear()
+        for key, obj in objects.items():
+            class_name, dot, model_id = key.partition(".")
+            micros = self.__micros[key] = self.__created(obj)
+            self.__entries.setdefault(class_name, []).append(
+                (micros, model_id))
+        for entries in self.__entries.values():
+            entries.sort()
+
+    def add(self, key, obj):
+        """Inserts a newly stored object."""
+        class_name, dot, model_id = key.partition(".")
+        micros = self.__micros[key] = self.__created(obj)
+        entries = self.__entries.setdefault(class_name, [])
+        entry = (micros, model_id)
+        if not entries or entries[-1] < entry:
+            entries.append(entry)
+        else:
+            bisect.insort(entries, entry)
+
+    def remove(self, key, obj):
+        """Forgets a deleted object."""
+        micros = self.__micros.pop(key, None)
+        if micros is None:
+            return
+        class_name, dot, model_id = key.partition(".")
+        entries = self.__entries.get(class_name, [])
+        position = bisect.bisect_left(entries, (micros, model_id))
+        if position < len(entries) and \
+                entries[position] == (micros, model_id):
+            del entries[position]
+
+    def update(self, key, obj, name, old):
+        """Moves an object whose created_at changed."""
+        if name == "created_at" and key in self.__micros:
+            self.remove(key, obj)
+            self.add(key, obj)
+
+    def between(self, class_name, start=None, end=None):
+        """
+        Returns the keys of the class_name objects created from the
+        datetime start (included) to end (excluded), oldest first.
+        """
+        entries = self.__entries.get(class_name, [])
+        low, high = 0, len(entries)
+        if start is not None:
+            low = bisect.bisect_left(entries, (Timestamp.micros(start),))
+        if end is not None:
+            high = bisect.bisect_left(entries, (Timestamp.micros(end),))
+        return [f"{class_name}.{model_id}"
+                for micros, model_id in entries[low:high]]
+
+    def recent(self, class_name, count):
+        """Returns the keys of the count newest class_name objects."""
+        entries = self.__entries.get(class_name, [])
+        return [f"{class_name}.{model_id}"
+                for micros, model_id in reversed(entries[-count:])]
+
+    def dump(self):
+        """Returns copies of the sorted lists, to persist the index."""
+        return {class_name: list(entries)
+                for class_name, entries in self.__entries.items()}
+
+    def restore(self, data, objects):
+        """Restores a dump() of the index."""
+        self.__entries = data
+        self.__micros = {f"{class_name}.{model_id}": micros
+                         for class_name, entries in data.items()
+                         for micros, model_id in entries}
+
+    @staticmethod
+    def __created(obj):
+        """Returns the created_at of obj in microseconds, -1 if invalid."""
+        micros = Timestamp.micros(obj.__dict__.get("created_at"))
+        return -1 if micros is None else micros
+
+
+class UpdateIndex:
+    """
+    UpdateIndex keeps the keys of every stored object sorted by their
+    updated_at, so the objects changed after a moment are found without
+    scanning storage.
+    ATTRIBUTES:
+        since: returns the keys updated after a moment, oldest first
+    """
+
+    def __init__(self):
+        """Initializes an empty index."""
+        self.clear()
+
+    def clear(self):
+        """Drops every entry."""
+        self.__entries = []
+        self.__micros = {}
+
+    def rebuild(self, objects):
+        """Rebuilds the index from every stored object, sorting once."""
+        self.clear()
+        for key, obj in objects.items():
+            micros = Timestamp.micros(obj.__dict__.get("updated_at"))
+            self.__micros[key] = -1 if micros is None else micros
+        self.__entries = sorted(
+            (micros, key) for key, micros in self.__micros.items())
+
+    def add(self, key, obj):
+        """Inserts a newly stored object."""
+        micros = Timestamp.micros(obj.__dict__.get("updated_at"))
+        if micros is None:
+            micros = -1
+        entry = (micros, key)
+        if not self.__entries or self.__entries[-1] < entry:
+            self.__entries.append(entry)
+        else:
+            bisect.insort(self.__entries, entry)
+        self.__micros[key] = micros
+
+    def remove(self, key, obj):
+        """Forgets a deleted object."""
+        micros = self.__micros.pop(key, None)
+        if micros is None:
+            return
+        position = bisect.bisect_left(self.__entries, (micros, key))
+        if position < len(self.__entries) and \
+                self.__entries[position] == (micros, key):
+            del self.__entries[position]
+
+    def update(self, key, obj, name, old):
+        """Moves an object whose updated_at changed."""
+        if name == "updated_at" and key in self.__micros:
+            self.remove(key, obj)
+            self.add(key, obj)
+
+    def since(self, moment):
+        """Returns the keys updated strictly after the datetime moment."""
+        position = bisect.bisect_left(
+            self.__entries, (Timestamp.micros(moment) + 1,))
+        return [key for micros, key in self.__entries[position:]]
+
+    def dump(self):
+        """Returns a copy of the sorted entries, to persist the index."""
+        return list(self.__entries)
+
+    def restore(self, data, objects):
+        """Restores a dump() of the index."""
+        self.__entries = data
+        self.__micros = {key: micros for micros, key in data}
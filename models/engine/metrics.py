@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+'''
+This module instruments storage and the console: counters and latency
+histograms kept by the Metrics registry while it is enabled, summed up
+for the console stats command and exported in the Prometheus text format.
+Metrics start disabled unless the HBNB_METRICS environment variable is
+set to 1; a disabled registry only costs the check of its flag.
+'''
+import bisect
+import functools
+import os
+import time
+
+PREFIX = "hbnb_"
+BUCKETS = tuple(0.00001 * 2 ** i for i in range(24))
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """
+    Histogram counts observations in the BUCKETS, upper bounds from 10us
+    to about 84s doubling each time, plus one for the larger ones.
+    ATTRIBUTES:
+        counts: the number of observations in each bucket
+        sum: the sum of the observations
+        count: the number of observations
+        low: the smallest observation
+        high: the largest observation
+    """
+    __slots__ = ("counts", "sum", "count", "low", "high")
+
+    def __init__(self):
+        """Initializes an empty histogram."""
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.low = float("inf")
+        self.high = 0.0
+
+    def observe(self, value):
+        """Counts one observation."""
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+
+    def quantile(self, q):
+        """
+        Returns the q quantile of the observations, interpolated within
+        its bucket and kept between the smallest and largest observations,
+        0 when there is none.
+        """
+        rank, seen = q * self.count, 0
+        for position, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = BUCKETS[position - 1] if position else 0.0
+                high = BUCKETS[position] if position < len(BUCKETS) \
+                    else self.high
+                value = low + (high - low) * (rank - seen) / count
+                return min(max(value, self.low), self.high)
+            seen += count
+        return 0.0
+
+
+class Metrics:
+    """
+    Metrics keeps named counters and histograms, each optionally split by
+    one (label name, label value) pair, while enabled.
+    ATTRIBUTES:
+        enabled: tells whether observations are recorded
+        count: adds to a counter
+        observe: adds an observation to a histogram
+        timed: decorates a function to observe how long its calls take
+        summary: returns the (name, value) lines of the stats command
+        prometheus: returns the metrics in the Prometheus text format
+        write: writes the Prometheus text to a file
+    """
+
+    def __init__(self, enabled=False):
+        """Initializes an empty registry."""
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """Drops every counter and histogram."""
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name, amount=1, label=None):
+        """Adds amount to the counter name, if enabled."""
+        if self.enabled:
+            key = (name, label)
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, label=None):
+        """Adds value to the histogram name, if enabled."""
+        if self.enabled:
+            histogram = self.histograms.get((name, label))
+            if histogram is None:
+                histogram = self.histograms[(name, label)] = Histogram()
+            histogram.observe(value)
+
+    def timed(self, name, label=None):
+        """
+        Returns a decorator observing the seconds every call of the
+        decorated function takes in the histogram name, if enabled.
+        """
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start, label)
+            return wrapper
+        return decorate
+
+    def summary(self):
+        """
+        Returns the (name, value) lines of every counter and of the count,
+        sum and quantiles of every histogram, in name order.
+        """
+        lines = [(_name(name, label), value) for (name, label), value
+                 in sorted(self.counters.items(), key=_order)]
+        for (name, label), histogram in sorted(self.histograms.items(),
+                                               key=_order):
+            name = _name(name, label)
+            lines.append((f"{name}.count", histogram.count))
+            lines.append((f"{name}.sum", round(histogram.sum, 6)))
+            lines.extend((f"{name}.p{round(q * 100)}",
+                          round(histogram.quantile(q), 6))
+                         for q in QUANTILES)
+        return lines
+
+    def prometheus(self, gauges=()):
+        """
+        Returns the counters, the histograms and the (name, label, value)
+        gauges in the Prometheus text exposition format.
+        """
+        lines = []
+        self.__family(lines, "gauge", gauges)
+        self.__family(lines, "counter", (
+            (name, label, value) for (name, label), value
+            in sorted(self.counters.items(), key=_order)))
+        typed = set()
+        for (name, label), histogram in sorted(self.histograms.items(),
+                                               key=_order):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), histogram.counts):
+                cumulative += count
+                bucket = ("le", bound if bound == "+Inf" else f"{bound:g}")
+                lines.append(f"{PREFIX}{name}_bucket"
+                             f"{_labels(label, bucket)} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_labels(label)} "
+                         f"{histogram.sum!r}")
+            lines.append(f"{PREFIX}{name}_count{_labels(label)} "
+                         f"{histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, gauges=()):
+        """Writes prometheus() to path, replaced atomically."""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.prometheus(gauges))
+        os.replace(temporary, path)
+
+    @staticmethod
+    def __family(lines, kind, samples):
+        """Appends samples of one kind, typing each name once."""
+        typed = set()
+        for name, label, value in samples:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            lines.append(f"{PREFIX}{name}{_labels(label)} {value}")
+
+
+def _order(item):
+    """Orders registry items by name, then label."""
+    (name, label), value = item
+    return name, label or ()
+
+
+def _name(name, label):
+    """Returns the name of a metric in the stats lines."""
+    return name if label is None else f"{name}{{{label[0]}={label[1]}}}"
+
+
+def _labels(*labels):
+    """Returns the Prometheus label set of (name, value) labels."""
+    pairs = [f'{name}="{str(value).replace(chr(34), chr(92) + chr(34))}"'
+             for name, value in filter(None, labels)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+registry = Metrics(os.environ.get("HBNB_METRICS") == "1")
+timed = registry.timed
@@ -0,0 +1,169 @@
+#!/usr/bin/python3
+'''
+This module compiles where-clauses such as
+`price_by_night<100, city_id="c-1"` into predicates over stored objects
+and picks the storage index that narrows them down.
+'''
+import ast
+import functools
+import operator
+import re
+from datetime import datetime
+from models.engine import schema
+
+OPERATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+
+_CLAUSE = re.compile(r"""
+    \s*(?P<name>[A-Za-z_]\w*)
+    \s*(?P<operator>==|!=|<=|>=|=|<|>)
+    \s*(?P<value>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^,\s]+)
+    \s*(?:,|$)""", re.VERBOSE)
+_NUMBER = re.compile(r"[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?")
+
+
+def parse(text):
+    """
+    Returns the (name, operator, value) conditions of a comma separated
+    list of where-clauses, values being strings until compiled. Raises
+    ValueError for text that is not such a list.
+    """
+    conditions = []
+    position, end = 0, len(text.rstrip())
+    while position < end:
+        match = _CLAUSE.match(text, position)
+        if match is None:
+            raise ValueError(f"invalid where clause {text[position:]}")
+        value = match.group("value")
+        if value[0] in "\"'":
+            try:
+                value = ast.literal_eval(value)
+            except SyntaxError:
+                raise ValueError(f"invalid string {value}") from None
+        conditions.append((match.group("name"), match.group("operator"),
+                           value))
+        position = match.end()
+    return conditions
+
+
+@functools.lru_cache(maxsize=256)
+def compile_where(model, text):
+    """Returns the Query of the where-clauses text over model instances."""
+    types = schema.of(model).types
+    conditions = tuple((name, "=" if symbol == "==" else symbol,
+                        _value(types.get(name), name, value))
+                       for name, symbol, value in parse(text))
+    return Query(model.__name__, conditions)
+
+
+def _value(value_type, name, text):
+    """Returns text as the type the attribute name is compared with."""
+    if name == "id":
+        return text
+    try:
+        if name in ("created_at", "updated_at"):
+            return datetime.fromisoformat(text)
+        if value_type is int and text.lstrip("+-").isdigit():
+            return int(text)
+        if value_type in (int, float):
+            return float(text)
+    except ValueError:
+        raise ValueError(f"invalid value {text} for {name}") from None
+    if value_type is None and _NUMBER.fullmatch(text):
+        return float(text) if any(c in text for c in ".eE") else int(text)
+    return text
+
+
+class Query:
+    """
+    Query is a compiled list of where-clauses over one model class: each
+    condition becomes a closure and the whole list a single predicate,
+    built once and reused for every object.
+    ATTRIBUTES:
+        class_name: the name of the queried class
+        conditions: the (name, operator, value) conditions
+        key: the conditions in a form that ignores their order
+        names: the attributes the conditions read
+        matches: tells whether an object meets every condition
+        plan: returns the candidates an index narrows the query to
+    """
+
+    def __init__(self, class_name, conditions):
+        """Compiles the predicates of conditions."""
+        self.class_name = class_name
+        self.conditions = conditions
+        self.key = frozenset(conditions)
+        self.names = frozenset(name for name, symbol, value in conditions)
+        self.__tests = [_test(*condition) for condition in conditions]
+        self.matches = _all(self.__tests)
+        self.__predicate = self.matches if conditions else None
+
+    def plan(self, storage):
+        """
+        Returns (candidates, predicate): the {key: obj} dictionary the
+        most selective applicable index narrows the query to (the class
+        partition when none applies), and the predicate left to check on
+        them, None when the index answers the query exactly.
+        """
+        class_name = self.class_name
+        foreign_keys = storage.index("foreign_keys")
+        for position, (name, symbol, value) in enumerate(self.conditions):
+            if symbol != "=":
+                continue
+            if name == "id":
+                key = f"{class_name}.{value}"
+                obj = storage.all().get(key)
+                candidates = {} if obj is None else {key: obj}
+                return candidates, self.__without(position)
+            if foreign_keys.indexed(class_name, name):
+                return (storage.lookup(class_name, name, value),
+                        self.__without(position))
+        store = storage.columns(class_name)
+        if store is not None:
+            for name, symbol, value in self.conditions:
+                if name in store.names and symbol != "!=" and \
+                        value.__class__ in (int, float):
+                    low = None if symbol in ("<", "<=") else value
+                    high = None if symbol in (">", ">=") else value
+                    objects = storage.all()
+                    keys = store.select(name, low, high)
+                    return ({key: objects[key] for key in keys},
+                            self.__predicate)
+        return storage.objects(class_name), self.__predicate
+
+    def __without(self, position):
+        """Returns the predicate of every condition but one, or None."""
+        tests = self.__tests[:position] + self.__tests[position + 1:]
+        return _all(tests) if tests else None
+
+
+def _test(name, symbol, value):
+    """Returns the predicate of one condition."""
+    compare = OPERATORS[symbol]
+
+    def test(obj):
+        try:
+            return compare(getattr(obj, name), value)
+        except (AttributeError, TypeError):
+            return False
+    return test
+
+
+def _all(tests):
+    """Returns the predicate true when every one of tests is."""
+    if len(tests) == 1:
+        return tests[0]
+
+    def matches(obj):
+        for test in tests:
+            if not test(obj):
+                return False
+        return True
+    return matches
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+'''
+This module contains the ResultCache class, which keeps the results of
+recent queries (counts, filtered and ordered listings) until a storage
+change they depend on drops them.
+'''
+import collections
+import sys
+import time
+
+
+class ResultCache:
+    """
+    ResultCache is a storage index holding query results, keyed by the
+    normalized query, in least recently used order. A result depends on
+    the objects of one class and on the attributes its query reads: a
+    stored or deleted object drops the results of its class, and an
+    attribute change drops those reading that attribute only. At most
+    capacity results are kept, each for ttl seconds at most when set.
+    ATTRIBUTES:
+        capacity: the number of results kept at most
+        ttl: the seconds a result is kept at most, None for no limit
+        get: returns a cached result, None if there is none
+        put: caches a result with the attributes it depends on
+        stats: returns the hit, miss, eviction and memory counters
+    """
+
+    def __init__(self, capacity=1024, ttl=None):
+        """Initializes an empty cache of capacity results."""
+        self.capacity = capacity
+        self.ttl = ttl
+        self.hits = self.misses = 0
+        self.invalidations = self.evictions = self.expirations = 0
+        self.clear()
+
+    def clear(self):
+        """Drops every result."""
+        self.__entries = collections.OrderedDict()
+        self.__classes = {}
+        self.__bytes = 0
+
+    def rebuild(self, objects):
+        """Drops every result, storage being refilled."""
+        self.clear()
+
+    def add(self, key, obj):
+        """Drops the results over the class of a newly stored object."""
+        self.__drop_class(obj.__class__.__name__)
+
+    def remove(self, key, obj):
+        """Drops the results over the class of a deleted object."""
+        self.__drop_class(obj.__class__.__name__)
+
+    def update(self, key, obj, name, old):
+        """Drops the results reading the changed attribute."""
+        names = self.__classes.get(obj.__class__.__name__)
+        if names:
+            for query_key in list(names.get(name, ())):
+                self.__drop(query_key)
+                self.invalidations += 1
+
+    def get(self, query_key):
+        """Returns the result cached for query_key, None if there is none."""
+        entry = self.__entries.get(query_key)
+        if entry is not None and self.ttl is not None and \
+                time.monotonic() - entry[1] > self.ttl:
+            self.__drop(query_key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.__entries.move_to_end(query_key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, query_key, result, class_name, names):
+        """
+        Caches result under query_key, a hashable (class name, ...) tuple,
+        as depending on the class_name objects and their attributes names.
+        """
+        if self.capacity <= 0:
+            return result
+        if query_key in self.__entries:
+            self.__drop(query_key)
+        size = sys.getsizeof(result)
+        self.__entries[query_key] = (result, time.monotonic(), class_name,
+                                     names, size)
+        self.__bytes += size
+        depends = self.__classes.setdefault(class_name, {})
+        for name in names:
+            depends.setdefault(name, set()).add(query_key)
+        depends.setdefault(None, set()).add(query_key)
+        while len(self.__entries) > self.capacity:
+            self.__drop(next(iter(self.__entries)))
+            self.evictions += 1
+        return result
+
+    def stats(self):
+        """Returns the counters of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.__entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "bytes": self.__bytes,
+        }
+
+    def __drop_class(self, class_name):
+        """Drops every result over class_name objects."""
+        names = self.__classes.get(class_name)
+        if names:
+            for query_key in list(names[None]):
+                self.__drop(query_key)
+                self.invalidations += 1
+
+    def __drop(self, query_key):
+        """Drops one result and forgets its dependencies."""
+        result, stamp, class_name, names, size = \
+            self.__entries.pop(query_key)
+        self.__bytes -= size
+        depends = self.__classes[class_name]
+        for name in (*names, None):
+            keys = depends[name]
+            keys.discard(query_key)
+            if not keys:
+                del depends[name]
+        if not depends:
+            del self.__classes[class_name]
@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+'''
+This module keeps the type schema of each model class: its str, int,
+float and list class attributes and its timestamps, each with a coercer
+function, built once per class and shared by the console, the bulk
+importer and reload(), and the names of its methods and properties,
+which can't be set.
+'''
+import ast
+import json
+from datetime import datetime
+from models.base_model import Timestamp
+
+TYPES = (str, int, float, list)
+
+_schemas = {}
+
+
+def of(model):
+    """Returns the Schema of model, building it on first use."""
+    schema = _schemas.get(model)
+    if schema is None:
+        schema = _schemas[model] = Schema(model)
+    return schema
+
+
+def to_str(value):
+    """Returns value as a str, raising ValueError for containers."""
+    if value.__class__ is str:
+        return value
+    if isinstance(value, (dict, list, tuple, bool)) or value is None:
+        raise ValueError(f"{value!r} is not str")
+    return str(value)
+
+
+def to_int(value):
+    """
+    Returns value as an int, raising ValueError if it can't be, floats
+    with a fractional part and infinite ones included.
+    """
+    if value.__class__ is int:
+        return value
+    if isinstance(value, (dict, list, tuple, bool)) or value is None or \
+            isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{value!r} is not int")
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{value!r} is not int") from None
+
+
+def to_float(value):
+    """Returns value as a float, raising ValueError if it can't be."""
+    if value.__class__ is float:
+        return value
+    if isinstance(value, (dict, list, tuple, bool)) or value is None:
+        raise ValueError(f"{value!r} is not float")
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{value!r} is not float") from None
+
+
+def to_list(value):
+    """
+    Returns value as a new list of strings: a list or tuple is copied and
+    a string is read as a JSON or Python list literal. Raises ValueError
+    otherwise, or when an element is not a string.
+    """
+    if value.__class__ is str:
+        try:
+            value = json.loads(value)
+        except ValueError:
+            try:
+                value = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                raise ValueError(f"{value!r} is not a list") from None
+    if not isinstance(value, (list, tuple)) or \
+            not all(item.__class__ is str for item in value):
+        raise ValueError(f"{value!r} is not a list of str")
+    return list(value)
+
+
+def to_datetime(value):
+    """
+    Returns value as a datetime, reading a string as ISO-8601. Raises
+    ValueError otherwise.
+    """
+    if isinstance(value, datetime):
+        return value
+    if value.__class__ is str:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    raise ValueError(f"{value!r} is not an ISO-8601 datetime")
+
+
+COERCERS = {str: to_str, int: to_int, float: to_float, list: to_list}
+
+
+class Schema:
+    """
+    Schema holds the typed public class attributes of one model class,
+    walking its MRO once, and the coercer of each.
+    ATTRIBUTES:
+        model: the model class
+        types: the {name: type} of the typed attributes
+        coercers: the {name: coercer} of the typed attributes and of the
+            timestamps, which take datetimes or ISO-8601 strings
+        coerce: converts a value to the type of an attribute
+        coerce_record: converts the typed values of a to_dict() form
+        methods: the names of the methods and properties of the class
+        writable: tells whether an attribute can be set by name
+    """
+
+    def __init__(self, model):
+        """Collects the str, int, float and list attributes of model."""
+        self.model = model
+        self.types = {}
+        self.methods = set()
+        timestamps = []
+        for klass in reversed(model.__mro__):
+            for name, value in vars(klass).items():
+                if callable(value) or isinstance(
+                        value, (property, classmethod, staticmethod)):
+                    self.methods.add(name)
+                elif isinstance(value, Timestamp):
+                    timestamps.append(name)
+                elif not name.startswith("_") and type(value) in TYPES:
+                    self.types[name] = type(value)
+        self.coercers = {name: COERCERS[value_type]
+                         for name, value_type in self.types.items()}
+        self.coercers.update((name, to_datetime) for name in timestamps)
+
+    def writable(self, name):
+        """
+        Tells whether the attribute name can be set: a public name that is
+        not id, which keys the instance in storage, nor the one of a method
+        or a property.
+        """
+        return name.__class__ is str and name not in ("", "id") and \
+            not name.startswith("_") and name not in self.methods
+
+    def coerce(self, name, value):
+        """
+        Returns value converted to the type of the attribute name, value
+        itself for an untyped attribute. Raises ValueError if it can't be,
+        or if name can't be set.
+        """
+        if not self.writable(name):
+            raise ValueError(f"can't set {name}")
+        coercer = self.coercers.get(name)
+        return value if coercer is None else coercer(value)
+
+    def coerce_record(self, record, strict=True):
+        """
+        Converts in place the values of a to_dict() form that do not have
+        the type of their attribute yet, and checks the elements of lists,
+        and returns the record. Raises
+        ValueError for a value that can't be converted, or drops it when
+        not strict, so the class attribute stands for it.
+        """
+        types = self.types
+        for name, value in list(record.items()):
+            value_type = types.get(name)
+            if value_type is not None and (value.__class__ is not value_type
+                                           or value_type is list):
+                try:
+                    record[name] = self.coercers[name](value)
+                except ValueError:
+                    if strict:
+                        raise
+                    del record[name]
+        return record
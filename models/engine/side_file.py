@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+'''
+This module reads and writes the side files storage keeps next to its
+JSON data file (the index snapshots, the warm start snapshot), each one
+valid for a single generation of the data file.
+'''
+import gc
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import threading
+
+MAGIC = b"HBNB-SIDE-FILE\n"
+VERSION = 1
+
+_lock = threading.Lock()
+
+
+def fingerprint(data):
+    """Returns the fingerprint of the bytes of a data file generation."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def dumps(payload):
+    """Returns the pickled form of a payload."""
+    return pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)
+
+
+def write(path, data_fingerprint, payload):
+    """
+    Writes payload, valid for the data file generation whose fingerprint
+    is data_fingerprint, to path: MAGIC, a JSON header line with the
+    format version, the fingerprint, the payload size and checksum, then
+    the pickled payload (or the bytes of an already pickled one). The
+    file is replaced atomically.
+    """
+    if not isinstance(payload, bytes):
+        payload = dumps(payload)
+    header = {"version": VERSION, "fingerprint": data_fingerprint,
+              "size": len(payload), "checksum": fingerprint(payload)}
+    with _lock:
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(MAGIC)
+            file.write(json.dumps(header).encode("utf-8") + b"\n")
+            file.write(payload)
+        os.replace(temporary, path)
+
+
+def write_async(path, data_fingerprint, payload):
+    """Runs write() in a background thread and returns the thread."""
+    thread = threading.Thread(
+        target=write, args=(path, data_fingerprint, payload),
+        name="side-file-writer")
+    thread.start()
+    return thread
+
+
+def read(path, data_fingerprint):
+    """
+    Returns the payload of the side file at path when it was written by
+    this format version for the data file generation data_fingerprint and
+    its checksum matches, None otherwise. The file is memory mapped, so
+    the payload is unpickled straight from the page cache, with the cyclic
+    garbage collector paused: the payload only holds acyclic objects and
+    would trigger a full collection every few thousand of them.
+    """
+    try:
+        with open(path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(MAGIC)] != MAGIC:
+                return None
+            end = data.find(b"\n", len(MAGIC))
+            header = json.loads(data[len(MAGIC):end])
+            if header["version"] != VERSION or \
+                    header["fingerprint"] != data_fingerprint:
+                return None
+            with memoryview(data)[end + 1:] as payload:
+                if len(payload) != header["size"] or \
+                        fingerprint(payload) != header["checksum"]:
+                    return None
+                collecting = gc.isenabled()
+                gc.disable()
+                try:
+                    return pickle.loads(payload)
+                finally:
+                    if collecting:
+                        gc.enable()
+    except (OSError, ValueError, KeyError, TypeError, AttributeError,
+            ImportError, pickle.UnpicklingError, EOFError):
+        return None
@@ -20,6 +20,8 @@ class Place(BaseModel):
         - latitude: float (0.0)
         - longitude: float (0.0)
         - amenity_ids: list of strings, will store Amenity.id later
+    Properties:
+        - amenity_mask: integer bitmask of amenity_ids kept by storage
     """
     city_id = ""
     user_id = ""
@@ -32,3 +34,10 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @property
+    def amenity_mask(self):
+        """Returns the amenity bitmask of this place from storage."""
+        from models import storage
+        return storage.index("amenities").mask_of(
+            f"{self.__class__.__name__}.{self.id}")
@@ -0,0 +1,347 @@
+#!/usr/bin/python3
+'''
+This module serves the console over TCP or Unix sockets, so that many
+sessions share the storage of one process, and holds the thin client that
+talks to it.
+
+The protocol is line based: the client sends one command per line and may
+send the next ones before the answers come back. The server answers every
+line, in order, with the output of the command followed by a line holding
+a single "."; output lines that start with "." get one more, as in SMTP.
+'''
+import argparse
+import asyncio
+import cmd
+import contextlib
+import os
+import socket
+import sys
+import threading
+import models
+from console import HBNBCommand, split_args
+
+END = b".\n"
+LINE_LIMIT = 1 << 20
+
+
+def parse_address(text):
+    """
+    Returns ("unix", path) for unix:PATH or a path holding a slash, and
+    ("tcp", host, port) for [HOST:]PORT, the host defaulting to 127.0.0.1.
+    """
+    if text.startswith("unix:"):
+        return ("unix", text[5:])
+    if "/" in text:
+        return ("unix", text)
+    host, _, port = text.rpartition(":")
+    return ("tcp", host or "127.0.0.1", int(port))
+
+
+def frame(output):
+    """Returns the output of a command as it is sent to the client."""
+    if output and not output.endswith("\n"):
+        output += "\n"
+    if output.startswith("."):
+        output = "." + output
+    return (output.replace("\n.", "\n..") + ".\n").encode("utf-8")
+
+
+class SessionCommand(HBNBCommand):
+    """
+    SessionCommand is the console of a server session. The commands that
+    read or write files (import, export, changes to a file and stats
+    export) are refused: they would run with the rights of the server
+    process on any path a client names.
+    """
+    refused = "** files can't be used in server sessions **"
+
+    def do_import(self, arg):
+        """Refused in server sessions."""
+        print(SessionCommand.refused)
+
+    def do_export(self, arg):
+        """Refused in server sessions."""
+        print(SessionCommand.refused)
+
+    def do_changes(self, arg):
+        """
+        Prints as JSON lines the instances updated after a date:
+        changes <ISO-8601 date|change sequence number>
+        """
+        if len(split_args(arg)) > 1:
+            print(SessionCommand.refused)
+            return
+        super().do_changes(arg)
+
+    def do_stats(self, arg):
+        """
+        Prints the objects of each class, the query result cache counters
+        and the metrics, or switches metrics on or off or resets them:
+        stats [on|off|reset]
+        """
+        if split_args(arg)[:1] == ("export",):
+            print(SessionCommand.refused)
+            return
+        super().do_stats(arg)
+
+
+class ConsoleServer:
+    """
+    ConsoleServer runs one console session (a SessionCommand) per
+    connection against the storage of this process, loaded once.
+    Commands run one at a time on the event loop, so no two sessions
+    interleave inside a command, and the sessions take turns between
+    commands. Saves are deferred and the pending changes written once
+    every save_interval seconds.
+    ATTRIBUTES:
+        save_interval: the seconds between two commits of storage
+        sessions: the number of open sessions
+        commands: the number of commands run
+        commits: the number of saves written
+    """
+
+    def __init__(self, save_interval=1.0):
+        """Creates a server that isn't listening yet."""
+        self.save_interval = save_interval
+        self.sessions = 0
+        self.commands = 0
+        self.commits = 0
+        self.__servers = []
+        self.__paths = []
+        self.__writers = set()
+        self.__saver = None
+
+    async def start(self, *addresses):
+        """
+        Listens on every address (see parse_address()), defers storage
+        saves, and returns the socket names listened on.
+        """
+        models.storage.defer()
+        for address in addresses:
+            kind, *where = parse_address(address)
+            if kind == "unix":
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(where[0])
+                server = await asyncio.start_unix_server(
+                    self.handle, where[0], limit=LINE_LIMIT)
+                self.__paths.append(where[0])
+            else:
+                server = await asyncio.start_server(
+                    self.handle, *where, limit=LINE_LIMIT)
+            self.__servers.append(server)
+        self.__saver = asyncio.create_task(self.__save_every())
+        return [sock.getsockname()
+                for server in self.__servers for sock in server.sockets]
+
+    async def close(self):
+        """Closes the listeners and sessions and saves pending changes."""
+        if self.__saver is not None:
+            self.__saver.cancel()
+        for server in self.__servers:
+            server.close()
+        for writer in list(self.__writers):
+            writer.close()
+        for server in self.__servers:
+            await server.wait_closed()
+        for path in self.__paths:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+        self.__servers, self.__paths = [], []
+        self.commits += models.storage.commit()
+        models.storage.defer(False)
+
+    async def handle(self, reader, writer):
+        """Runs the commands of one connection until quit, EOF or close."""
+        console = SessionCommand()
+        self.sessions += 1
+        self.__writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                output, stop, failed = console.execute(
+                    line.decode("utf-8", "replace").strip())
+                self.commands += 1
+                writer.write(frame(output))
+                await writer.drain()
+                if stop:
+                    break
+                await asyncio.sleep(0)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.sessions -= 1
+            self.__writers.discard(writer)
+            writer.close()
+
+    async def __save_every(self):
+        """Commits the deferred saves every save_interval seconds."""
+        while True:
+            await asyncio.sleep(self.save_interval)
+            self.commits += models.storage.commit()
+
+
+class Client:
+    """
+    Client sends commands to a ConsoleServer and reads back their output.
+    ATTRIBUTES:
+        address: the address of the server, see parse_address()
+    """
+
+    def __init__(self, address, timeout=None):
+        """Connects to the server at address."""
+        self.address = address
+        kind, *where = parse_address(address)
+        if kind == "unix":
+            self.__socket = socket.socket(socket.AF_UNIX)
+            self.__socket.settimeout(timeout)
+            self.__socket.connect(where[0])
+        else:
+            self.__socket = socket.create_connection(tuple(where), timeout)
+        self.__file = self.__socket.makefile("rwb")
+
+    def close(self):
+        """Closes the connection."""
+        self.__file.close()
+        self.__socket.close()
+
+    def __enter__(self):
+        """Returns the client."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the connection."""
+        self.close()
+
+    def send(self, line):
+        """Sends one command without waiting for its output."""
+        self.__file.write(line.replace("\n", " ").encode("utf-8") + b"\n")
+        self.__file.flush()
+
+    def receive(self):
+        """
+        Returns the output of the next command sent, or None if the
+        server closed the connection.
+        """
+        lines = []
+        for line in self.__file:
+            if line == END:
+                return b"".join(lines).decode("utf-8")
+            lines.append(line[1:] if line.startswith(b".") else line)
+        return None
+
+    def run(self, line):
+        """Sends one command and returns its output."""
+        self.send(line)
+        return self.receive()
+
+    def pipeline(self, lines):
+        """
+        Sends every command of lines from a thread while reading their
+        outputs, and yields the outputs in order until the last one or
+        the end of the session.
+        """
+        count = 0
+        lines = [line.strip() for line in lines]
+
+        def send_all():
+            """Sends the commands."""
+            with contextlib.suppress(OSError):
+                for line in lines:
+                    self.send(line)
+
+        sender = threading.Thread(target=send_all, daemon=True)
+        sender.start()
+        while count < len(lines):
+            output = self.receive()
+            if output is None:
+                break
+            count += 1
+            yield output
+        sender.join()
+
+
+class RemoteConsole(cmd.Cmd):
+    """RemoteConsole is the prompt of a Client, in place of HBNBCommand."""
+    prompt = HBNBCommand.prompt
+
+    def __init__(self, client):
+        """Creates a prompt sending its commands through client."""
+        super().__init__()
+        self.client = client
+
+    def onecmd(self, line):
+        """Runs line on the server and prints its output."""
+        output = self.client.run(line)
+        if output is None:
+            return True
+        sys.stdout.write(output)
+        return line.split(maxsplit=1)[:1] in (["quit"], ["EOF"])
+
+
+def serve(addresses, save_interval=1.0):
+    """Loads storage and serves the console on addresses until stopped."""
+    async def run():
+        server = ConsoleServer(save_interval)
+        for name in await server.start(*addresses):
+            print(f"listening on {name}", file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    models.init()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run())
+
+
+def main(argv=None):
+    """Serves the console, or connects to a server as its client."""
+    parser = argparse.ArgumentParser(
+        prog="server.py", description="HBNB console server and client")
+    parser.add_argument("addresses", nargs="*", metavar="ADDRESS",
+                        default=["unix:hbnb.sock"],
+                        help="[HOST:]PORT or unix:PATH to listen on")
+    parser.add_argument("--save-interval", type=float, default=1.0,
+                        metavar="SECONDS",
+                        help="writes the pending changes every SECONDS")
+    parser.add_argument("--changes", metavar="FILE",
+                        help="appends the storage changes to FILE, for "
+                        "'changes <sequence number>'")
+    parser.add_argument("--connect", metavar="ADDRESS",
+                        help="runs a console on the server at ADDRESS")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--batch", metavar="FILE",
+                        help="sends the commands of FILE, - for stdin")
+    source.add_argument("-c", dest="commands", action="append",
+                        metavar="COMMAND", help="sends COMMAND (repeatable)")
+    options = parser.parse_args(argv)
+    if options.connect is None:
+        if options.changes is not None:
+            models.storage.changes().open(options.changes)
+        serve(options.addresses, options.save_interval)
+        return 0
+    with Client(options.connect) as client:
+        if options.batch is None and options.commands is None:
+            RemoteConsole(client).cmdloop()
+            return 0
+        if options.commands is not None:
+            lines = options.commands
+        elif options.batch == "-":
+            lines = list(sys.stdin)
+        else:
+            with open(options.batch, "r", encoding="utf-8") as file:
+                lines = list(file)
+        lines = [line for line in map(str.strip, lines)
+                 if line and not line.startswith("#")]
+        failed = False
+        for output in client.pipeline(lines):
+            sys.stdout.write(output)
+            failed = failed or any(text.startswith("**")
+                                   for text in output.splitlines())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
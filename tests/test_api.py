@@ -0,0 +1,225 @@
+#!/usr/bin/python3
+"""
+Defines unittests for api.py.
+"""
+import json
+import os
+import threading
+import unittest
+from http.client import HTTPConnection
+from unittest.mock import patch
+from models import storage
+from models.place import Place
+from models.state import State
+from api import APIServer, etag, matches
+
+
+class TestETag(unittest.TestCase):
+    """Unittests for the ETags of objects."""
+
+    def test_etag(self):
+        """Test that the ETag follows updated_at."""
+        state = State()
+        tag = etag(state)
+        self.assertEqual(tag, etag(state))
+        state.save()
+        self.assertNotEqual(tag, etag(state))
+        storage.delete(state)
+
+    def test_matches(self):
+        """Test the If-None-Match and If-Match headers."""
+        self.assertTrue(matches('"a", "b"', '"b"'))
+        self.assertTrue(matches('W/"a"', '"a"'))
+        self.assertTrue(matches("*", '"a"'))
+        self.assertFalse(matches('"a"', '"b"'))
+        self.assertFalse(matches(None, '"b"'))
+
+
+class TestAPIServer(unittest.TestCase):
+    """Unittests for the routes of the API."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Renames file.json and starts the server."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        cls.server = APIServer(("127.0.0.1", 0), save_interval=3600)
+        cls.thread = threading.Thread(target=cls.server.serve_forever,
+                                      daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stops the server and puts file.json back."""
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        """Opens a connection kept alive for the whole test."""
+        self.connection = HTTPConnection(*self.server.server_address[:2])
+
+    def tearDown(self):
+        """Closes the connection."""
+        self.connection.close()
+
+    def request(self, method, path, body=None, headers=None):
+        """Returns the status, headers and JSON body of a request."""
+        headers = dict(headers or {})
+        if body is not None:
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        self.connection.request(method, f"/api/v1{path}", body, headers)
+        response = self.connection.getresponse()
+        data = response.read()
+        return response.status, response.headers, \
+            json.loads(data) if data else None
+
+    def test_status_and_stats(self):
+        """Test the status and the number of objects per class."""
+        self.assertEqual((200, {"status": "OK"}),
+                         self.request("GET", "/status")[::2])
+        status, headers, stats = self.request("GET", "/stats")
+        self.assertEqual(len(storage.objects("Place")), stats["places"])
+        self.assertEqual(6, len(stats))
+
+    def test_crud(self):
+        """Test creating, reading, updating and deleting an object."""
+        status, headers, state = self.request(
+            "POST", "/states", {"name": "California", "id": "mine"})
+        self.assertEqual(201, status)
+        self.assertNotEqual("mine", state["id"])
+        self.assertEqual(f"/api/v1/states/{state['id']}",
+                         headers["Location"])
+        path = f"/states/{state['id']}"
+        self.assertEqual((200, state), self.request("GET", path)[::2])
+        status, headers, updated = self.request(
+            "PUT", path, {"name": "Nevada", "created_at": "2000-01-01"})
+        self.assertEqual(200, status)
+        self.assertEqual("Nevada", updated["name"])
+        self.assertEqual(state["created_at"], updated["created_at"])
+        self.assertEqual((200, {}), self.request("DELETE", path)[::2])
+        self.assertEqual(
+            (404, {"error": "Not found"}), self.request("GET", path)[::2])
+
+    def test_conditional_get(self):
+        """Test that an unchanged object is answered 304."""
+        place = Place()
+        path = f"/places/{place.id}"
+        status, headers, body = self.request("GET", path)
+        tag = headers["ETag"]
+        status, headers, body = self.request(
+            "GET", path, headers={"If-None-Match": tag})
+        self.assertEqual((304, None), (status, body))
+        self.assertEqual(tag, headers["ETag"])
+        place.save()
+        self.assertEqual(200, self.request(
+            "GET", path, headers={"If-None-Match": tag})[0])
+        storage.delete(place)
+
+    def test_if_match(self):
+        """Test that an update of an outdated object is refused."""
+        place = Place()
+        path = f"/places/{place.id}"
+        tag = self.request("GET", path)[1]["ETag"]
+        status, headers, body = self.request(
+            "PUT", path, {"max_guest": 3}, {"If-Match": tag})
+        self.assertEqual(200, status)
+        self.assertEqual(3, place.max_guest)
+        self.assertEqual(412, self.request(
+            "PUT", path, {"max_guest": 4}, {"If-Match": tag})[0])
+        self.assertEqual(412, self.request(
+            "DELETE", path, headers={"If-Match": tag})[0])
+        self.assertEqual(3, place.max_guest)
+        storage.delete(place)
+
+    def test_pages(self):
+        """Test that pages follow each other through the Link header."""
+        places = [Place() for i in range(5)]
+        for place in places:
+            place.city_id = "api-city"
+        keys, path = [], "/places?limit=2&where=city_id%3Dapi-city"
+        while path:
+            status, headers, page = self.request("GET", path)
+            self.assertEqual(200, status)
+            keys.extend(obj["id"] for obj in page)
+            link = headers["Link"]
+            path = link and link[8:link.index(">")]
+        self.assertEqual([place.id for place in places], keys)
+        status, headers, page = self.request("GET", "/places?limit=1")
+        self.assertEqual(304, self.request(
+            "GET", "/places?limit=1",
+            headers={"If-None-Match": headers["ETag"]})[0])
+        for place in places:
+            storage.delete(place)
+
+    def test_errors(self):
+        """Test the answers to invalid requests."""
+        for method, path, body, status in [
+                ("GET", "/nothing", None, 404),
+                ("GET", "/places/x/y", None, 404),
+                ("POST", "/status", None, 405),
+                ("POST", "/places", [1], 400),
+                ("POST", "/places", {"max_guest": "many"}, 400),
+                ("GET", "/places?limit=0", None, 400),
+                ("GET", "/places?limit=x", None, 400),
+                ("GET", "/places?where=max_guest<many", None, 400),
+                ("GET", "/places?after=missing", None, 400)]:
+            self.assertEqual(status,
+                             self.request(method, path, body)[0], path)
+        self.connection.request("POST", "/api/v1/places", "{", {})
+        response = self.connection.getresponse()
+        self.assertEqual((400, {"error": "Not a JSON"}),
+                         (response.status, json.loads(response.read())))
+
+    def test_fixed_names(self):
+        """Test that methods, properties and private names are refused."""
+        place = Place()
+        path = f"/places/{place.id}"
+        count = storage.count("Place")
+        for name in ["save", "to_dict", "_record", "amenity_mask"]:
+            self.assertEqual(400, self.request("PUT", path, {name: 1})[0])
+            self.assertEqual(400, self.request(
+                "POST", "/places", {"name": "Half", name: 1})[0])
+        self.assertEqual(count, storage.count("Place"))
+        self.assertEqual(200, self.request("GET", "/places")[0])
+        self.assertNotIn("save", place.__dict__)
+        self.assertEqual("", place.name)
+        storage.delete(place)
+
+    def test_internal_error(self):
+        """Test that an unexpected exception is answered 500."""
+        with patch.object(storage, "count", side_effect=RuntimeError):
+            self.assertEqual(
+                (500, {"error": "Internal server error"}),
+                self.request("GET", "/stats")[::2])
+        self.assertEqual(200, self.request("GET", "/stats")[0])
+
+    def test_saves_deferred(self):
+        """Test that changes are written by commits, not per request."""
+        with patch.object(storage, "_FileStorage__write") as write:
+            self.request("POST", "/amenities", {"name": "Wifi"})
+            write.assert_not_called()
+            self.assertTrue(storage.commit())
+            write.assert_called_once()
+
+    def test_keep_alive(self):
+        """Test that requests share one connection."""
+        self.request("GET", "/status")
+        sock = self.connection.sock
+        self.request("GET", "/stats")
+        self.assertIs(sock, self.connection.sock)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,12 +2,18 @@
 """
 Defines unittests for console.py.
 """
+import json
 import os
 import sys
+import tempfile
 import unittest
 from models import storage
 from models.engine.file_storage import FileStorage
-from console import HBNBCommand
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from console import ClassTable, HBNBCommand, main, split_args
 from io import StringIO
 from unittest.mock import patch
 
@@ -44,7 +50,10 @@ class TestHBNBCommandHelp(unittest.TestCase):
         h = (
             "Documented commands (type help <topic>):\n"
             "========================================\n"
-            "EOF  all  count  create  destroy  help  quit  show  update"
+            "EOF        all      count   destroy        export  import  show"
+            "   update      \n"
+            "aggregate  changes  create  destroy_where  help    quit    stats"
+            "  update_where"
         )
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
@@ -74,6 +83,62 @@ class TestHBNBCommandExit(unittest.TestCase):
             self.assertTrue(HBNBCommand().onecmd("EOF"))
 
 
+class TestClassTable(unittest.TestCase):
+    """Unittests for the lazy class table of the console."""
+
+    def test_lookup(self):
+        """Test that names map to the model classes."""
+        table = ClassTable()
+        self.assertIs(Place, table["Place"])
+        self.assertIn("Review", table)
+        self.assertNotIn("MyModel", table)
+        self.assertEqual(7, len(table))
+        self.assertEqual(set(storage.classes()), set(table))
+        with self.assertRaises(KeyError):
+            table["MyModel"]
+
+
+class TestCommandParser(unittest.TestCase):
+    """Unittests for the command tokenizer and the dot notation."""
+
+    def test_split_args(self):
+        """Test that words split like shlex.split() with commas stripped."""
+        self.assertEqual(("Place", "1234", "name", "My place"),
+                         split_args('Place "1234", name, "My place"'))
+        self.assertEqual(("city_id=c-1", "x y", ""),
+                         split_args("city_id=\"c-1\" 'x y' \"\""))
+        self.assertEqual(('a"b',), split_args('a\\"b'))
+        self.assertIs(split_args("User 1"), split_args("User 1"))
+        with self.assertRaises(ValueError):
+            split_args('name "open')
+
+    def test_args_parser(self):
+        """Test that a dictionary or list literal stays one word."""
+        self.assertEqual(
+            ["Place", "1", '{"amenity_ids": ["a"], "n": {"x": 1}}'],
+            HBNBCommand.args_parser(
+                'Place "1", {"amenity_ids": ["a"], "n": {"x": 1}}'))
+        self.assertEqual(["Place", "1", "amenity_ids", '["a", "b"]'],
+                         HBNBCommand.args_parser(
+                             'Place 1 amenity_ids ["a", "b"]'))
+
+    def test_no_code_execution(self):
+        """Test that values are read as literals, never evaluated."""
+        place = Place()
+        for command in [
+                f'update Place {place.id} {{"name": print("run")}}',
+                f"update Place {place.id} __import__('os')"]:
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(command))
+            self.assertEqual("** value missing **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("create print('run')"))
+        self.assertEqual("** class doesn't exist **",
+                         output.getvalue().strip())
+        storage.delete(place)
+
+
 class TestHBNBCommandCreate(unittest.TestCase):
     """
     Unittests for testing 'create' command in the HBNB command interpreter.
@@ -480,6 +545,70 @@ class TestHBNBCommandAll(unittest.TestCase):
                         self.assertNotIn(other_cls, output_value)
 
 
+class TestHBNBCommandAllPages(unittest.TestCase):
+    """Unittests for the paginated and JSON lines output of 'all'."""
+
+    def setUp(self):
+        """Stores three states."""
+        self.states = [State() for i in range(3)]
+        self.keys = [key for key, obj in storage.scan("State")]
+
+    def tearDown(self):
+        """Removes the states."""
+        for state in self.states:
+            storage.delete(state)
+
+    def run_all(self, arg):
+        """Returns the output lines of 'all <arg>'."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(f"all {arg}"))
+        return output.getvalue().splitlines()
+
+    def test_repr_format(self):
+        """Test that the streamed output is the list of the strings."""
+        self.assertEqual([str([str(storage.all()[key])
+                               for key in self.keys])],
+                         self.run_all("State"))
+        items = list(storage.scan())
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand.write_all(iter(items), None, "repr", 2)
+        self.assertEqual(str([str(obj) for key, obj in items]),
+                         output.getvalue().strip())
+
+    def test_pages(self):
+        """Test --limit, --offset and the cursor of the next page."""
+        lines = self.run_all("State --limit 1 --offset=1")
+        self.assertEqual([str([str(storage.all()[self.keys[1]])]),
+                          f"cursor: {self.keys[1]}"], lines)
+        lines = self.run_all(
+            f"State --cursor={self.keys[1]} --limit {len(self.keys)}")
+        self.assertEqual(len(self.keys) - 2, len(eval(lines[0])))
+        self.assertEqual(1, len(lines))
+
+    def test_jsonl_format(self):
+        """Test JSON lines output, ending with the next cursor."""
+        lines = self.run_all("State --format jsonl --limit 2")
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(storage.all()[self.keys[0]].to_dict(), records[0])
+        self.assertEqual({"__cursor__": self.keys[1]}, records[2])
+
+    def test_errors(self):
+        """Test invalid options and cursors."""
+        self.assertEqual(["** invalid limit **"],
+                         self.run_all("State --limit=many"))
+        self.assertEqual(["** invalid limit **"],
+                         self.run_all("State --limit=\u00b2"))
+        self.assertEqual(["** invalid offset **"],
+                         self.run_all("State --offset=\u00b2"))
+        self.assertEqual(["** unknown option --sort **"],
+                         self.run_all("State --sort id"))
+        self.assertEqual(["** unknown format xml **"],
+                         self.run_all("--format xml"))
+        self.assertEqual(["** cursor not found **"],
+                         self.run_all("State --cursor State.missing"))
+        self.assertEqual(["[]"], self.run_all("State --offset 1000000"))
+
+
 class TestHBNBCommandUpdate(unittest.TestCase):
     """
     Unittests for testing 'update' command of the HBNB command interpreter.
@@ -639,6 +768,68 @@ class TestHBNBCommandUpdate(unittest.TestCase):
             obj = storage.all()[f"Place.{obj_id}"]
             self.assertEqual(obj.__dict__[attr], value)
 
+    def test_update_coerced_attr(self):
+        """Test that 'update' converts values with the class schema."""
+        obj_id = self._create_object("Place")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                f"update Place {obj_id} max_guest many"))
+            self.assertEqual("** 'many' is not int **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                f"update Place {obj_id} amenity_ids [[1]]"))
+            self.assertEqual("** [[1]] is not a list of str **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()):
+            self.assertFalse(HBNBCommand().onecmd(
+                f"update Place {obj_id} amenity_ids ['a1']"))
+            self.assertFalse(HBNBCommand().onecmd(
+                f'Place.update({obj_id}, {{"number_rooms": "3"}})'))
+        obj = storage.all()[f"Place.{obj_id}"]
+        self.assertEqual(0, obj.max_guest)
+        self.assertEqual(["a1"], obj.amenity_ids)
+        self.assertEqual(3, obj.number_rooms)
+
+    def test_update_fixed_attr(self):
+        """Test that 'update' refuses id, dunder, method and property names."""
+        obj_id = self._create_object("Place")
+        for command, name in [
+                (f'update Place {obj_id} id "x"', "id"),
+                ('update_where Place max_guest=0 {"id": "x"}', "id"),
+                (f"update Place {obj_id} amenity_mask 5", "amenity_mask"),
+                (f'update Place {obj_id} __class__ "x"', "__class__"),
+                (f"update Place {obj_id} save 1", "save"),
+                (f"update Place {obj_id} _record 1", "_record"),
+                (f'Place.update({obj_id}, {{"to_dict": 1}})', "to_dict"),
+                ('update_where Place max_guest=0 {"amenity_mask": 1}',
+                 "amenity_mask")]:
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(command))
+            self.assertEqual(f"** can't set {name} **",
+                             output.getvalue().strip())
+        obj = storage.all()[f"Place.{obj_id}"]
+        self.assertIs(Place, obj.__class__)
+        self.assertNotIn("save", obj.__dict__)
+        self.assertNotIn("to_dict", obj.__dict__)
+        self.assertEqual(obj_id, obj.id)
+
+    def test_update_timestamp(self):
+        """Test that 'update' refuses timestamps that are not ISO-8601."""
+        obj_id = self._create_object("Place")
+        obj = storage.all()[f"Place.{obj_id}"]
+        created_at = obj.created_at
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                f"update Place {obj_id} created_at 5"))
+        self.assertEqual("** '5' is not an ISO-8601 datetime **",
+                         output.getvalue().strip())
+        self.assertEqual(created_at, obj.created_at)
+        with patch("sys.stdout", new=StringIO()):
+            self.assertFalse(HBNBCommand().onecmd(
+                f"update Place {obj_id} created_at 2001-02-03T04:05:06"))
+        self.assertEqual("2001-02-03T04:05:06", obj.to_dict()["created_at"])
+
     def test_update_valid_dict_attr(self):
         """Test 'update' with a valid dictionary of attributes."""
         obj_id = self._create_object("BaseModel")
@@ -707,5 +898,542 @@ class TestHBNBCommandCount(unittest.TestCase):
             self.assertEqual("5", count_output)
 
 
+class TestHBNBCommandWhere(unittest.TestCase):
+    """Unittests for the where-clauses of 'all' and 'count'."""
+
+    def setUp(self):
+        """Stores two places of one city."""
+        self.places = [Place(), Place()]
+        for price, place in zip((40, 140), self.places):
+            place.city_id = "c-where"
+            place.price_by_night = price
+        self.places[0].name = "Cosy, quiet"
+
+    def tearDown(self):
+        """Removes the places."""
+        for place in self.places:
+            storage.delete(place)
+
+    def run_command(self, command):
+        """Returns the output of a command."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(command))
+        return output.getvalue().strip()
+
+    def test_count(self):
+        """Test 'count' with where-clauses in space and dot notation."""
+        self.assertEqual("2", self.run_command("count Place city_id=c-where"))
+        self.assertEqual("1", self.run_command(
+            'Place.count(city_id="c-where", price_by_night < 100)'))
+        self.assertEqual("1", self.run_command(
+            'Place.count(name="Cosy, quiet")'))
+
+    def test_all(self):
+        """Test 'all' with where-clauses and options."""
+        output = self.run_command(
+            "Place.all(city_id=c-where, price_by_night>=100, --format jsonl)")
+        self.assertEqual(self.places[1].id, json.loads(output)["id"])
+        output = self.run_command("all Place city_id=c-where --limit 1")
+        self.assertIn(self.places[0].id, output)
+        self.assertNotIn(self.places[1].id, output.splitlines()[0])
+
+    def test_invalid_clauses(self):
+        """Test the errors of malformed where-clauses."""
+        self.assertEqual("** invalid where clause price **",
+                         self.run_command("count Place price"))
+        self.assertEqual("** invalid value cheap for price_by_night **",
+                         self.run_command(
+                             "all Place price_by_night<cheap"))
+
+    def test_all_order(self):
+        """Test 'all' ordered by an attribute."""
+        output = self.run_command(
+            "all Place city_id=c-where --order=-price_by_night "
+            "--format=jsonl")
+        self.assertEqual([place.id for place in self.places[::-1]],
+                         [json.loads(line)["id"]
+                          for line in output.splitlines()])
+        output = self.run_command(
+            "Place.all(city_id=c-where, --order price_by_night, --limit 1)")
+        self.assertIn(self.places[0].id, output.splitlines()[0])
+        self.assertEqual(f"cursor: Place.{self.places[0].id}",
+                         output.splitlines()[1])
+        self.assertEqual("** class name missing **",
+                         self.run_command("all --order=name"))
+        self.places[0].name = 7
+        self.assertEqual("** can't order by name **", self.run_command(
+            "all Place city_id=c-where --order=name"))
+
+    def test_stats(self):
+        """Test that 'stats' shows the hits of the result cache."""
+        self.run_command("count Place price_by_night<100")
+        hits = storage.results().hits
+        self.run_command("count Place price_by_night<100")
+        self.assertIn(f"cache.hits {hits + 1}",
+                      self.run_command("stats").splitlines())
+
+    def test_stats_metrics(self):
+        """Test 'stats' with metrics switched on, exported and reset."""
+        self.assertIn("metrics off", self.run_command("stats"))
+        self.run_command("stats on")
+        try:
+            self.run_command("Place.count(city_id=c-where)")
+            self.run_command("nonsense")
+            lines = self.run_command("stats").splitlines()
+            self.assertIn("metrics on", lines)
+            self.assertIn(f"objects.Place {len(storage.objects('Place'))}",
+                          lines)
+            self.assertIn("console_command_seconds{command=count}.count 1",
+                          lines)
+            self.assertIn("console_command_seconds{command=unknown}.count 1",
+                          lines)
+            self.assertEqual("", self.run_command("stats export m.prom"))
+            with open("m.prom", encoding="utf-8") as file:
+                self.assertIn('hbnb_console_command_seconds_count'
+                              '{command="count"} 1', file.read())
+            self.assertEqual("** file missing **",
+                             self.run_command("stats export"))
+            self.assertEqual("** stats option doesn't exist **",
+                             self.run_command("stats loud"))
+            self.run_command("stats reset")
+            self.assertNotIn("command=count", self.run_command("stats"))
+        finally:
+            self.run_command("stats off")
+            self.run_command("stats reset")
+            os.remove("m.prom")
+
+
+class TestHBNBCommandBulkChanges(unittest.TestCase):
+    """Unittests for 'create <n>', 'update_where' and 'destroy_where'."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def run_command(self, command):
+        """Returns the output of a command."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(command))
+        return output.getvalue().strip()
+
+    def test_create_many(self):
+        """Test that 'create <class> <n>' saves n instances once."""
+        with patch.object(FileStorage, "save") as save:
+            ids = self.run_command("create Review 3").splitlines()
+        save.assert_called_once_with()
+        self.assertEqual(3, len(set(ids)))
+        for review_id in ids:
+            storage.delete(storage.all()[f"Review.{review_id}"])
+        for count in ("many", "\u00b2", "0", "-1"):
+            self.assertEqual("** invalid count **",
+                             self.run_command(f"create Review {count}"))
+
+    def test_update_where(self):
+        """Test that 'update_where' updates the matches and saves once."""
+        places = [Place(), Place(), Place()]
+        for i, place in enumerate(places):
+            place.city_id = "c-bulk" if i < 2 else "c-other"
+        with patch.object(FileStorage, "save") as save:
+            self.assertEqual("2", self.run_command(
+                'Place.update_where(city_id="c-bulk", '
+                '{"price_by_night": "90", "name": "Bulk"})'))
+        save.assert_called_once_with()
+        self.assertEqual([90, 90, 0],
+                         [place.price_by_night for place in places])
+        self.assertEqual("Bulk", places[1].name)
+        self.assertEqual(places[0].updated_at, places[1].updated_at)
+        places[0].price_by_night = 0
+        self.assertEqual("1", self.run_command(
+            'update_where Place city_id=c-bulk, price_by_night>0 '
+            '{"city_id": "c-moved"}'))
+        self.assertEqual(1, len(storage.lookup("Place", "city_id",
+                                               "c-moved")))
+        for place in places:
+            storage.delete(place)
+
+    def test_destroy_where(self):
+        """Test that 'destroy_where' deletes the matches and saves once."""
+        reviews = [Review(), Review()]
+        for review in reviews:
+            review.place_id = "p-bulk"
+        with patch.object(FileStorage, "save") as save:
+            self.assertEqual("2", self.run_command(
+                'Review.destroy_where(place_id="p-bulk")'))
+        save.assert_called_once_with()
+        self.assertEqual({}, storage.lookup("Review", "place_id", "p-bulk"))
+
+    def test_errors(self):
+        """Test the errors of the bulk commands."""
+        for command, error in [
+                ("update_where", "** class name missing **"),
+                ("update_where MyModel", "** class doesn't exist **"),
+                ("update_where Place city_id=c1", "** dictionary missing **"),
+                ('update_where Place {"name": "x"}',
+                 "** where clause missing **"),
+                ('update_where Place max_guest=1 {"max_guest": "many"}',
+                 "** 'many' is not int **"),
+                ("destroy_where Review", "** where clause missing **"),
+                ("destroy_where Review place_id",
+                 "** invalid where clause place_id **")]:
+            self.assertEqual(error, self.run_command(command))
+
+
+class TestHBNBCommandAggregate(unittest.TestCase):
+    """
+    Unittests for testing 'aggregate' command of the HBNB command interpreter.
+    """
+
+    def test_aggregate_missing_class(self):
+        """Test 'aggregate' with no class name."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("aggregate"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
+    def test_aggregate_invalid_class(self):
+        """Test 'aggregate' with an invalid class name."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("aggregate MyModel"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+
+    def test_aggregate_invalid_workers(self):
+        """Test 'aggregate' with a worker count that is not a number."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "aggregate Place count workers=\u00b2"))
+            self.assertEqual("** invalid workers **",
+                             output.getvalue().strip())
+
+    def test_aggregate_where(self):
+        """Test 'aggregate' in space and dot notation."""
+        place = Place()
+        place.city_id = "c-console"
+        place.price_by_night = 40
+        expected = "{None: {'count': 1, 'avg_price_by_night': 40.0}}"
+        for cmd in [
+                "aggregate Place count avg=price_by_night city_id=c-console",
+                'Place.aggregate(count, avg=price_by_night, '
+                'city_id="c-console")']:
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(cmd))
+                self.assertEqual(expected, output.getvalue().strip())
+        storage.delete(place)
+
+    def test_aggregate_typed_where(self):
+        """Test that where values are converted like 'count' does."""
+        place = Place()
+        place.city_id = "c-typed"
+        place.max_guest = 3
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "aggregate Place count city_id=c-typed max_guest=3"))
+            self.assertFalse(HBNBCommand().onecmd(
+                "aggregate Place count max_guest=many"))
+        self.assertEqual(["{None: {'count': 1}}", "** 'many' is not int **"],
+                         output.getvalue().splitlines())
+        storage.delete(place)
+
+    def test_aggregate_group_by_list(self):
+        """Test grouping by a list attribute, and its errors."""
+        place = Place()
+        place.city_id = "c-listed"
+        place.amenity_ids = ["a1", "a2"]
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "aggregate Place count city_id=c-listed "
+                "group_by=amenity_ids"))
+            place.tags = {"a1": 1}
+            self.assertFalse(HBNBCommand().onecmd(
+                "aggregate Place count city_id=c-listed group_by=tags"))
+        self.assertEqual(["{('a1', 'a2'): {'count': 1}}",
+                          "** can't group by tags **"],
+                         output.getvalue().splitlines())
+        storage.delete(place)
+
+
+class TestHBNBCommandChanges(unittest.TestCase):
+    """
+    Unittests for testing 'changes' command of the HBNB command interpreter.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_changes_missing_date(self):
+        """Test 'changes' without a date."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("changes"))
+            self.assertEqual("** date missing **", output.getvalue().strip())
+
+    def test_changes_invalid_date(self):
+        """Test 'changes' with a malformed date."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("changes yesterday"))
+            self.assertEqual("** invalid date **", output.getvalue().strip())
+
+    def test_changes_after_update(self):
+        """Test that updated instances are exported."""
+        place = Place()
+        since = place.updated_at
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd(f"update Place {place.id} name 'Nest'")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(
+                HBNBCommand().onecmd(f"changes {since.isoformat()}"))
+            lines = output.getvalue().splitlines()
+        self.assertEqual(1, len(lines))
+        self.assertIn('"name": "Nest"', lines[0])
+        storage.delete(place)
+
+    def test_changes_since_seq(self):
+        """Test 'changes <seq>' on the stream opened by --changes."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "file.json.changes")
+            try:
+                with patch("sys.stdout", new=StringIO()) as output, \
+                        patch("sys.stderr", new=StringIO()):
+                    self.assertEqual(0, main([
+                        "--changes", path, "-c", "create Amenity",
+                        "-c", "changes 0"]))
+                amenity_id, change = output.getvalue().splitlines()[:2]
+                self.assertEqual(amenity_id, json.loads(change)["id"])
+            finally:
+                storage.changes().close()
+                storage.delete(storage.all()[f"Amenity.{amenity_id}"])
+
+
+class TestHBNBCommandImportExport(unittest.TestCase):
+    """
+    Unittests for testing 'import' and 'export' commands of the HBNB
+    command interpreter.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        for path in ("file.json", "places.jsonl", "places.csv"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_import_missing_class(self):
+        """Test 'import' without a class name."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("import"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
+    def test_import_invalid_class(self):
+        """Test 'import' with an unknown class name."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("import MyModel a.csv"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+
+    def test_import_invalid_batch(self):
+        """Test 'import' with a batch size that is not a number."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "import Place places.jsonl batch=\u00b2"))
+            self.assertEqual("** invalid batch **",
+                             output.getvalue().strip())
+
+    def test_export_missing_file(self):
+        """Test 'export' without a file."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("export Place"))
+            self.assertEqual("** file missing **", output.getvalue().strip())
+
+    def test_import_jsonl(self):
+        """Test that JSON lines rows are imported and bad rows reported."""
+        with open("places.jsonl", "w", encoding="utf-8") as file:
+            file.write('{"id": "bulk-1", "price_by_night": "120"}\n')
+            file.write('{"id": "bulk-2", "max_guest": "many"}\n')
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("import Place places.jsonl"))
+            lines = output.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].startswith("** line 2: "))
+        self.assertTrue(lines[1].startswith("1 imported, 1 rejected"))
+        place = storage.all()["Place.bulk-1"]
+        self.assertEqual(120, place.price_by_night)
+        storage.delete(place)
+
+    def test_export_import_csv(self):
+        """Test that exported CSV rows import back."""
+        place = Place()
+        place.amenity_ids = ["a1", "a2"]
+        place.latitude = 2.5
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("export Place places.csv"))
+            self.assertEqual(str(len(storage.objects("Place"))),
+                             output.getvalue().strip())
+        storage.delete(place)
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("import Place places.csv batch=1")
+            self.assertIn("0 rejected", output.getvalue())
+        restored = storage.all()[f"Place.{place.id}"]
+        self.assertEqual(place.to_dict(), restored.to_dict())
+        storage.delete(restored)
+
+
+class TestHBNBCommandBatch(unittest.TestCase):
+    """
+    Unittests for testing the batch mode of the HBNB command interpreter.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        for path in ("file.json", "script.hbnb"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        """Starts every test without a storage file."""
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+
+    def test_single_commit(self):
+        """Test that a script saves storage once, at the end."""
+        lines = ["# a comment", "", "create State", "create City",
+                 "count State"]
+        with patch("sys.stdout", new=StringIO()) as output:
+            summary = HBNBCommand().run_batch(lines)
+            ids = output.getvalue().splitlines()[:2]
+        self.assertEqual(3, summary["commands"])
+        self.assertEqual(0, summary["errors"])
+        self.assertEqual(1, summary["commits"])
+        with open("file.json", encoding="utf-8") as file:
+            saved = file.read()
+        self.assertIn(ids[0], saved)
+        self.assertIn(ids[1], saved)
+        storage.delete(storage.all()[f"State.{ids[0]}"])
+        storage.delete(storage.all()[f"City.{ids[1]}"])
+
+    def test_commit_every(self):
+        """Test that a script commits every N commands."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            summary = HBNBCommand().run_batch(["create State"] * 4 +
+                                              ["count State"], 2)
+        self.assertEqual(2, summary["commits"])
+        for model_id in output.getvalue().splitlines()[:4]:
+            storage.delete(storage.all()[f"State.{model_id}"])
+
+    def test_stop_on_error(self):
+        """Test that a script stops at the first error by default."""
+        lines = ["show User missing", "create User"]
+        with patch("sys.stdout", new=StringIO()) as output:
+            summary = HBNBCommand().run_batch(lines)
+            self.assertEqual("** no instance found **",
+                             output.getvalue().strip())
+        self.assertEqual(1, summary["commands"])
+        self.assertEqual(1, summary["errors"])
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_keep_going(self):
+        """Test that a script goes on after errors when asked to."""
+        lines = ["show User missing", "update 'unbalanced", "count User"]
+        with patch("sys.stdout", new=StringIO()):
+            summary = HBNBCommand().run_batch(lines, keep_going=True)
+        self.assertEqual(3, summary["commands"])
+        self.assertEqual(2, summary["errors"])
+
+    def test_quit_stops(self):
+        """Test that quit ends a script."""
+        with patch("sys.stdout", new=StringIO()):
+            summary = HBNBCommand().run_batch(["quit", "count User"])
+        self.assertEqual(1, summary["commands"])
+
+    def test_saves_not_deferred_after_batch(self):
+        """Test that saves are immediate again after a script."""
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().run_batch(["count User"])
+        user = User()
+        user.save()
+        self.assertTrue(os.path.exists("file.json"))
+        storage.delete(user)
+
+    def test_main_batch_file(self):
+        """Test the --batch command line option."""
+        with open("script.hbnb", "w", encoding="utf-8") as file:
+            file.write("count Review\n")
+        with patch("sys.stdout", new=StringIO()) as output, \
+                patch("sys.stderr", new=StringIO()) as errors:
+            self.assertEqual(0, main(["--batch", "script.hbnb"]))
+            self.assertTrue(output.getvalue().strip().isdigit())
+            self.assertIn("1 commands, 0 errors", errors.getvalue())
+
+    def test_main_commands(self):
+        """Test the -c command line option."""
+        with patch("sys.stdout", new=StringIO()), \
+                patch("sys.stderr", new=StringIO()):
+            self.assertEqual(1, main(["-c", "count Review",
+                                      "-c", "count MyModel"]))
+
+
 if __name__ == "__main__":
     unittest.main()
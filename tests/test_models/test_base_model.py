@@ -85,10 +85,24 @@ class TestBaseModelInstantiation(unittest.TestCase):
         self.assertEqual(base_model.created_at, dt)
         self.assertEqual(base_model.updated_at, dt)
 
-    def test_id_is_uuid4(self):
-        """Test that the id follows uuid4 format."""
+    def test_id_is_uuid7(self):
+        """Test that the id follows the time-ordered uuid7 format."""
         base_model = BaseModel()
         uuid_obj = uuid.UUID(base_model.id)
+        self.assertEqual(uuid_obj.version, 7)
+
+    def test_ids_sort_by_creation(self):
+        """Test that ids made one after the other sort in order."""
+        ids = [BaseModel().id for i in range(100)]
+        self.assertEqual(sorted(ids), ids)
+
+    def test_id_is_uuid4_with_uuid4_generator(self):
+        """Test that the id generator can be switched back to uuid4."""
+        models.base_model.set_id_generator(models.base_model.uuid4_id)
+        try:
+            uuid_obj = uuid.UUID(BaseModel().id)
+        finally:
+            models.base_model.set_id_generator(models.base_model.uuid7_id)
         self.assertEqual(uuid_obj.version, 4)
 
     def test_invalid_datetime_in_kwargs(self):
@@ -254,5 +268,80 @@ class TestBaseModelToDict(unittest.TestCase):
         self.assertEqual(model_dict["age"], 52)
 
 
+class TestBaseModelTimestamps(unittest.TestCase):
+    """Unittests for testing the compact storage of the timestamps."""
+
+    def test_stored_as_microseconds(self):
+        """Test that naive datetimes are kept as epoch microseconds."""
+        dt = datetime(2024, 5, 6, 7, 8, 9, 123456)
+        base_model = BaseModel()
+        base_model.created_at = dt
+        self.assertEqual(int, type(base_model.__dict__["created_at"]))
+        self.assertEqual(dt, base_model.created_at)
+        self.assertEqual(dt.isoformat(), base_model.to_dict()["created_at"])
+
+    def test_before_epoch(self):
+        """Test that timestamps before 1970 round-trip."""
+        dt = datetime(1901, 2, 3, 4, 5, 6, 7)
+        base_model = BaseModel()
+        base_model.updated_at = dt
+        self.assertEqual(dt, base_model.updated_at)
+
+    def test_str_shows_datetimes(self):
+        """Test that __str__ shows datetimes, not microseconds."""
+        base_model = BaseModel()
+        self.assertIn(repr(base_model.created_at), str(base_model))
+
+
+class TestBaseModelFromRecord(unittest.TestCase):
+    """Unittests for testing the from_record/from_records constructors."""
+
+    def test_from_record_matches_kwargs(self):
+        """Test that from_record builds the same object as kwargs."""
+        base_model = BaseModel()
+        base_model.name = "Jhon"
+        record = base_model.to_dict()
+        rebuilt = BaseModel.from_record(record)
+        self.assertEqual(BaseModel, type(rebuilt))
+        self.assertEqual(BaseModel(**record).to_dict(), rebuilt.to_dict())
+        self.assertEqual(base_model.created_at, rebuilt.created_at)
+        self.assertNotIn("__class__", rebuilt.__dict__)
+
+    def test_from_record_not_stored(self):
+        """Test that from_record does not register the object."""
+        record = BaseModel().to_dict()
+        record["id"] = "from-record"
+        BaseModel.from_record(record)
+        self.assertNotIn("BaseModel.from-record", models.storage.all())
+
+    def test_from_record_invalid_datetime(self):
+        """Test that malformed timestamps decode to datetime.now()."""
+        record = {"id": "1", "created_at": "nope", "updated_at": "nope"}
+        rebuilt = BaseModel.from_record(record)
+        self.assertIsInstance(rebuilt.created_at, datetime)
+
+    def test_from_record_decodes_lazily(self):
+        """Test that timestamps stay ISO strings until first read."""
+        record = BaseModel().to_dict()
+        rebuilt = BaseModel.from_record(record)
+        self.assertEqual(record["created_at"], rebuilt.__dict__["created_at"])
+        self.assertEqual(record, rebuilt.to_dict())
+        self.assertIsInstance(rebuilt.created_at, datetime)
+        self.assertEqual(int, type(rebuilt.__dict__["created_at"]))
+        self.assertEqual(record, rebuilt.to_dict())
+
+    def test_from_record_none_datetime(self):
+        """Test that non string timestamps raise TypeError."""
+        with self.assertRaises(TypeError):
+            BaseModel.from_record({"id": "1", "created_at": None})
+
+    def test_from_records(self):
+        """Test building several objects at once."""
+        records = [BaseModel().to_dict() for i in range(3)]
+        rebuilt = BaseModel.from_records(records)
+        self.assertEqual([r["id"] for r in records],
+                         [obj.id for obj in rebuilt])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""
+Unit tests for the compact (__slots__ based) model classes.
+"""
+
+import os
+import pickle
+import unittest
+from datetime import datetime
+from io import StringIO
+from unittest.mock import patch
+import models
+from models.compact import compact
+from models.place import Place
+from models.user import User
+from console import HBNBCommand
+
+
+class TestCompactClass(unittest.TestCase):
+    """Unittests for the classes built by compact()."""
+
+    def setUp(self):
+        """Builds a compact Place from its stored form."""
+        dt = datetime.today().isoformat()
+        self.data = {"id": "c-1", "created_at": dt, "updated_at": dt,
+                     "__class__": "Place", "city_id": "c", "max_guest": 3}
+        self.place = compact(Place)(**self.data)
+
+    def test_cached(self):
+        """Test that compact() builds each class once."""
+        self.assertIs(compact(Place), compact(Place))
+        self.assertIsNot(compact(Place), compact(User))
+
+    def test_no_instance_dict(self):
+        """Test that instances have no real __dict__."""
+        self.assertIn("city_id", compact(Place).__slots__)
+        self.assertEqual(0, type(self.place).__dictoffset__)
+
+    def test_looks_like_model(self):
+        """Test that the instance reports its model class."""
+        self.assertIsInstance(self.place, Place)
+        self.assertEqual("Place", self.place.__class__.__name__)
+
+    def test_defaults(self):
+        """Test that unset schema attributes fall back to class defaults."""
+        self.assertEqual("", self.place.name)
+        self.assertEqual([], self.place.amenity_ids)
+        with self.assertRaises(AttributeError):
+            self.place.nothing
+
+    def test_same_as_regular(self):
+        """Test that to_dict and __str__ match a regular instance."""
+        regular = Place(**self.data)
+        self.assertEqual(regular.to_dict(), self.place.to_dict())
+        self.assertEqual(str(regular), str(self.place))
+
+    def test_dict_view(self):
+        """Test that __dict__ holds set attributes and writes through."""
+        self.assertIn("city_id", self.place.__dict__)
+        self.assertNotIn("name", self.place.__dict__)
+        self.place.__dict__["name"] = "Home"
+        self.place.nickname = "Nest"
+        self.assertEqual("Home", self.place.name)
+        self.assertEqual("Nest", self.place.__dict__["nickname"])
+        self.assertIn("nickname", self.place.to_dict())
+
+    def test_from_record(self):
+        """Test that from_record builds compact instances."""
+        place = compact(Place).from_record(self.data)
+        self.assertIs(compact(Place), type(place))
+        self.assertEqual(self.place.to_dict(), place.to_dict())
+
+    def test_pickle(self):
+        """Test that instances pickle as compact instances."""
+        self.place.nickname = "Nest"
+        copy = pickle.loads(pickle.dumps(self.place))
+        self.assertIs(type(self.place), type(copy))
+        self.assertEqual(self.place.to_dict(), copy.to_dict())
+
+
+class TestStorageCompact(unittest.TestCase):
+    """Unittests for the storage compact mode."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        models.storage.use_compact(False)
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_use_compact(self):
+        """Test converting, reloading and updating compact objects."""
+        place = Place()
+        key = f"Place.{place.id}"
+        models.storage.save()
+        models.storage.use_compact()
+        self.assertIs(compact(Place), type(models.storage.all()[key]))
+        models.storage.reload()
+        self.assertIs(compact(Place), type(models.storage.all()[key]))
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd(f"update Place {place.id} max_guest 4")
+        self.assertEqual(4, models.storage.all()[key].max_guest)
+        models.storage.use_compact(False)
+        self.assertIs(Place, type(models.storage.all()[key]))
+
+
+if __name__ == "__main__":
+    unittest.main()
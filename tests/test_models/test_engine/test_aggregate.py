@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+'''
+Unit tests for the aggregate module and FileStorage.aggregate().
+'''
+
+import unittest
+from models import storage
+from models.place import Place
+from models.engine.aggregate import aggregate
+
+
+class TestAggregate(unittest.TestCase):
+    """Tests for the aggregate() function."""
+
+    def setUp(self):
+        """Builds six unstored places over two cities."""
+        self.places = []
+        for i in range(6):
+            self.places.append(Place(city_id=f"c{i % 2}",
+                                     price_by_night=10 * i))
+
+    def test_single_group(self):
+        """Test aggregation without group_by."""
+        result = aggregate(self.places, count=True, sum="price_by_night",
+                           min="price_by_night", max="price_by_night")
+        self.assertEqual({None: {"count": 6, "sum_price_by_night": 150,
+                                 "min_price_by_night": 0,
+                                 "max_price_by_night": 50}}, result)
+
+    def test_group_by(self):
+        """Test aggregation grouped by city."""
+        result = aggregate(self.places, "city_id", avg="price_by_night")
+        self.assertEqual({"c0": {"avg_price_by_night": 20.0},
+                          "c1": {"avg_price_by_night": 30.0}}, result)
+
+    def test_group_by_list(self):
+        """Test that lists group as tuples and other unhashables fail."""
+        for place in self.places:
+            place.amenity_ids = ["a1"] if place.city_id == "c0" else []
+        self.assertEqual({("a1",): {"count": 3}, (): {"count": 3}},
+                         aggregate(self.places, "amenity_ids", True))
+        self.places[0].amenity_ids = [["a1"]]
+        with self.assertRaises(ValueError):
+            aggregate(self.places, "amenity_ids", True)
+
+    def test_non_numeric_values_skipped(self):
+        """Test that non numeric values are left out of sums."""
+        self.places[0].price_by_night = "free"
+        result = aggregate(self.places, avg="price_by_night")
+        self.assertEqual(30.0, result[None]["avg_price_by_night"])
+
+    def test_empty(self):
+        """Test aggregation of no objects."""
+        self.assertEqual({}, aggregate([], count=True))
+
+    def test_workers(self):
+        """Test that forked workers give the serial result."""
+        serial = aggregate(self.places, "city_id", True, sum="price_by_night")
+        parallel = aggregate(self.places, "city_id", True, workers=2,
+                             sum="price_by_night")
+        self.assertEqual(serial, parallel)
+
+
+class TestStorageAggregate(unittest.TestCase):
+    """Tests for FileStorage.aggregate()."""
+
+    def test_where_foreign_key(self):
+        """Test aggregation narrowed to one foreign key value."""
+        places = [Place() for i in range(3)]
+        for i, place in enumerate(places):
+            place.city_id = "c-aggregate"
+            place.price_by_night = i
+        result = storage.aggregate("Place", where={"city_id": "c-aggregate"},
+                                   count=True, sum="price_by_night")
+        self.assertEqual({None: {"count": 3, "sum_price_by_night": 3}},
+                         result)
+        for place in places:
+            storage.delete(place)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+'''
+Unit tests for the AmenityIndex class.
+'''
+
+import os
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from models import storage
+from models.amenity import Amenity
+from models.place import Place
+from models.engine.amenity_index import AmenityIndex
+from console import HBNBCommand
+
+
+class TestAmenityIndex(unittest.TestCase):
+    """Tests for the standalone AmenityIndex."""
+
+    def setUp(self):
+        """Builds an index over three places and two amenities."""
+        self.index = AmenityIndex()
+        self.wifi = Amenity()
+        self.pool = Amenity()
+        self.index.add("Amenity.wifi", self.wifi)
+        self.index.add("Amenity.pool", self.pool)
+        self.both = Place(amenity_ids=[self.wifi.id, self.pool.id])
+        self.wifi_only = Place(amenity_ids=[self.wifi.id])
+        self.nothing = Place()
+        self.index.add("Place.both", self.both)
+        self.index.add("Place.wifi", self.wifi_only)
+        self.index.add("Place.nothing", self.nothing)
+
+    def test_match_all(self):
+        """Test that match_all ANDs the amenity bitmaps."""
+        self.assertEqual(
+            ["Place.both"],
+            self.index.match_all([self.wifi.id, self.pool.id]))
+        self.assertEqual(
+            ["Place.both", "Place.wifi"],
+            self.index.match_all([self.wifi.id]))
+
+    def test_match_all_no_amenities(self):
+        """Test that an empty filter matches every place."""
+        self.assertEqual(3, len(self.index.match_all([])))
+
+    def test_match_any(self):
+        """Test that match_any ORs the amenity bitmaps."""
+        self.assertEqual(
+            ["Place.both", "Place.wifi"],
+            self.index.match_any([self.wifi.id, self.pool.id]))
+
+    def test_unknown_amenity(self):
+        """Test filtering on an amenity no place offers."""
+        self.assertEqual([], self.index.match_all(["nope"]))
+        self.assertIsNone(self.index.mask(["nope"]))
+
+    def test_mask(self):
+        """Test that place masks match the mask of their amenity_ids."""
+        self.assertEqual(
+            self.index.mask([self.wifi.id, self.pool.id]),
+            self.index.mask_of("Place.both"))
+        self.assertEqual(0, self.index.mask_of("Place.nothing"))
+
+    def test_remove_frees_slot(self):
+        """Test that a removed place no longer matches."""
+        self.index.remove("Place.both", self.both)
+        self.assertEqual([], self.index.match_all([self.pool.id]))
+        self.index.add("Place.again", self.both)
+        self.assertEqual(["Place.again"], self.index.match_all([self.pool.id]))
+
+    def test_update(self):
+        """Test that changing amenity_ids moves the place."""
+        self.nothing.amenity_ids = [self.pool.id]
+        self.index.update("Place.nothing", self.nothing, "amenity_ids", [])
+        self.assertEqual(
+            ["Place.both", "Place.nothing"],
+            self.index.match_all([self.pool.id]))
+
+    def test_rebuild(self):
+        """Test that rebuild() indexes objects like add() does."""
+        rebuilt = AmenityIndex()
+        rebuilt.rebuild({"Amenity.wifi": self.wifi,
+                         "Amenity.pool": self.pool,
+                         "Place.both": self.both,
+                         "Place.wifi": self.wifi_only,
+                         "Place.nothing": self.nothing})
+        self.assertEqual(self.index.dump(), rebuilt.dump())
+        rebuilt.remove("Place.both", self.both)
+        rebuilt.add("Place.again", self.both)
+        self.assertEqual(["Place.again"], rebuilt.match_all([self.pool.id]))
+
+
+class TestStorageAmenityIndex(unittest.TestCase):
+    """Tests that the storage amenity index follows object changes."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        """Creates a stored amenity and place."""
+        self.index = storage.index("amenities")
+        self.amenity = Amenity()
+        self.place = Place()
+
+    def tearDown(self):
+        """Removes the objects created by the test."""
+        storage.delete(self.place)
+        storage.delete(self.amenity)
+
+    def test_attribute_assignment(self):
+        """Test that assigning amenity_ids updates the index."""
+        self.place.amenity_ids = [self.amenity.id]
+        key = f"Place.{self.place.id}"
+        self.assertIn(key, self.index.match_all([self.amenity.id]))
+        self.assertEqual(
+            self.index.mask([self.amenity.id]), self.place.amenity_mask)
+
+    def test_delete(self):
+        """Test that deleted places leave the index."""
+        self.place.amenity_ids = [self.amenity.id]
+        storage.delete(self.place)
+        self.assertEqual([], self.index.match_all([self.amenity.id]))
+
+    def test_console_update_list(self):
+        """Test that do_update's list path updates the index."""
+        key = f"Place.{self.place.id}"
+        cmd = f'update Place {self.place.id} amenity_ids ["{self.amenity.id}"]'
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd(cmd)
+        self.assertEqual([self.amenity.id], self.place.amenity_ids)
+        self.assertIn(key, self.index.match_all([self.amenity.id]))
+
+    def test_console_update_dict(self):
+        """Test that do_update's dict path updates the index."""
+        key = f"Place.{self.place.id}"
+        cmd = (f'Place.update("{self.place.id}", '
+               f'{{"amenity_ids": ["{self.amenity.id}"]}})')
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd(cmd)
+        self.assertIn(key, self.index.match_all([self.amenity.id]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+'''
+Unit tests for the bulk module.
+'''
+
+import io
+import os
+import unittest
+from models import storage
+from models.place import Place
+from models.user import User
+from models.engine import bulk, schema
+
+
+class TestBulkValidate(unittest.TestCase):
+    """Tests for validate() and file_format()."""
+
+    def setUp(self):
+        """Gets the Place schema."""
+        self.types = schema.of(Place)
+
+    def test_conversion(self):
+        """Test that values take the type of their class attribute."""
+        record = bulk.validate("Place", {
+            "max_guest": "4", "latitude": 3, "amenity_ids": '["a1"]',
+            "nickname": "nest"}, self.types)
+        self.assertEqual(4, record["max_guest"])
+        self.assertEqual(3.0, record["latitude"])
+        self.assertEqual(["a1"], record["amenity_ids"])
+        self.assertEqual("nest", record["nickname"])
+        self.assertIn("id", record)
+
+    def test_invalid_rows(self):
+        """Test that rows that do not fit the class raise ValueError."""
+        for row in ({"max_guest": "many"}, {"max_guest": True},
+                    {"amenity_ids": "a1"}, {"__class__": "User"},
+                    {"created_at": "yesterday"}, {"id": 12}):
+            with self.assertRaises(ValueError):
+                bulk.validate("Place", row, self.types)
+
+    def test_fixed_names(self):
+        """Test that rows can't set methods, properties or private names."""
+        for name in ("_record", "to_dict", "save", "amenity_mask",
+                     "__dict__"):
+            with self.assertRaises(ValueError):
+                bulk.validate("Place", {"name": "x", name: 1}, self.types)
+
+    def test_file_format(self):
+        """Test that the format follows the file extension."""
+        self.assertEqual("csv", bulk.file_format("places.CSV"))
+        self.assertEqual("jsonl", bulk.file_format("places.jsonl"))
+        self.assertEqual("csv", bulk.file_format("places.txt", "csv"))
+        with self.assertRaises(ValueError):
+            bulk.file_format("places.xml", "xml")
+
+
+class TestBulkImportExport(unittest.TestCase):
+    """Tests for import_rows() and export_rows()."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def tearDown(self):
+        """Removes the users made by a test."""
+        for user in list(storage.objects("User").values()):
+            if user.id.startswith("bulk-"):
+                storage.delete(user)
+
+    def test_batches(self):
+        """Test that rows are stored batch by batch, then saved."""
+        reports = []
+        rows = ((n, {"id": f"bulk-{n}", "first_name": f"U{n}"})
+                for n in range(5))
+        report = bulk.import_rows("User", rows, 2,
+                                  lambda report: reports.append(
+                                      report["imported"]))
+        self.assertEqual([2, 4, 5], reports)
+        self.assertEqual(5, report["imported"])
+        self.assertEqual(3, report["batches"])
+        user = storage.all()["User.bulk-3"]
+        self.assertEqual("U3", user.first_name)
+        self.assertEqual(user.created_at, user.updated_at)
+        with open("file.json", encoding="utf-8") as file:
+            self.assertIn("bulk-4", file.read())
+
+    def test_rejected_rows(self):
+        """Test that invalid rows are counted, reported and skipped."""
+        lines = io.StringIO('{"id": "bulk-1"}\n[1]\n{oops\n\n'
+                            '{"id": "bulk-2", "__class__": "Place"}\n')
+        report = bulk.import_rows("User", bulk.read_rows(lines))
+        self.assertEqual(1, report["imported"])
+        self.assertEqual(3, report["rejected"])
+        self.assertEqual([2, 3, 5],
+                         [number for number, message in report["errors"]])
+
+    def test_fixed_names_rejected(self):
+        """Test that rows setting methods are rejected, and save works."""
+        lines = io.StringIO('{"id": "bulk-fixed", "_record": 1}\n'
+                            '{"id": "bulk-saved", "to_dict": 1}\n')
+        report = bulk.import_rows("User", bulk.read_rows(lines))
+        self.assertEqual(0, report["imported"])
+        self.assertEqual([(1, "can't set _record"), (2, "can't set to_dict")],
+                         report["errors"])
+        self.assertNotIn("User.bulk-fixed", storage.all())
+        storage.save()
+
+    def test_jsonl_round_trip(self):
+        """Test that exported JSON lines import back as they were."""
+        user = User(id="bulk-round-trip", email="a@b.c",
+                    created_at="2024-01-01T10:00:00",
+                    updated_at="2024-01-02T10:00:00")
+        storage.new(user)
+        out = io.StringIO()
+        count = bulk.export_rows(out, "User")
+        self.assertEqual(len(storage.objects("User")), count)
+        storage.delete(user)
+        out.seek(0)
+        bulk.import_rows("User", bulk.read_rows(out))
+        self.assertEqual(user.to_dict(),
+                         storage.all()["User.bulk-round-trip"].to_dict())
+
+    def test_csv_export(self):
+        """Test the header and list cells of a CSV export."""
+        place = Place()
+        place.amenity_ids = ["a1"]
+        out = io.StringIO()
+        bulk.export_rows(out, "Place", "csv")
+        storage.delete(place)
+        header, *rows = out.getvalue().splitlines()
+        self.assertTrue(header.startswith("id,created_at,updated_at,"))
+        self.assertIn("amenity_ids", header)
+        row = [row for row in rows if row.startswith(place.id)][0]
+        self.assertIn('"[""a1""]"', row)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+'''
+Unit tests for the ChangeFeed class.
+'''
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from models import storage
+from models.place import Place
+from models.user import User
+from models.engine.changefeed import ChangeFeed
+from models.engine.query import compile_where
+
+
+class TestChangeFeedSubscribers(unittest.TestCase):
+    """Tests for the in-process subscribers of the storage feed."""
+
+    def setUp(self):
+        """Subscribes to the storage change feed."""
+        self.changes = []
+        storage.changes().subscribe(self.changes.append)
+
+    def tearDown(self):
+        """Unsubscribes from the storage change feed."""
+        storage.changes().unsubscribe(self.changes.append)
+
+    def test_create_update_delete(self):
+        """Test the order, ops and fields of the changes."""
+        user = User()
+        user.first_name = "Betty"
+        storage.delete(user)
+        key = f"User.{user.id}"
+        self.assertEqual(["create", "update", "delete"],
+                         [change["op"] for change in self.changes])
+        self.assertEqual([key] * 3,
+                         [change["key"] for change in self.changes])
+        self.assertEqual(user.id, self.changes[0]["fields"]["id"])
+        self.assertEqual({"first_name": "Betty"}, self.changes[1]["fields"])
+        seqs = [change["seq"] for change in self.changes]
+        self.assertEqual(list(range(seqs[0], seqs[0] + 3)), seqs)
+
+    def test_timestamps_as_iso(self):
+        """Test that timestamp updates carry ISO-8601 strings."""
+        user = User()
+        user.updated_at = user.created_at
+        self.assertEqual(user.created_at.isoformat(),
+                         self.changes[-1]["fields"]["updated_at"])
+        storage.delete(user)
+
+    def test_caches_fresh_in_callbacks(self):
+        """Test that subscribers read the changed forms and counts."""
+        place = Place()
+        self.assertIsNone(place.to_dict().get("name"))
+        where = compile_where(Place, "name=Fresh")
+        self.assertEqual(0, storage.count("Place", where))
+        seen = []
+
+        def read(change):
+            obj = storage.all().get(change["key"])
+            seen.append((obj.to_dict()["name"],
+                         storage.count("Place", where)))
+        storage.changes().subscribe(read)
+        try:
+            place.name = "Fresh"
+        finally:
+            storage.changes().unsubscribe(read)
+        self.assertEqual([("Fresh", 1)], seen)
+        storage.delete(place)
+
+    def test_unregistered_objects(self):
+        """Test that objects outside storage emit nothing."""
+        User(id="1", first_name="Nope")
+        self.assertEqual([], self.changes)
+
+
+def make_user(user_id):
+    """Returns an unstored User with the given id."""
+    now = datetime.now().isoformat()
+    return User(id=user_id, created_at=now, updated_at=now)
+
+
+class TestChangeFeedStream(unittest.TestCase):
+    """Tests for the on-disk stream of a ChangeFeed."""
+
+    def setUp(self):
+        """Opens a feed on a temporary file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "file.json.changes")
+        self.feed = ChangeFeed()
+        self.feed.open(self.path)
+
+    def tearDown(self):
+        """Removes the temporary file."""
+        self.directory.cleanup()
+
+    def test_flush_and_read(self):
+        """Test that flushed changes are read back from a cursor."""
+        user = make_user("1")
+        self.feed.add("User.1", user)
+        self.assertEqual(([], 0), ChangeFeed.read(self.path))
+        self.feed.flush()
+        changes, cursor = ChangeFeed.read(self.path)
+        self.assertEqual(["create"], [change["op"] for change in changes])
+        self.feed.remove("User.1", user)
+        self.feed.flush()
+        changes, cursor = ChangeFeed.read(self.path, cursor)
+        self.assertEqual([2], [change["seq"] for change in changes])
+        self.assertEqual(([], cursor), ChangeFeed.read(self.path, cursor))
+
+    def test_read_since(self):
+        """Test filtering on sequence numbers."""
+        for i in range(3):
+            self.feed.add(f"User.{i}", make_user(str(i)))
+        self.feed.flush()
+        changes, cursor = ChangeFeed.read(self.path, since=2)
+        self.assertEqual(["User.2"], [change["key"] for change in changes])
+
+    def test_offset(self):
+        """Test that offset() lands before the first newer change."""
+        for i in range(500):
+            self.feed.add(f"User.{i}", make_user(str(i)))
+        self.feed.flush()
+        size = os.path.getsize(self.path)
+        for since in (0, 1, 250, 499, 500, 600):
+            cursor = ChangeFeed.offset(self.path, since, window=256)
+            changes, end = ChangeFeed.read(self.path, cursor, since)
+            self.assertEqual(list(range(since + 1, 501)),
+                             [change["seq"] for change in changes])
+            self.assertEqual(size, end)
+        self.assertGreater(ChangeFeed.offset(self.path, 499, window=256),
+                           size - 512)
+        self.assertEqual(0, ChangeFeed.offset(self.path + ".nope", 3))
+
+    def test_resume_sequence(self):
+        """Test that a reopened stream continues its sequence numbers."""
+        self.feed.add("User.1", make_user("1"))
+        self.feed.close()
+        feed = ChangeFeed()
+        feed.open(self.path)
+        self.assertEqual(1, feed.seq)
+        feed.remove("User.1", make_user("1"))
+        feed.flush()
+        changes, cursor = ChangeFeed.read(self.path)
+        self.assertEqual([1, 2], [change["seq"] for change in changes])
+
+    def test_missing_file(self):
+        """Test reading a stream that does not exist yet."""
+        self.assertEqual(([], 0), ChangeFeed.read(self.path + ".nope"))
+        self.assertEqual(0, ChangeFeed.last_seq(self.path + ".nope"))
+
+
+class TestStorageChangeStream(unittest.TestCase):
+    """Tests for the storage feed stream."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_save_flushes_reload_is_silent(self):
+        """Test that save appends the changes and reload adds none."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "file.json.changes")
+            storage.changes().open(path)
+            try:
+                user = User()
+                storage.save()
+                changes, cursor = ChangeFeed.read(path)
+                self.assertEqual(f"User.{user.id}", changes[-1]["key"])
+                storage.reload()
+                storage.save()
+                self.assertEqual(([], cursor), ChangeFeed.read(path, cursor))
+            finally:
+                storage.changes().close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+'''
+Unit tests for the ColumnStore class.
+'''
+
+import math
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.place import Place
+from models.engine import columns
+from models.engine.columns import ColumnStore
+from models.engine.query import compile_where
+
+
+class TestColumnStore(unittest.TestCase):
+    """Tests for the ColumnStore, with and without NumPy."""
+
+    def setUp(self):
+        """Builds a store over four places."""
+        self.store = ColumnStore(Place)
+        self.places = []
+        for i, price in enumerate([30, 10, 40, 20]):
+            place = Place(price_by_night=price, latitude=i / 2)
+            self.places.append(place)
+            self.store.add(f"Place.{i}", place)
+
+    def run_both(self, check):
+        """Runs check with the NumPy fast path and the array fallback."""
+        check()
+        with patch.object(columns, "numpy", None):
+            check()
+
+    def test_columns(self):
+        """Test that int and float class attributes become columns."""
+        self.assertEqual("q", self.store.column("price_by_night").typecode)
+        self.assertEqual("d", self.store.column("latitude").typecode)
+        self.assertNotIn("name", self.store.names)
+        self.assertEqual(4, len(self.store))
+
+    def test_aggregates(self):
+        """Test sum, avg, min and max."""
+        def check():
+            self.assertEqual(100, self.store.sum("price_by_night"))
+            self.assertEqual(25.0, self.store.avg("price_by_night"))
+            self.assertEqual(10, self.store.min("price_by_night"))
+            self.assertEqual(1.5, self.store.max("latitude"))
+        self.run_both(check)
+
+    def test_select(self):
+        """Test range filters."""
+        def check():
+            self.assertEqual(["Place.0", "Place.3"],
+                             self.store.select("price_by_night", 20, 30))
+            self.assertEqual(["Place.1"],
+                             self.store.select("price_by_night", high=10))
+            self.assertEqual(4, len(self.store.select("price_by_night")))
+        self.run_both(check)
+
+    def test_order_by(self):
+        """Test sorting on a column."""
+        def check():
+            self.assertEqual(["Place.1", "Place.3", "Place.0", "Place.2"],
+                             self.store.order_by("price_by_night"))
+            self.assertEqual("Place.2", self.store.order_by(
+                "price_by_night", reverse=True)[0])
+        self.run_both(check)
+
+    def test_update_and_remove(self):
+        """Test that rows follow updates and swap on removal."""
+        self.places[1].price_by_night = 50
+        self.store.update("Place.1", self.places[1], "price_by_night", 10)
+        self.store.remove("Place.0", self.places[0])
+        self.assertEqual(3, len(self.store))
+        self.assertEqual(110, self.store.sum("price_by_night"))
+        self.assertEqual(["Place.1"],
+                         self.store.select("price_by_night", 45))
+
+    def test_not_a_number(self):
+        """Test the missing value of unconvertible attributes."""
+        self.places[0].latitude = "north"
+        self.store.update("Place.0", self.places[0], "latitude", 0.0)
+        self.assertTrue(math.isnan(self.store.column("latitude")[0]))
+
+    def test_irregular_values(self):
+        """Test that values a column can't hold are always candidates."""
+        self.places[0].price_by_night = 99.7
+        self.store.update("Place.0", self.places[0], "price_by_night", 30)
+        self.places[1].price_by_night = 10 ** 20
+        self.store.update("Place.1", self.places[1], "price_by_night", 10)
+
+        def check():
+            self.assertEqual({"Place.0", "Place.1", "Place.3"},
+                             set(self.store.select("price_by_night",
+                                                   high=25)))
+            self.assertEqual({"Place.0", "Place.1", "Place.2"},
+                             set(self.store.select("price_by_night", 35)))
+        self.run_both(check)
+        self.places[0].price_by_night = 5
+        self.store.update("Place.0", self.places[0], "price_by_night", 99.7)
+        self.store.remove("Place.1", self.places[1])
+        self.assertEqual(["Place.0"],
+                         self.store.select("price_by_night", high=5))
+
+    def test_irregular_aggregates(self):
+        """Test that aggregates and orders leave irregular values out."""
+        self.places[1].price_by_night = 2 ** 70
+        self.store.update("Place.1", self.places[1], "price_by_night", 10)
+        self.places[2].latitude = "north"
+        self.store.update("Place.2", self.places[2], "latitude", 1.0)
+
+        def check():
+            self.assertEqual(90, self.store.sum("price_by_night"))
+            self.assertEqual(30.0, self.store.avg("price_by_night"))
+            self.assertEqual(40, self.store.max("price_by_night"))
+            self.assertEqual(2.0, self.store.sum("latitude"))
+            self.assertEqual(0.0, self.store.min("latitude"))
+            self.assertEqual(1.5, self.store.max("latitude"))
+            self.assertEqual(["Place.2", "Place.0", "Place.3", "Place.1"],
+                             self.store.order_by("price_by_night", True))
+        self.run_both(check)
+        self.assertEqual({"Place.1"}, self.store.irregular("price_by_night"))
+
+    def test_empty(self):
+        """Test aggregates of an empty store."""
+        self.store.clear()
+        self.assertIsNone(self.store.avg("price_by_night"))
+        self.assertIsNone(self.store.min("price_by_night"))
+
+
+class TestStorageColumns(unittest.TestCase):
+    """Tests for the storage column stores."""
+
+    def test_enable_columns(self):
+        """Test that an enabled store follows new, update and delete."""
+        store = storage.enable_columns("Place")
+        self.assertIs(store, storage.columns("Place"))
+        self.assertIsNone(storage.columns("Review"))
+        place = Place()
+        place.price_by_night = 123456
+        key = f"Place.{place.id}"
+        self.assertEqual([key], store.select("price_by_night", 123456))
+        storage.delete(place)
+        self.assertEqual([], store.select("price_by_night", 123456))
+
+    def test_same_counts(self):
+        """Test that a column store never changes the result of a query."""
+        place = Place()
+        place.price_by_night = 99.7
+        place.max_guest = 10 ** 20
+        queries = [compile_where(Place, "price_by_night>=99.5"),
+                   compile_where(Place, "max_guest>1000")]
+        counts = [storage.count("Place", where) for where in queries]
+        storage.enable_columns("Place")
+        self.assertEqual(counts, [storage.count("Place", where)
+                                  for where in queries])
+        self.assertTrue(all(counts))
+        storage.delete(place)
+
+    def test_same_aggregates(self):
+        """Test that a column store never changes an aggregate."""
+        places = [Place(), Place()]
+        for place, price in zip(places, [100, 2 ** 70]):
+            place.price_by_night = price
+            place.latitude = price / 100
+        fields = {"count": True, "sum": "price_by_night",
+                  "avg": "price_by_night", "max": "price_by_night",
+                  "min": "latitude"}
+        expected = storage.aggregate("Place", **fields)
+        store = storage.enable_columns("Place")
+        self.assertEqual(expected, storage.aggregate("Place", **fields))
+        self.assertEqual(2 ** 70 + 100, expected[None]["sum_price_by_night"])
+        places[1].price_by_night = 50
+        self.assertFalse(store.irregular("price_by_night"))
+        self.assertEqual(storage.aggregate("Place", sum="price_by_night"),
+                         {None: {"sum_price_by_night": store.sum(
+                             "price_by_night")}})
+        for place in places:
+            storage.delete(place)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+'''
+Unit tests for the FacetRegistry class.
+'''
+
+import unittest
+from models import storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.engine.facets import FacetRegistry
+
+
+class TestFacetRegistry(unittest.TestCase):
+    """Tests for the standalone FacetRegistry."""
+
+    def setUp(self):
+        """Builds a registry over two cities of one state."""
+        self.facets = FacetRegistry(price_step=100)
+        self.city = City(id="c1", state_id="s1")
+        self.other = City(id="c2", state_id="s1")
+        self.facets.add("City.c1", self.city)
+        self.facets.add("City.c2", self.other)
+        self.place = Place(id="p1", city_id="c1", price_by_night=120,
+                           amenity_ids=["a1", "a2"])
+        self.facets.add("Place.p1", self.place)
+
+    def test_add(self):
+        """Test the counters of one place."""
+        self.assertEqual({"c1": 1}, self.facets.counts("city"))
+        self.assertEqual({"s1": 1}, self.facets.counts("state"))
+        self.assertEqual({"a1": 1, "a2": 1}, self.facets.counts("amenity"))
+        self.assertEqual({100: 1}, self.facets.counts("price"))
+
+    def test_remove(self):
+        """Test that removing the place drops its counters."""
+        self.facets.remove("Place.p1", self.place)
+        self.assertEqual(
+            {"city": {}, "state": {}, "amenity": {}, "price": {}},
+            self.facets.facets())
+
+    def test_update_place(self):
+        """Test that changing faceted attributes moves the counts."""
+        self.place.city_id = "c2"
+        self.facets.update("Place.p1", self.place, "city_id", "c1")
+        self.place.price_by_night = 30
+        self.facets.update("Place.p1", self.place, "price_by_night", 120)
+        self.place.amenity_ids = ["a2"]
+        self.facets.update("Place.p1", self.place, "amenity_ids",
+                           ["a1", "a2"])
+        self.assertEqual({"c2": 1}, self.facets.counts("city"))
+        self.assertEqual({"s1": 1}, self.facets.counts("state"))
+        self.assertEqual({0: 1}, self.facets.counts("price"))
+        self.assertEqual({"a2": 1}, self.facets.counts("amenity"))
+
+    def test_duplicate_amenities(self):
+        """Test that an amenity listed twice is counted once."""
+        place = Place(id="p2", amenity_ids=["a1", "a1"])
+        self.facets.add("Place.p2", place)
+        self.assertEqual({"a1": 2, "a2": 1}, self.facets.counts("amenity"))
+        place.amenity_ids = ["a2", "a2"]
+        self.facets.update("Place.p2", place, "amenity_ids", ["a1", "a1"])
+        self.assertEqual({"a1": 1, "a2": 2}, self.facets.counts("amenity"))
+        self.facets.remove("Place.p2", place)
+        self.assertEqual({"a1": 1, "a2": 1}, self.facets.counts("amenity"))
+
+    def test_bucket_not_a_number(self):
+        """Test that prices without a bucket are not counted."""
+        self.assertIsNone(self.facets.bucket(float("inf")))
+        self.assertIsNone(self.facets.bucket("cheap"))
+        self.assertEqual(100, self.facets.bucket(199.5))
+
+    def test_update_city_state(self):
+        """Test that moving a city moves its places to the new state."""
+        self.city.state_id = "s2"
+        self.facets.update("City.c1", self.city, "state_id", "s1")
+        self.assertEqual({"s2": 1}, self.facets.counts("state"))
+
+    def test_city_added_after_place(self):
+        """Test that a late city brings its places to its state."""
+        place = Place(id="p2", city_id="c3")
+        self.facets.add("Place.p2", place)
+        self.facets.add("City.c3", City(id="c3", state_id="s3"))
+        self.assertEqual(1, self.facets.counts("state")["s3"])
+
+
+class TestStorageFacets(unittest.TestCase):
+    """Tests that the storage facets follow object changes."""
+
+    def test_storage_facets(self):
+        """Test counts kept by storage on new, assignment and delete."""
+        state = State()
+        city = City()
+        city.state_id = state.id
+        place = Place()
+        place.city_id = city.id
+        self.assertEqual(1, storage.facets()["city"][city.id])
+        self.assertEqual(1, storage.facets()["state"][state.id])
+        storage.delete(place)
+        self.assertNotIn(city.id, storage.facets()["city"])
+        self.assertNotIn(state.id, storage.facets()["state"])
+        storage.delete(city)
+        storage.delete(state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,12 @@ Unit tests for the FileStorage class.
 import unittest
 import os
 import json
+import tempfile
+from datetime import datetime
+from io import StringIO
+from time import sleep
+from unittest.mock import patch
+from models.engine import side_file
 from models.engine.file_storage import FileStorage
 from models.base_model import BaseModel
 from models.user import User
@@ -52,6 +58,38 @@ class TestFileStorageAll(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.storage.all(None)
 
+    def test_scan(self):
+        """Test that scan() pages through the objects in storage order."""
+        states = [State() for i in range(5)]
+        keys = [f"State.{state.id}" for state in states]
+        stored = [key for key, obj in self.storage.scan("State")]
+        self.assertEqual(keys, stored[-5:])
+        after = keys[0]
+        self.assertEqual(keys[1:3], [key for key, obj in self.storage.scan(
+            "State", after, limit=2)])
+        self.assertEqual(keys[3:4], [key for key, obj in self.storage.scan(
+            "State", after, 2, 1)])
+        self.assertIn((keys[4], states[4]), list(self.storage.scan()))
+        with self.assertRaises(KeyError):
+            self.storage.scan("State", "State.missing")
+        for state in states:
+            self.storage.delete(state)
+
+    def test_scan_cursor_follows_changes(self):
+        """Test that cursors see the objects stored and deleted meanwhile."""
+        states = [State() for i in range(4)]
+        keys = [f"State.{state.id}" for state in states]
+        self.assertEqual(keys[1:3], [key for key, obj in self.storage.scan(
+            "State", keys[0], limit=2)])
+        self.storage.delete(states[1])
+        late = State()
+        self.assertEqual(keys[2:] + [f"State.{late.id}"], [
+            key for key, obj in self.storage.scan("State", keys[0])])
+        with self.assertRaises(KeyError):
+            self.storage.scan("State", keys[1])
+        for state in states + [late]:
+            self.storage.delete(state)
+
 
 class TestFileStorageNew(unittest.TestCase):
     """Tests for new() method of the FileStorage class."""
@@ -134,11 +172,44 @@ class TestFileStorageSave(unittest.TestCase):
         self.assertEqual(data[key]["name"], "Jhon Wick")
         self.assertEqual(data[key]["age"], 52)
 
+    def test_save_after_id_change(self):
+        """Test that changes follow an object whose id was reassigned."""
+        place = Place()
+        key = f"Place.{place.id}"
+        self.storage.save()
+        self.storage.save()
+        place.id = "newid"
+        place.name = "Loft"
+        self.storage.save()
+        with open("file.json", "r", encoding="utf-8") as file:
+            data = json.load(file)
+        self.assertEqual("Loft", data[key]["name"])
+        self.storage.delete(self.storage.all()[key])
+
     def test_save_with_arg(self):
         """Test save() with argument."""
         with self.assertRaises(TypeError):
             self.storage.save(None)
 
+    def test_deferred_save(self):
+        """Test that deferred saves wait for commit()."""
+        self.storage.defer()
+        try:
+            self.storage.save()
+            self.assertFalse(os.path.exists("file.json"))
+            self.assertTrue(self.storage.commit())
+            self.assertTrue(os.path.exists("file.json"))
+            self.assertFalse(self.storage.commit())
+        finally:
+            self.storage.defer(False)
+
+    def test_defer_off_commits(self):
+        """Test that turning deferral off writes the pending save."""
+        self.storage.defer()
+        self.storage.save()
+        self.storage.defer(False)
+        self.assertTrue(os.path.exists("file.json"))
+
 
 class TestFileStorageReload(unittest.TestCase):
     """Tests for reload() method of the FileStorage class."""
@@ -206,5 +277,237 @@ class TestFileStorageReload(unittest.TestCase):
             self.storage.reload(None)
 
 
+class TestFileStorageExportChanges(unittest.TestCase):
+    """Tests for export_changes() method of the FileStorage class."""
+
+    def test_export_since_date(self):
+        """Test exporting the objects updated after a date."""
+        storage = FileStorage()
+        user = User()
+        since = user.updated_at
+        sleep(0.01)
+        user.first_name = "Betty"
+        user.updated_at = datetime.now()
+        output = StringIO()
+        self.assertEqual(1, storage.export_changes(output, since))
+        record = json.loads(output.getvalue())
+        self.assertEqual("Betty", record["first_name"])
+        self.assertEqual("User", record["__class__"])
+        storage.delete(user)
+
+    def test_export_since_seq_needs_stream(self):
+        """Test that sequence numbers need an open change stream."""
+        with self.assertRaises(ValueError):
+            FileStorage().export_changes(StringIO(), 0)
+
+    def test_export_since_seq(self):
+        """Test exporting the objects changed after a sequence number."""
+        storage = FileStorage()
+        with tempfile.TemporaryDirectory() as directory:
+            storage.changes().open(os.path.join(directory, "changes"))
+            try:
+                seq = storage.changes().seq
+                user = User()
+                gone = User()
+                storage.delete(gone)
+                output = StringIO()
+                self.assertEqual(2, storage.export_changes(output, seq))
+            finally:
+                storage.changes().close()
+        lines = output.getvalue().splitlines()
+        self.assertEqual(user.id, json.loads(lines[0])["id"])
+        self.assertEqual({"__class__": "User", "id": gone.id,
+                          "__deleted__": True}, json.loads(lines[1]))
+        storage.delete(user)
+
+
+class TestFileStoragePersistedIndexes(unittest.TestCase):
+    """Tests for the index side file of the FileStorage class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        for path in ("file.json", "file.json.indexes"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        """Persists the indexes whatever the number of objects."""
+        self.storage = FileStorage()
+        self.storage.persist_indexes(0)
+        self.amenity = Amenity()
+        self.city = City(id="persisted-city", state_id="persisted-state",
+                         created_at="2024-01-01T10:00:00",
+                         updated_at="2024-01-01T10:00:00")
+        self.storage.new(self.city)
+        self.place = Place()
+        self.place.city_id = self.city.id
+        self.place.amenity_ids = [self.amenity.id]
+        self.place.price_by_night = 120
+
+    def tearDown(self):
+        """Removes the objects of the test and restores the threshold."""
+        self.storage.persist_indexes()
+        for obj in (self.amenity, self.city, self.place):
+            key = f"{obj.__class__.__name__}.{obj.id}"
+            if key in self.storage.all():
+                self.storage.delete(self.storage.all()[key])
+
+    def queries(self):
+        """Returns the answers of every persisted index."""
+        storage = self.storage
+        return (sorted(storage.objects("Place")),
+                sorted(storage.lookup("Place", "city_id", self.city.id)),
+                list(storage.recent("Place", 1)),
+                list(storage.created_between("City")),
+                list(storage.changed_since(self.city.updated_at)),
+                storage.index("amenities").match_all([self.amenity.id]),
+                storage.facets())
+
+    def test_save_writes_side_file(self):
+        """Test that saving writes the indexes next to the data file."""
+        self.storage.save()
+        self.storage.sync()
+        with open("file.json", "rb") as file:
+            fingerprint = side_file.fingerprint(file.read())
+        snapshot = side_file.read("file.json.indexes", fingerprint)
+        self.assertEqual(len(self.storage.all()), snapshot["count"])
+        self.assertIn("foreign_keys", snapshot["indexes"])
+
+    def test_reload_restores_indexes(self):
+        """Test that reload restores the indexes instead of rebuilding."""
+        self.storage.save()
+        self.storage.sync()
+        expected = self.queries()
+        with patch.object(FileStorage, "_FileStorage__rebuild",
+                          side_effect=AssertionError("rebuilt")):
+            self.storage.reload()
+        self.assertEqual(expected, self.queries())
+        place = self.storage.all()[f"Place.{self.place.id}"]
+        self.assertIsNot(self.place, place)
+        self.assertIs(place, self.storage.lookup(
+            "Place", "city_id", self.city.id)[f"Place.{self.place.id}"])
+
+    def test_stale_side_file(self):
+        """Test that a side file of another data file is not used."""
+        self.storage.save()
+        self.storage.sync()
+        with open("file.json", "rb") as file:
+            data = json.loads(file.read())
+        data[f"Place.{self.place.id}"]["city_id"] = "elsewhere"
+        with open("file.json", "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        self.storage.reload()
+        self.storage.sync()
+        self.assertIn(f"Place.{self.place.id}",
+                      self.storage.lookup("Place", "city_id", "elsewhere"))
+        with open("file.json", "rb") as file:
+            fingerprint = side_file.fingerprint(file.read())
+        self.assertIsNotNone(
+            side_file.read("file.json.indexes", fingerprint))
+
+    def test_below_threshold(self):
+        """Test that small stores do not persist their indexes."""
+        try:
+            os.remove("file.json.indexes")
+        except IOError:
+            pass
+        self.storage.persist_indexes(len(self.storage.all()) + 1)
+        self.storage.save()
+        self.storage.sync()
+        self.assertFalse(os.path.exists("file.json.indexes"))
+
+
+class TestFileStorageWarmStart(unittest.TestCase):
+    """Tests for the warm start snapshot of the FileStorage class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        for path in ("file.json", "file.json.snapshot"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        """Keeps a snapshot whatever the number of objects."""
+        self.storage = FileStorage()
+        self.storage.warm_start(0)
+        self.user = User()
+        self.user.first_name = "Betty"
+        self.key = f"User.{self.user.id}"
+
+    def tearDown(self):
+        """Removes the user of the test and restores the threshold."""
+        self.storage.warm_start()
+        self.storage.delete(self.storage.all()[self.key])
+
+    def test_snapshot_after_save(self):
+        """Test that a snapshot is written once per saved generation."""
+        self.storage.save()
+        self.assertTrue(self.storage.snapshot())
+        self.assertTrue(os.path.exists("file.json.snapshot"))
+        self.assertFalse(self.storage.snapshot())
+
+    def test_no_snapshot_of_unsaved_changes(self):
+        """Test that objects changed since the save are not snapshot."""
+        self.storage.save()
+        self.user.last_name = "Holberton"
+        self.assertFalse(self.storage.snapshot())
+
+    def test_reload_from_snapshot(self):
+        """Test that reload loads the snapshot instead of the JSON."""
+        self.storage.save()
+        self.storage.snapshot()
+        with patch("models.engine.file_storage.json") as parser:
+            self.storage.reload()
+            parser.loads.assert_not_called()
+        user = self.storage.all()[self.key]
+        self.assertIsNot(self.user, user)
+        self.assertEqual(self.user.to_dict(), user.to_dict())
+        self.assertIs(user, self.storage.objects("User")[self.key])
+
+    def test_stale_snapshot(self):
+        """Test that a snapshot of another JSON file is not loaded."""
+        self.storage.save()
+        self.storage.snapshot()
+        with open("file.json", "r", encoding="utf-8") as file:
+            data = json.load(file)
+        data[self.key]["first_name"] = "Holberton"
+        with open("file.json", "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        self.storage.reload()
+        self.assertEqual("Holberton",
+                         self.storage.all()[self.key].first_name)
+        self.assertTrue(self.storage.snapshot())
+
+
 if __name__ == '__main__':
     unittest.main()
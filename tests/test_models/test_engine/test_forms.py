@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+'''
+Unit tests for the forms module.
+'''
+
+import json
+import os
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.base_model import BaseModel
+from models.place import Place
+from models.engine.forms import FormCache
+
+
+class TestFormCache(unittest.TestCase):
+    """Tests for the memoized forms of stored objects."""
+
+    def setUp(self):
+        """Stores a place."""
+        self.place = Place()
+        self.place.name = "Nest"
+        self.forms = storage.forms()
+
+    def tearDown(self):
+        """Removes the place."""
+        storage.delete(self.place)
+
+    def test_text(self):
+        """Test that str() is built once until the object changes."""
+        text = str(self.place)
+        self.assertIs(text, str(self.place))
+        self.assertEqual(self.place._text(), text)
+        self.place.name = "Burrow"
+        self.assertIn("'name': 'Burrow'", str(self.place))
+        text = str(self.place)
+        self.place.save()
+        self.assertIsNot(text, str(self.place))
+
+    def test_record(self):
+        """Test that to_dict() returns copies of the memoized record."""
+        record = self.place.to_dict()
+        record["name"] = "Changed"
+        self.assertEqual("Nest", self.place.to_dict()["name"])
+        self.assertIs(self.forms.record(self.place),
+                      self.forms.record(self.place))
+        self.assertEqual(self.place._record(), self.place.to_dict())
+
+    def test_json(self):
+        """Test the JSON text of the record."""
+        text = self.forms.json(self.place)
+        with patch.object(Place, "_record") as record:
+            self.assertEqual(text, self.forms.json(self.place))
+            record.assert_not_called()
+        self.assertEqual(self.place._record(), json.loads(text))
+        self.place.max_guest = 3
+        self.assertEqual(3, json.loads(self.forms.json(self.place))[
+            "max_guest"])
+
+    def test_not_stored(self):
+        """Test that objects out of storage are formatted every time."""
+        str(self.place)
+        size = self.forms.size()
+        place = Place(id="loose", name="Loose",
+                      created_at="2024-01-01T00:00:00",
+                      updated_at="2024-01-01T00:00:00")
+        self.assertEqual(place._text(), str(place))
+        self.assertEqual(size, self.forms.size())
+        storage.delete(self.place)
+        str(self.place)
+        self.assertEqual(size - 1, self.forms.size())
+        storage.new(self.place)
+
+    def test_rebuild(self):
+        """Test a cache that follows no objects yet."""
+        forms = FormCache()
+        self.assertEqual(self.place._text(), forms.text(self.place))
+        self.assertEqual(0, forms.size())
+        forms.rebuild(storage.all())
+        forms.text(self.place)
+        self.assertEqual(1, forms.size())
+
+
+class TestFormCacheSave(unittest.TestCase):
+    """Tests for saving storage from the memoized forms."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_save(self):
+        """Test that the file is the JSON of every to_dict() form."""
+        model = BaseModel()
+        model.quote = 'say "hi"'
+        forms = FormCache(storage.all())
+        self.assertEqual(forms.document(), forms.document())
+        self.assertEqual(len(storage.all()), forms.size())
+        model.count = 2
+        for i in range(3):
+            storage.save()
+        with open("file.json", "rb") as file:
+            data = file.read()
+        expected = {key: obj._record() for key, obj in storage.all().items()}
+        self.assertEqual(json.dumps(expected).encode("utf-8"), data)
+        self.assertEqual(2, json.loads(data)[f"BaseModel.{model.id}"][
+            "count"])
+        with patch.object(BaseModel, "_record") as record:
+            storage.save()
+            record.assert_not_called()
+        storage.delete(model)
+
+
+if __name__ == "__main__":
+    unittest.main()
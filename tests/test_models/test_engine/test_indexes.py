@@ -0,0 +1,189 @@
+#!/usr/bin/python3
+'''
+Unit tests for the ClassPartition and ForeignKeyIndex classes.
+'''
+
+import unittest
+from datetime import datetime, timedelta
+from time import sleep
+from models import storage
+from models.base_model import set_id_generator, uuid4_id, uuid7_id
+from models.city import City
+from models.place import Place
+from models.engine.indexes import ClassPartition, ForeignKeyIndex
+from models.engine.indexes import CreationIndex, UpdateIndex
+
+
+class TestClassPartition(unittest.TestCase):
+    """Tests for the ClassPartition index."""
+
+    def test_add_remove(self):
+        """Test that objects are filed under their class only."""
+        partition = ClassPartition()
+        city = City()
+        partition.add("City.1", city)
+        self.assertEqual({"City.1": city}, partition.objects("City"))
+        self.assertEqual({}, partition.objects("Place"))
+        partition.remove("City.1", city)
+        self.assertEqual({}, partition.objects("City"))
+
+    def test_storage_objects(self):
+        """Test that storage.objects() follows new and delete."""
+        place = Place()
+        key = f"Place.{place.id}"
+        self.assertIs(place, storage.objects("Place")[key])
+        self.assertNotIn(key, storage.objects("City"))
+        storage.delete(place)
+        self.assertNotIn(key, storage.objects("Place"))
+
+
+class TestForeignKeyIndex(unittest.TestCase):
+    """Tests for the ForeignKeyIndex."""
+
+    def test_indexed(self):
+        """Test that only <model>_id class attributes are indexed."""
+        index = ForeignKeyIndex()
+        self.assertTrue(index.indexed("Place", "city_id"))
+        self.assertTrue(index.indexed("Review", "place_id"))
+        self.assertFalse(index.indexed("Place", "name"))
+        self.assertFalse(index.indexed("Nope", "city_id"))
+
+    def test_lookup_and_update(self):
+        """Test lookups after add, update and remove."""
+        index = ForeignKeyIndex()
+        place = Place(city_id="c1")
+        index.add("Place.1", place)
+        self.assertEqual({"Place.1": place},
+                         index.lookup("Place", "city_id", "c1"))
+        place.city_id = "c2"
+        index.update("Place.1", place, "city_id", "c1")
+        self.assertEqual({}, index.lookup("Place", "city_id", "c1"))
+        self.assertEqual({"Place.1": place},
+                         index.lookup("Place", "city_id", "c2"))
+        index.remove("Place.1", place)
+        self.assertEqual({}, index.lookup("Place", "city_id", "c2"))
+
+    def test_storage_lookup(self):
+        """Test that storage.lookup() follows attribute assignment."""
+        place = Place()
+        place.user_id = "u-lookup"
+        key = f"Place.{place.id}"
+        self.assertIn(key, storage.lookup("Place", "user_id", "u-lookup"))
+        storage.delete(place)
+        self.assertNotIn(key, storage.lookup("Place", "user_id", "u-lookup"))
+
+
+class TestCreationIndex(unittest.TestCase):
+    """Tests for the CreationIndex."""
+
+    def setUp(self):
+        """Indexes uuid7 and uuid4 identified cities."""
+        self.index = CreationIndex()
+        self.start = datetime.now() - timedelta(hours=1)
+        self.keys = []
+        self.index_objects = {}
+        for hours, generator in enumerate([uuid4_id, uuid7_id, uuid4_id]):
+            city = City(id=generator(), created_at=(
+                self.start + timedelta(hours=hours)).isoformat())
+            key = f"City.{city.id}"
+            self.index.add(key, city)
+            self.keys.append(key)
+            self.index_objects[key] = city
+        self.legacy = city
+
+    def test_between(self):
+        """Test range scans over both kinds of ids."""
+        self.assertEqual(self.keys, self.index.between("City"))
+        self.assertEqual([self.keys[0]], self.index.between(
+            "City", end=self.start + timedelta(minutes=1)))
+        self.assertEqual(self.keys[1:], self.index.between(
+            "City", start=self.start + timedelta(minutes=1)))
+        self.assertEqual([], self.index.between("Place"))
+
+    def test_recent(self):
+        """Test that recent returns the newest keys first."""
+        self.assertEqual(self.keys[::-1], self.index.recent("City", 5))
+        self.assertEqual([self.keys[2]], self.index.recent("City", 1))
+
+    def test_rebuild(self):
+        """Test that a rebuild orders the keys as the additions did."""
+        index = CreationIndex()
+        index.rebuild({key: self.index_objects[key]
+                       for key in reversed(self.keys)})
+        self.assertEqual(self.keys, index.between("City"))
+        self.assertEqual(self.index.dump(), index.dump())
+
+    def test_remove_and_update(self):
+        """Test that removals and created_at changes are followed."""
+        old = self.legacy.created_at
+        self.legacy.created_at = self.start - timedelta(hours=1)
+        self.index.update(self.keys[2], self.legacy, "created_at", old)
+        self.assertEqual(self.keys[2], self.index.between("City")[0])
+        self.index.remove(self.keys[2], self.legacy)
+        self.assertEqual(self.keys[:2], self.index.between("City"))
+
+    def test_created_at_wins(self):
+        """Test that a new id with an old created_at is filed by date."""
+        old = City(id=uuid7_id(), created_at="2001-01-01T00:00:00")
+        self.index.add(f"City.{old.id}", old)
+        self.assertEqual([f"City.{old.id}"], self.index.between(
+            "City", datetime(2000, 1, 1), datetime(2002, 1, 1)))
+        self.assertEqual(f"City.{old.id}", self.index.between("City")[0])
+        self.assertNotIn(f"City.{old.id}", self.index.recent("City", 3))
+
+    def test_storage_recent(self):
+        """Test storage.recent() and storage.created_between()."""
+        set_id_generator(uuid4_id)
+        try:
+            old = Place()
+        finally:
+            set_id_generator(uuid7_id)
+        sleep(0.01)
+        new = Place()
+        recent = list(storage.recent("Place", 2).values())
+        self.assertEqual([new, old], recent)
+        since = storage.created_between(
+            "Place", start=new.created_at - timedelta(milliseconds=5))
+        self.assertIn(f"Place.{new.id}", since)
+        self.assertNotIn(f"Place.{old.id}", since)
+        storage.delete(old)
+        storage.delete(new)
+
+
+class TestUpdateIndex(unittest.TestCase):
+    """Tests for the UpdateIndex."""
+
+    def test_since(self):
+        """Test that only objects updated after a moment are returned."""
+        index = UpdateIndex()
+        start = datetime(2024, 1, 1)
+        places = []
+        for hours in range(3):
+            place = Place(updated_at=(
+                start + timedelta(hours=hours)).isoformat())
+            index.add(f"Place.{hours}", place)
+            places.append(place)
+        self.assertEqual(["Place.1", "Place.2"], index.since(start))
+        places[0].updated_at = start + timedelta(hours=5)
+        index.update("Place.0", places[0], "updated_at", start)
+        self.assertEqual(["Place.2", "Place.0"],
+                         index.since(start + timedelta(hours=1)))
+        index.remove("Place.2", places[2])
+        self.assertEqual(["Place.0"], index.since(start + timedelta(hours=1)))
+        rebuilt = UpdateIndex()
+        rebuilt.rebuild({"Place.0": places[0], "Place.1": places[1]})
+        self.assertEqual(index.dump(), rebuilt.dump())
+
+    def test_storage_changed_since(self):
+        """Test that save() moves an object into changed_since()."""
+        place = Place()
+        since = place.updated_at
+        self.assertNotIn(f"Place.{place.id}", storage.changed_since(since))
+        sleep(0.01)
+        place.updated_at = datetime.now()
+        self.assertIn(f"Place.{place.id}", storage.changed_since(since))
+        storage.delete(place)
+
+
+if __name__ == '__main__':
+    unittest.main()
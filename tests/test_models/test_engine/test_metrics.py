@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+'''
+Unit tests for the metrics module.
+'''
+
+import os
+import tempfile
+import unittest
+from models import storage
+from models.place import Place
+from models.engine import metrics
+from models.engine.metrics import Histogram, Metrics
+
+
+class TestHistogram(unittest.TestCase):
+    """Tests for the latency histograms."""
+
+    def test_quantile(self):
+        """Test the quantiles interpolated in the buckets."""
+        histogram = Histogram()
+        self.assertEqual(0.0, histogram.quantile(0.5))
+        for i in range(1, 101):
+            histogram.observe(i / 1000)
+        self.assertEqual(100, histogram.count)
+        self.assertAlmostEqual(5.05, histogram.sum)
+        self.assertAlmostEqual(0.05, histogram.quantile(0.5), delta=0.015)
+        self.assertAlmostEqual(0.099, histogram.quantile(0.99), delta=0.02)
+        self.assertLessEqual(histogram.quantile(0.99), 0.1)
+
+    def test_bounds(self):
+        """Test that quantiles stay between the observations."""
+        histogram = Histogram()
+        histogram.observe(0.003)
+        self.assertEqual(0.003, histogram.quantile(0.5))
+        histogram.observe(1000)
+        self.assertEqual(1000, histogram.quantile(1))
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the metrics registry."""
+
+    def test_disabled(self):
+        """Test that a disabled registry records nothing."""
+        registry = Metrics()
+        registry.count("calls_total")
+        registry.observe("call_seconds", 0.1)
+        self.assertEqual(2, registry.timed("call_seconds")(len)("ab"))
+        self.assertEqual([], registry.summary())
+
+    def test_summary(self):
+        """Test the counters and histograms of the stats lines."""
+        registry = Metrics(enabled=True)
+        registry.count("bytes_total", 10)
+        registry.count("bytes_total", 5)
+        function = registry.timed("call_seconds", ("call", "len"))(len)
+        self.assertEqual(3, function("abc"))
+        lines = dict(registry.summary())
+        self.assertEqual(15, lines["bytes_total"])
+        self.assertEqual(1, lines["call_seconds{call=len}.count"])
+        self.assertIn("call_seconds{call=len}.p99", lines)
+        registry.reset()
+        self.assertEqual([], registry.summary())
+
+    def test_timed_raises(self):
+        """Test that failed calls are timed too."""
+        registry = Metrics(enabled=True)
+        function = registry.timed("call_seconds")(int)
+        with self.assertRaises(ValueError):
+            function("x")
+        self.assertEqual(1, dict(registry.summary())["call_seconds.count"])
+
+    def test_prometheus(self):
+        """Test the Prometheus text format."""
+        registry = Metrics(enabled=True)
+        registry.count("bytes_total", 7)
+        registry.observe("call_seconds", 0.00002, ("call", 'say "x"'))
+        registry.observe("call_seconds", 100)
+        text = registry.prometheus([("objects", ("class", "Place"), 3)])
+        lines = text.splitlines()
+        self.assertEqual("# TYPE hbnb_objects gauge", lines[0])
+        self.assertIn('hbnb_objects{class="Place"} 3', lines)
+        self.assertIn("# TYPE hbnb_bytes_total counter", lines)
+        self.assertIn("hbnb_bytes_total 7", lines)
+        self.assertEqual(1, lines.count("# TYPE hbnb_call_seconds histogram"))
+        self.assertIn('hbnb_call_seconds_bucket{call="say \\"x\\"",'
+                      'le="2e-05"} 1', lines)
+        self.assertIn('hbnb_call_seconds_bucket{le="+Inf"} 1', lines)
+        self.assertIn('hbnb_call_seconds_bucket{le="83.8861"} 0', lines)
+        self.assertIn("hbnb_call_seconds_count 1", lines)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hbnb.prom")
+            registry.write(path)
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(registry.prometheus(), file.read())
+            self.assertEqual(["hbnb.prom"], os.listdir(directory))
+
+
+class TestStorageMetrics(unittest.TestCase):
+    """Tests for the metrics of storage."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        """Enables the metrics."""
+        metrics.registry.reset()
+        metrics.registry.enabled = True
+
+    def tearDown(self):
+        """Disables the metrics."""
+        metrics.registry.enabled = False
+        metrics.registry.reset()
+
+    def test_save_reload(self):
+        """Test the timings and bytes of saving and reloading."""
+        place = Place()
+        storage.save()
+        storage.reload()
+        size = os.path.getsize("file.json")
+        lines = dict(metrics.registry.summary())
+        self.assertEqual(size, lines["storage_bytes_written_total"])
+        self.assertEqual(size, lines["storage_bytes_read_total"])
+        self.assertEqual(
+            1, lines["storage_operation_seconds{operation=save}.count"])
+        self.assertEqual(
+            1, lines["storage_operation_seconds{operation=reload}.count"])
+        storage.delete(place)
+
+    def test_gauges(self):
+        """Test the objects of each class in the gauges."""
+        place = Place()
+        gauges = {(name, label): value
+                  for name, label, value in storage.gauges()}
+        self.assertEqual(len(storage.objects("Place")),
+                         gauges[("storage_objects", ("class", "Place"))])
+        self.assertIn(("result_cache_hits", None), gauges)
+        storage.delete(place)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+'''
+Unit tests for the query module.
+'''
+
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from models import storage
+from models.place import Place
+from models.engine import query
+
+
+class TestQueryCompile(unittest.TestCase):
+    """Tests for parse() and compile_where()."""
+
+    def test_parse(self):
+        """Test that clauses split on commas outside quoted values."""
+        self.assertEqual(
+            [("price_by_night", "<", "100"), ("name", "=", "a, b"),
+             ("city_id", "!=", "c1")],
+            query.parse('price_by_night < 100, name="a, b",city_id!=c1'))
+        self.assertEqual([], query.parse("  "))
+        for text in ("price_by_night", "price_by_night<", "a=1 b=2",
+                     "name='open"):
+            with self.assertRaises(ValueError):
+                query.parse(text)
+
+    def test_values(self):
+        """Test that values take the type of the attribute."""
+        conditions = query.compile_where(
+            Place, "max_guest>=2, latitude<1, name=12, id=7, "
+            "updated_at>2024-01-01, rooms=3, size=2.5").conditions
+        self.assertEqual(
+            [2, 1.0, "12", "7", datetime(2024, 1, 1), 3, 2.5],
+            [value for name, symbol, value in conditions])
+        self.assertIs(float, type(conditions[1][2]))
+        for text in ("max_guest<many", "created_at>yesterday"):
+            with self.assertRaises(ValueError):
+                query.compile_where(Place, text)
+
+    def test_cached(self):
+        """Test that the same clauses are compiled once."""
+        self.assertIs(query.compile_where(Place, "max_guest=2"),
+                      query.compile_where(Place, "max_guest=2"))
+
+    def test_matches(self):
+        """Test the compiled predicate."""
+        place = Place(id="q", name="Nest")
+        place.max_guest = 4
+        matches = query.compile_where(
+            Place, "max_guest>2, max_guest!=5, name=Nest").matches
+        self.assertTrue(matches(place))
+        place.max_guest = "4"
+        self.assertFalse(matches(place))
+        self.assertFalse(query.compile_where(Place, "rooms=1").matches(
+            place))
+
+
+class TestQueryPlan(unittest.TestCase):
+    """Tests for the index routing of queries."""
+
+    def setUp(self):
+        """Stores places in two cities."""
+        self.places = [Place() for i in range(6)]
+        for i, place in enumerate(self.places):
+            place.city_id = f"q-city-{i % 2}"
+            place.price_by_night = i * 10
+
+    def tearDown(self):
+        """Removes the places."""
+        for place in self.places:
+            storage.delete(place)
+
+    def test_foreign_key(self):
+        """Test that a foreign key equality reads its index bucket only."""
+        where = query.compile_where(Place, "city_id=q-city-1")
+        candidates, predicate = where.plan(storage)
+        self.assertIsNone(predicate)
+        self.assertEqual(3, len(candidates))
+        with patch.object(storage, "objects") as objects:
+            self.assertEqual(3, storage.count("Place", where))
+            objects.assert_not_called()
+        where = query.compile_where(
+            Place, "price_by_night>=20, city_id=q-city-1")
+        self.assertEqual(
+            [f"Place.{place.id}" for place in self.places[3::2]],
+            [key for key, obj in storage.scan("Place", where=where)])
+
+    def test_id(self):
+        """Test that an id equality is a key lookup."""
+        place = self.places[2]
+        where = query.compile_where(Place, f"id={place.id}")
+        self.assertEqual({f"Place.{place.id}": place},
+                         where.plan(storage)[0])
+        self.assertEqual(0, storage.count(
+            "Place", query.compile_where(Place, "id=missing")))
+
+    def test_columns(self):
+        """Test that a numeric range reads an enabled column store."""
+        where = query.compile_where(Place, "price_by_night<20, name!=x")
+        storage.enable_columns("Place")
+        candidates, predicate = where.plan(storage)
+        self.assertIs(where.matches, predicate)
+        self.assertLess(len(candidates), len(storage.objects("Place")))
+        self.assertIn(f"Place.{self.places[2].id}", candidates)
+        self.assertEqual(
+            sum(map(where.matches, storage.objects("Place").values())),
+            storage.count("Place", where))
+
+    def test_scan_pages(self):
+        """Test offset, limit and cursor over matching objects."""
+        where = query.compile_where(Place, "price_by_night>0")
+        keys = [key for key, obj in storage.scan("Place", where=where)]
+        self.assertEqual(keys[1:3], [key for key, obj in storage.scan(
+            "Place", offset=1, limit=2, where=where)])
+        self.assertEqual(keys[2:3], [key for key, obj in storage.scan(
+            "Place", keys[0], 1, 1, where)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+'''
+Unit tests for the result_cache module.
+'''
+
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.city import City
+from models.place import Place
+from models.engine import query
+from models.engine.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    """Tests for the ResultCache bookkeeping."""
+
+    def setUp(self):
+        """Creates a cache of two results."""
+        self.cache = ResultCache(capacity=2)
+        self.place = Place(id="rc", city_id="c")
+
+    def test_get_put(self):
+        """Test hits and misses."""
+        self.assertIsNone(self.cache.get(("count", "Place", 1)))
+        self.assertEqual(3, self.cache.put(("count", "Place", 1), 3,
+                                           "Place", frozenset()))
+        self.assertEqual(3, self.cache.get(("count", "Place", 1)))
+        stats = self.cache.stats()
+        self.assertEqual((1, 1, 0.5, 1),
+                         (stats["hits"], stats["misses"],
+                          stats["hit_ratio"], stats["entries"]))
+        self.assertGreater(stats["bytes"], 0)
+
+    def test_lru(self):
+        """Test that the least recently used result is evicted."""
+        for number in range(3):
+            self.cache.put(number, number, "Place", frozenset())
+            self.cache.get(0)
+        self.assertEqual(0, self.cache.get(0))
+        self.assertIsNone(self.cache.get(1))
+        self.assertEqual(2, self.cache.get(2))
+        self.assertEqual(1, self.cache.stats()["evictions"])
+
+    def test_ttl(self):
+        """Test that results expire after ttl seconds."""
+        self.cache.ttl = 10
+        with patch("time.monotonic", return_value=100):
+            self.cache.put(1, "one", "Place", frozenset())
+        with patch("time.monotonic", return_value=105):
+            self.assertEqual("one", self.cache.get(1))
+        with patch("time.monotonic", return_value=111):
+            self.assertIsNone(self.cache.get(1))
+        self.assertEqual(1, self.cache.stats()["expirations"])
+
+    def test_invalidation(self):
+        """Test that changes drop the results depending on them only."""
+        self.cache.put(1, "price", "Place", frozenset(["price_by_night"]))
+        self.cache.put(2, "city", "City", frozenset())
+        self.cache.update("Place.rc", self.place, "name", None)
+        self.assertEqual("price", self.cache.get(1))
+        self.cache.update("Place.rc", self.place, "price_by_night", 0)
+        self.assertIsNone(self.cache.get(1))
+        self.cache.put(1, "price", "Place", frozenset(["price_by_night"]))
+        self.cache.add("Place.rc", self.place)
+        self.assertIsNone(self.cache.get(1))
+        self.assertEqual("city", self.cache.get(2))
+        self.cache.remove("City.x", City(id="x"))
+        self.assertIsNone(self.cache.get(2))
+        self.assertEqual(3, self.cache.stats()["invalidations"])
+        self.assertEqual(0, self.cache.stats()["bytes"])
+
+
+class TestStorageResults(unittest.TestCase):
+    """Tests for the cached counts and listings of storage."""
+
+    def setUp(self):
+        """Stores three places of one city."""
+        self.places = [Place() for i in range(3)]
+        for price, place in zip((30, 10, 20), self.places):
+            place.city_id = "rc-city"
+            place.price_by_night = price
+        self.where = query.compile_where(
+            Place, "city_id=rc-city, price_by_night>15")
+
+    def tearDown(self):
+        """Removes the places."""
+        for place in self.places:
+            storage.delete(place)
+
+    def test_count(self):
+        """Test that a count is computed once until a change."""
+        self.assertEqual(2, storage.count("Place", self.where))
+        hits = storage.results().hits
+        self.assertEqual(2, storage.count("Place", query.compile_where(
+            Place, "price_by_night > 15,city_id = rc-city")))
+        self.assertEqual(2, storage.count("Place", self.where))
+        self.assertEqual(hits + 2, storage.results().hits)
+        self.places[1].name = "Renamed"
+        self.assertEqual(2, storage.count("Place", self.where))
+        self.places[1].price_by_night = 50
+        self.assertEqual(3, storage.count("Place", self.where))
+        self.places.append(Place())
+        self.places[-1].city_id = "rc-city"
+        self.places[-1].price_by_night = 90
+        self.assertEqual(4, storage.count("Place", self.where))
+        storage.delete(self.places[0])
+        self.assertEqual(3, storage.count("Place", self.where))
+
+    def test_select(self):
+        """Test ordered listings."""
+        where = query.compile_where(Place, "city_id=rc-city")
+        ids = [place.id for place in self.places]
+        self.assertEqual([ids[1], ids[2], ids[0]], [
+            key.split(".")[1] for key in storage.select(
+                "Place", where, "price_by_night")])
+        keys = storage.select("Place", where, "-price_by_night")
+        self.assertEqual([ids[0], ids[2], ids[1]],
+                         [key.split(".")[1] for key in keys])
+        self.assertIs(keys, storage.select("Place", where,
+                                           "-price_by_night"))
+        self.places[0].price_by_night = 0
+        self.assertEqual(f"Place.{ids[2]}", storage.select(
+            "Place", where, "-price_by_night")[0])
+        self.assertEqual(
+            [f"Place.{ids[0]}"],
+            [key for key, obj in storage.scan(
+                "Place", f"Place.{ids[1]}", where=where,
+                order="-price_by_night")])
+        self.places[0].nickname = "last"
+        self.assertEqual(f"Place.{ids[0]}", storage.select(
+            "Place", where, "nickname")[0])
+        self.assertEqual(f"Place.{ids[0]}", storage.select(
+            "Place", where, "-nickname")[0])
+        self.places[1].nickname = 3
+        with self.assertRaises(ValueError):
+            storage.select("Place", where, "nickname")
+
+
+if __name__ == "__main__":
+    unittest.main()
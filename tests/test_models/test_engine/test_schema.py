@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+'''
+Unit tests for the schema module.
+'''
+
+import json
+import os
+import unittest
+from datetime import datetime
+from models import storage
+from models.place import Place
+from models.user import User
+from models.engine import schema
+from unittest.mock import patch
+from io import StringIO
+
+
+class TestSchema(unittest.TestCase):
+    """Tests for the Schema registry and its coercers."""
+
+    def test_registry(self):
+        """Test that a schema is built once per class."""
+        self.assertIs(schema.of(Place), schema.of(Place))
+        self.assertIsNot(schema.of(Place), schema.of(User))
+
+    def test_types(self):
+        """Test that the schema holds the typed class attributes."""
+        types = schema.of(Place).types
+        self.assertEqual(int, types["max_guest"])
+        self.assertEqual(float, types["latitude"])
+        self.assertEqual(list, types["amenity_ids"])
+        self.assertEqual(str, types["city_id"])
+        self.assertNotIn("amenity_mask", types)
+        self.assertIs(schema.to_list, schema.of(Place).coercers[
+            "amenity_ids"])
+
+    def test_coerce(self):
+        """Test the conversion of values to the attribute types."""
+        coerce = schema.of(Place).coerce
+        self.assertEqual(4, coerce("max_guest", "4"))
+        self.assertEqual(2.5, coerce("latitude", "2.5"))
+        self.assertEqual(3.0, coerce("latitude", 3))
+        self.assertEqual("7", coerce("name", 7))
+        self.assertEqual(["a"], coerce("amenity_ids", '["a"]'))
+        self.assertEqual(["a", "b"], coerce("amenity_ids", "['a', 'b']"))
+        self.assertEqual(["a"], coerce("amenity_ids", ("a",)))
+        self.assertEqual({"x": 1}, coerce("nickname", {"x": 1}))
+        for name, value in [("max_guest", "many"), ("max_guest", True),
+                            ("latitude", None), ("name", ["a"]),
+                            ("amenity_ids", "a1"), ("amenity_ids", 3),
+                            ("amenity_ids", [["a"]]), ("amenity_ids", [1]),
+                            ("max_guest", 12.75), ("max_guest", 1e400),
+                            ("max_guest", float("nan")),
+                            ("latitude", 10 ** 400)]:
+            with self.assertRaises(ValueError):
+                coerce(name, value)
+
+    def test_writable(self):
+        """Test that id, methods, properties and private names can't be set."""
+        place = schema.of(Place)
+        for name in ["name", "max_guest", "nickname", "created_at"]:
+            self.assertTrue(place.writable(name))
+        for name in ["id", "save", "to_dict", "from_record", "amenity_mask",
+                     "_record", "__class__", "", 1]:
+            self.assertFalse(place.writable(name))
+            with self.assertRaises(ValueError):
+                place.coerce(name, 1)
+
+    def test_timestamps(self):
+        """Test that timestamps only take datetimes and ISO-8601 text."""
+        coerce = schema.of(Place).coerce
+        self.assertEqual(datetime(2020, 1, 2),
+                         coerce("created_at", "2020-01-02T00:00:00"))
+        self.assertEqual(datetime(2020, 1, 2),
+                         coerce("updated_at", datetime(2020, 1, 2)))
+        self.assertNotIn("created_at", schema.of(Place).types)
+        for value in ["5", 5, None, "yesterday"]:
+            with self.assertRaises(ValueError):
+                coerce("created_at", value)
+
+    def test_lists_are_copied(self):
+        """Test that a coerced list is never the list passed in."""
+        ids = ["a"]
+        self.assertIsNot(ids, schema.of(Place).coerce("amenity_ids", ids))
+
+    def test_coerce_record(self):
+        """Test that a record is converted in place."""
+        record = {"id": "1", "max_guest": "2", "name": "Nest",
+                  "rooms": "3"}
+        self.assertIs(record, schema.of(Place).coerce_record(record))
+        self.assertEqual({"id": "1", "max_guest": 2, "name": "Nest",
+                          "rooms": "3"}, record)
+
+    def test_coerce_record_not_strict(self):
+        """Test that values that can't be converted are dropped."""
+        record = {"max_guest": 1.5, "latitude": "north", "rooms": "2",
+                  "number_rooms": "3"}
+        with self.assertRaises(ValueError):
+            schema.of(Place).coerce_record(dict(record))
+        schema.of(Place).coerce_record(record, strict=False)
+        self.assertEqual({"rooms": "2", "number_rooms": 3}, record)
+
+
+class TestSchemaReload(unittest.TestCase):
+    """Tests for the conversion of stored values at reload."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the environment before each test."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the environment after each test."""
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_reload(self):
+        """Test that mistyped values in file.json are read back typed."""
+        place = Place()
+        storage.save()
+        with open("file.json", encoding="utf-8") as file:
+            records = json.load(file)
+        records[f"Place.{place.id}"].update(
+            {"max_guest": "4", "latitude": "not a float"})
+        with open("file.json", "w", encoding="utf-8") as file:
+            json.dump(records, file)
+        storage.reload()
+        reloaded = storage.all()[f"Place.{place.id}"]
+        self.assertEqual(4, reloaded.max_guest)
+        self.assertEqual(0.0, reloaded.latitude)
+        self.assertNotIn("latitude", reloaded.__dict__)
+        storage.delete(reloaded)
+
+    def test_reload_bad_records(self):
+        """Test that a bad record is skipped, not the whole file."""
+        places = [Place() for i in range(3)]
+        storage.save()
+        with open("file.json", encoding="utf-8") as file:
+            records = json.load(file)
+        records[f"Place.{places[0].id}"]["price_by_night"] = 1e400
+        records[f"Place.{places[1].id}"].update(
+            {"max_guest": 12.75, "city_id": ["c"],
+             "amenity_ids": [["a"]]})
+        records[f"Place.{places[2].id}"] = 5
+        with open("file.json", "w", encoding="utf-8") as file:
+            json.dump(records, file)
+        with patch("sys.stderr", new=StringIO()) as errors:
+            storage.reload()
+        self.assertIn(f"skipped Place.{places[2].id}", errors.getvalue())
+        self.assertIn(f"repaired Place.{places[1].id}", errors.getvalue())
+        stored = storage.all()
+        self.assertEqual(0, stored[f"Place.{places[0].id}"].price_by_night)
+        repaired = stored[f"Place.{places[1].id}"]
+        self.assertEqual((0, "", []), (repaired.max_guest, repaired.city_id,
+                                       repaired.amenity_ids))
+        for place in places:
+            storage.delete(stored.get(f"Place.{place.id}", place))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+'''
+Unit tests for the side_file module.
+'''
+
+import os
+import tempfile
+import unittest
+from models.engine import side_file
+
+
+class TestSideFile(unittest.TestCase):
+    """Tests for write() and read() of the side files."""
+
+    def setUp(self):
+        """Writes a side file in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "file.json.indexes")
+        self.payload = {"count": 2,
+                        "indexes": {"classes": {"User": ["User.1"]}}}
+        side_file.write(self.path, "abc", self.payload)
+
+    def tearDown(self):
+        """Removes the temporary directory."""
+        self.directory.cleanup()
+
+    def test_fingerprint(self):
+        """Test that fingerprints follow the content of the data."""
+        self.assertEqual(side_file.fingerprint(b"{}"),
+                         side_file.fingerprint(b"{}"))
+        self.assertNotEqual(side_file.fingerprint(b"{}"),
+                            side_file.fingerprint(b"{ }"))
+
+    def test_read(self):
+        """Test reading the side file of the same data file generation."""
+        self.assertEqual(self.payload, side_file.read(self.path, "abc"))
+
+    def test_pickled_payload(self):
+        """Test writing a payload pickled beforehand."""
+        side_file.write(self.path, "abc", side_file.dumps([1, 2]))
+        self.assertEqual([1, 2], side_file.read(self.path, "abc"))
+
+    def test_stale(self):
+        """Test that a side file of another generation is not read."""
+        self.assertIsNone(side_file.read(self.path, "abd"))
+
+    def test_corrupted(self):
+        """Test that a payload not matching its checksum is not read."""
+        with open(self.path, "r+b") as file:
+            file.seek(-3, os.SEEK_END)
+            file.write(b"\x00")
+        self.assertIsNone(side_file.read(self.path, "abc"))
+
+    def test_other_version(self):
+        """Test that a side file of another format version is not read."""
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with open(self.path, "wb") as file:
+            file.write(data.replace(b'"version": 1', b'"version": 0', 1))
+        self.assertIsNone(side_file.read(self.path, "abc"))
+
+    def test_missing_or_empty(self):
+        """Test that missing and empty side files are not read."""
+        os.remove(self.path)
+        self.assertIsNone(side_file.read(self.path, "abc"))
+        open(self.path, "wb").close()
+        self.assertIsNone(side_file.read(self.path, "abc"))
+
+    def test_write_async(self):
+        """Test writing the side file from a background thread."""
+        side_file.write_async(self.path, "def", {}).join()
+        self.assertEqual({}, side_file.read(self.path, "def"))
+
+
+if __name__ == "__main__":
+    unittest.main()
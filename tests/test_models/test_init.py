@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+'''
+Unit tests for the lazy storage of the models package.
+'''
+
+import os
+import subprocess
+import sys
+import unittest
+import models
+from models.engine.file_storage import FileStorage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+
+def run(code):
+    """Returns the output of code run in a new interpreter."""
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True,
+        text=True, env=dict(os.environ, PYTHONPATH=ROOT)).stdout.split()
+
+
+class TestModelsInit(unittest.TestCase):
+    """Tests for models.init() and the lazy models.storage."""
+
+    def test_init(self):
+        """Test that init() returns the one storage."""
+        self.assertIsInstance(models.init(), FileStorage)
+        self.assertIs(models.storage, models.init())
+        from models import storage
+        self.assertIs(storage, models.storage)
+
+    def test_unknown_attribute(self):
+        """Test that other missing attributes still raise AttributeError."""
+        with self.assertRaises(AttributeError):
+            models.missing
+
+    def test_import_does_not_load(self):
+        """Test that storage is only loaded when an instance is stored."""
+        self.assertEqual(["False", "False", "True"], run(
+            "import sys, models; from models.user import User; "
+            "User(email='a@b.c'); print('storage' in vars(models)); "
+            "print('models.engine.file_storage' in sys.modules); "
+            "User(); print('storage' in vars(models))"))
+
+    def test_first_access_loads(self):
+        """Test that the first access to models.storage reloads it."""
+        self.assertEqual(["True"], run(
+            "import models; storage = models.storage; "
+            "print(storage is models.init())"))
+
+
+if __name__ == "__main__":
+    unittest.main()
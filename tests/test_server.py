@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+"""
+Defines unittests for server.py.
+"""
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from models import storage
+from server import Client, ConsoleServer, RemoteConsole, frame, main
+from server import parse_address
+
+
+class TestProtocol(unittest.TestCase):
+    """Unittests for the addresses and the framing of outputs."""
+
+    def test_parse_address(self):
+        """Test TCP and Unix socket addresses."""
+        self.assertEqual(("tcp", "127.0.0.1", 8000), parse_address("8000"))
+        self.assertEqual(("tcp", "0.0.0.0", 80), parse_address("0.0.0.0:80"))
+        self.assertEqual(("unix", "hbnb.sock"),
+                         parse_address("unix:hbnb.sock"))
+        self.assertEqual(("unix", "/tmp/h.sock"), parse_address("/tmp/h.sock"))
+        with self.assertRaises(ValueError):
+            parse_address("localhost:http")
+
+    def test_frame(self):
+        """Test that outputs end with a dot line and lines are stuffed."""
+        self.assertEqual(b".\n", frame(""))
+        self.assertEqual(b"2\n.\n", frame("2\n"))
+        self.assertEqual(b"..a\nb\n...\n.\n", frame(".a\nb\n.."))
+
+
+class TestConsoleServer(unittest.TestCase):
+    """Unittests for sessions served against one shared storage."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Renames file.json and starts a server on TCP and Unix sockets."""
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever,
+                                      daemon=True)
+        cls.thread.start()
+        cls.server = ConsoleServer(save_interval=3600)
+        cls.unix = os.path.join(cls.directory.name, "hbnb.sock")
+        names = cls.call(cls.server.start("127.0.0.1:0", f"unix:{cls.unix}"))
+        cls.tcp = f"127.0.0.1:{names[0][1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stops the server and puts file.json back."""
+        cls.call(cls.server.close())
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+        cls.directory.cleanup()
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    @classmethod
+    def call(cls, coroutine):
+        """Runs coroutine on the server loop and returns its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, cls.loop).result()
+
+    def test_shared_storage(self):
+        """Test that an object created in a session shows in another."""
+        with Client(self.tcp) as first, Client(self.unix) as second:
+            state_id = first.run("create State").strip()
+            self.assertIn(f"[State] ({state_id})",
+                          second.run(f"show State {state_id}"))
+            self.assertIn(f"State.{state_id}", storage.all())
+            self.assertEqual("** no instance found **\n",
+                             second.run("show State missing"))
+
+    def test_pipeline(self):
+        """Test that pipelined commands are answered in order."""
+        with Client(self.unix) as client:
+            before = int(client.run("count City"))
+            outputs = list(client.pipeline(
+                ["create City"] * 200 + ["count City", 'City.count()']))
+        self.assertEqual(202, len(outputs))
+        self.assertEqual(200, len(set(outputs[:200])))
+        self.assertEqual([f"{before + 200}\n"] * 2, outputs[200:])
+
+    def test_concurrent_sessions(self):
+        """Test that sessions running at once lose no command."""
+        def create(outputs):
+            with Client(self.tcp) as client:
+                outputs.extend(client.pipeline(["create Amenity"] * 100))
+
+        outputs = []
+        before = len(storage.objects("Amenity"))
+        threads = [threading.Thread(target=create, args=(outputs,))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(800, len(set(outputs)))
+        self.assertEqual(before + 800, len(storage.objects("Amenity")))
+
+    def test_saves_deferred(self):
+        """Test that sessions only mark storage as changed."""
+        with patch.object(storage, "_FileStorage__write") as write:
+            with Client(self.unix) as client:
+                client.run("create Review")
+                client.run("update_where Review id!=x {\"text\": \"ok\"}")
+            write.assert_not_called()
+            self.assertTrue(storage.commit())
+            write.assert_called_once()
+
+    def test_quit(self):
+        """Test that quit and EOF end the session."""
+        for command in ("quit", "EOF"):
+            with Client(self.tcp) as client:
+                self.assertIsNotNone(client.run(command))
+                self.assertIsNone(client.receive())
+
+    def test_help(self):
+        """Test that the help of the console is sent to the client."""
+        with Client(self.tcp) as client:
+            self.assertIn("Documented commands", client.run("help"))
+            self.assertIn("Quit command", client.run("help quit"))
+            self.assertEqual("", client.run(""))
+            self.assertEqual("*** Unknown syntax: hello\n",
+                             client.run("hello"))
+
+    def test_files_refused(self):
+        """Test that sessions can't read or write files of the server."""
+        path = os.path.join(self.directory.name, "out")
+        refused = "** files can't be used in server sessions **\n"
+        with Client(self.tcp) as client:
+            for command in [f"export Place {path}",
+                            f"import Place {path}",
+                            f'Place.export("{path}")',
+                            f"changes 2000-01-01 {path}",
+                            f"stats export {path}"]:
+                self.assertEqual(refused, client.run(command), command)
+            self.assertEqual("", client.run("changes 2999-01-01"))
+            self.assertIn("metrics", client.run("stats"))
+        self.assertFalse(os.path.exists(path))
+
+    def test_remote_console(self):
+        """Test the prompt of the client."""
+        with Client(self.unix) as client:
+            console = RemoteConsole(client)
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(console.onecmd("count BaseModel"))
+                self.assertTrue(console.onecmd("quit"))
+            self.assertTrue(output.getvalue().strip().isdigit())
+
+    def test_main_connect(self):
+        """Test the batch mode of the client."""
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertEqual(0, main(["--connect", self.tcp, "-c",
+                                      "create User", "-c", "count User"]))
+            self.assertEqual(1, main(["--connect", self.unix, "-c",
+                                      "show User"]))
+        lines = output.getvalue().splitlines()
+        self.assertEqual("** instance id missing **", lines[-1])
+
+    def test_close_saves(self):
+        """Test that closing the server writes the pending changes."""
+        server = ConsoleServer(save_interval=3600)
+        address = os.path.join(self.directory.name, "close.sock")
+        self.call(server.start(address))
+        with Client(address) as client:
+            user_id = client.run("create User").strip()
+        self.call(server.close())
+        self.assertFalse(os.path.exists(address))
+        with open("file.json", encoding="utf-8") as file:
+            self.assertIn(f"User.{user_id}", json.load(file))
+        storage.defer()
+
+
+if __name__ == "__main__":
+    unittest.main()